@@ -0,0 +1,209 @@
+import hashlib
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional, Tuple
+
+from ast_nodes import ASTNode, FunctionDecl, Program, child_nodes, node_layout
+
+
+# Hash estrutural (Merkle) das subarvores da AST: tipo do no + campos que
+# nao sao nos + hashes dos filhos. O valor fica memorizado no proprio no
+# (atributo fora dos campos do dataclass, entao nao altera __eq__/__repr__),
+# de modo que cada subarvore e percorrida uma unica vez. Quem mutar uma
+# arvore ja hasheada deve chamar invalidate() na raiz.
+
+_ATTR = "_merkle"
+
+
+def _feed(h, value: Any):
+    if isinstance(value, ASTNode):
+        h.update(b"N")
+        h.update(value.__dict__[_ATTR])
+    elif isinstance(value, (list, tuple)):
+        h.update(b"L%d:" % len(value))
+        for item in value:
+            _feed(h, item)
+    elif value is None:
+        h.update(b"0")
+    else:
+        data = repr(value).encode("utf-8")
+        h.update(b"S%d:" % len(data))
+        h.update(data)
+
+
+def structural_hash(root: ASTNode) -> bytes:
+    cached = root.__dict__.get(_ATTR)
+    if cached is not None:
+        return cached
+    # pos-ordem iterativa: cadeias longas de BinOp nao estouram a pilha
+    stack = [(root, False)]
+    while stack:
+        node, ready = stack.pop()
+        if _ATTR in node.__dict__:
+            continue
+        if not ready:
+            stack.append((node, True))
+            stack.extend((c, False) for c in child_nodes(node) if _ATTR not in c.__dict__)
+            continue
+        h = hashlib.blake2b(type(node).__name__.encode("ascii"), digest_size=16)
+        for name, _ in node_layout(type(node)):
+            _feed(h, getattr(node, name))
+        node.__dict__[_ATTR] = h.digest()
+    return root.__dict__[_ATTR]
+
+
+def invalidate(root: ASTNode):
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node.__dict__.pop(_ATTR, None) is not None:
+            stack.extend(child_nodes(node))
+
+
+def same_tree(a: Optional[ASTNode], b: Optional[ASTNode]) -> bool:
+    if a is b:
+        return True
+    if a is None or b is None:
+        return False
+    return structural_hash(a) == structural_hash(b)
+
+
+def _payload(node: ASTNode) -> List[Any]:
+    return [getattr(node, name) for name, structural in node_layout(type(node)) if not structural]
+
+
+# Hash-consing
+
+class HashConsTable:
+    """
+    Compartilha subarvores identicas entre todas as arvores internadas: a
+    arvore devolvida por intern() vira um DAG cujos nos repetidos sao o
+    mesmo objeto. Nos compartilhados guardam a posicao da primeira ocorrencia.
+    """
+
+    def __init__(self):
+        self.table: Dict[bytes, ASTNode] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def intern(self, node: ASTNode) -> ASTNode:
+        # pre-ordem iterativa na mesma ordem da versao recursiva: um no so e
+        # registrado depois dos filhos, e um filho repetido e trocado no
+        # lugar (atributo ou posicao da lista) pelo canonico
+        root = [node]
+        stack: List[Tuple[ASTNode, bool, Any, Any]] = [(node, False, root, 0)]
+        while stack:
+            cur, ready, holder, slot = stack.pop()
+            key = structural_hash(cur)
+            if ready:
+                self.table[key] = cur
+                continue
+            canonical = self.table.get(key)
+            if canonical is not None:
+                self.hits += 1
+                if isinstance(holder, list):
+                    holder[slot] = canonical
+                else:
+                    setattr(holder, slot, canonical)
+                continue
+            self.misses += 1
+            stack.append((cur, True, None, None))
+            children: List[Tuple[ASTNode, Any, Any]] = []
+            for name, structural in node_layout(type(cur)):
+                if not structural:
+                    continue
+                value = getattr(cur, name)
+                if isinstance(value, ASTNode):
+                    children.append((value, cur, name))
+                elif isinstance(value, list):
+                    children.extend((v, value, k) for k, v in enumerate(value) if isinstance(v, ASTNode))
+            stack.extend((c, False, h, k) for c, h, k in reversed(children))
+        return root[0]
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+
+# Diff
+
+@dataclass
+class TreeChange:
+    path: str
+    old: Optional[ASTNode]
+    new: Optional[ASTNode]
+
+    def __str__(self):
+        kind = "alterado" if self.old is not None and self.new is not None else (
+            "removido" if self.new is None else "adicionado")
+        return f"{self.path or '<raiz>'}: {kind}"
+
+
+def diff_trees(old: Optional[ASTNode], new: Optional[ASTNode]) -> List[TreeChange]:
+    """Lista as subarvores que mudaram, sem descer onde os hashes coincidem."""
+    out: List[TreeChange] = []
+    _diff(old, new, "", out)
+    return out
+
+
+def _diff(a: Optional[ASTNode], b: Optional[ASTNode], path: str, out: List[TreeChange]):
+    # pilha explicita (cadeias longas de BinOp); cada passo empilha o que
+    # gerou em ordem inversa, entao as mudancas saem na ordem da arvore
+    stack: List[Tuple[str, Any, Any, str]] = [("node", a, b, path)]
+    while stack:
+        kind, a, b, path = stack.pop()
+        if kind == "emit":
+            out.append(TreeChange(path, a, b))
+        elif kind == "list":
+            stack.extend(reversed(_diff_list(a, b, path)))
+        elif same_tree(a, b):
+            continue
+        elif a is None or b is None or type(a) is not type(b) or _payload(a) != _payload(b):
+            out.append(TreeChange(path, a, b))
+        else:
+            steps = []
+            for name, structural in node_layout(type(a)):
+                if not structural:
+                    continue
+                va, vb = getattr(a, name), getattr(b, name)
+                sub = f"{path}.{name}" if path else name
+                if isinstance(va, list) and isinstance(vb, list):
+                    steps.append(("list", va, vb, sub))
+                else:
+                    steps.append(("node", va, vb, sub))
+            stack.extend(reversed(steps))
+
+
+def _diff_list(a: List[Any], b: List[Any], path: str) -> List[Tuple[str, Any, Any, str]]:
+    keys_a = [structural_hash(x) if isinstance(x, ASTNode) else repr(x) for x in a]
+    keys_b = [structural_hash(x) if isinstance(x, ASTNode) else repr(x) for x in b]
+    matcher = SequenceMatcher(None, keys_a, keys_b, autojunk=False)
+    steps: List[Tuple[str, Any, Any, str]] = []
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op == "equal":
+            continue
+        # num trecho substituido as posicoes que existem dos dois lados sao
+        # comparadas (alteracao); so o excedente vira remocao ou adicao
+        n = min(i2 - i1, j2 - j1) if op == "replace" else 0
+        for k in range(n):
+            steps.append(("node", a[i1 + k], b[j1 + k], f"{path}[{j1 + k}]"))
+        for i in range(i1 + n, i2):
+            steps.append(("emit", a[i], None, f"{path}[{i}]"))
+        for j in range(j1 + n, j2):
+            steps.append(("emit", None, b[j], f"{path}[{j}]"))
+    return steps
+
+
+def changed_functions(old: Program, new: Program) -> Dict[str, str]:
+    """Nome -> 'adicionada' | 'removida' | 'alterada', comparando so os hashes."""
+    before = {d.name: d for d in old.body if isinstance(d, FunctionDecl)}
+    after = {d.name: d for d in new.body if isinstance(d, FunctionDecl)}
+    status: Dict[str, str] = {}
+    for name, decl in before.items():
+        if name not in after:
+            status[name] = "removida"
+        elif not same_tree(decl, after[name]):
+            status[name] = "alterada"
+    for name in after:
+        if name not in before:
+            status[name] = "adicionada"
+    return status
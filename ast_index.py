@@ -0,0 +1,573 @@
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import ast_nodes
+from ast_nodes import ASTNode, Call, Var, node_layout
+from parser import Parser
+from preprocessor import Preprocessor, file_stamps, parse_defines
+
+
+# Indice persistente (SQLite) das ASTs de um corpus de arquivos .c. Cada no
+# vira uma linha com tipo, identificador, posicao e o intervalo de ids da
+# sua subarvore em pre-ordem; os indices do SQLite sobre (tipo, arquivo, id), nome e
+# (pai, campo) fazem o papel de indices invertidos. Os arquivos passam pelo
+# preprocessador, como em main.py; um arquivo so e reanalisado quando o stat
+# e o hash do conteudo mudam, ou quando muda o stat de algum cabecalho que
+# ele incluiu (ou procurou sem achar).
+#
+# Linguagem de padroes:
+#   While(test=Num)                 laco cujo teste e um literal
+#   Call(name=foo, args=3)          chamada a foo com tres argumentos
+#   Assign(target=i, value=BinOp(op=+))
+#   While(test=BinOp(op=<=))        operadores de dois caracteres dispensam aspas
+#   FunctionDecl(contains=While)    funcao com algum While dentro
+#   _(name=x)                       qualquer no com identificador x
+# Campos que guardam nos recebem outro padrao (um identificador solto vale
+# Var(name=...), um numero vale Num(value=...)); campos de lista casam se
+# algum elemento casar, e um numero compara o tamanho da lista.
+
+DEFAULT_DB = "ast_index.sqlite"
+
+# versao do esquema (PRAGMA user_version); um indice de outra versao e refeito
+_SCHEMA_VERSION = 2
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    digest TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS nodes (
+    file INTEGER NOT NULL,
+    id INTEGER NOT NULL,
+    parent INTEGER NOT NULL,
+    field TEXT,
+    kind TEXT NOT NULL,
+    name TEXT,
+    value TEXT,
+    arity INTEGER,
+    size INTEGER NOT NULL,
+    line INTEGER,
+    col INTEGER,
+    end_line INTEGER,
+    end_col INTEGER,
+    src TEXT,
+    PRIMARY KEY (file, id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS deps (
+    file INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS deps_file ON deps (file);
+CREATE INDEX IF NOT EXISTS nodes_kind ON nodes (kind, file, id);
+CREATE INDEX IF NOT EXISTS nodes_name ON nodes (name);
+CREATE INDEX IF NOT EXISTS nodes_parent ON nodes (file, parent, field);
+"""
+
+# colunas de atributos; "args", "params" e "body" com numero comparam a aridade
+_ATTRS = {"name": "name", "value": "value", "op": "value", "type": "value"}
+_ARITY = {"Call": "args", "FunctionDecl": "params", "Block": "body", "Program": "body"}
+_KINDS = {name: cls for name, cls in vars(ast_nodes).items()
+          if isinstance(cls, type) and issubclass(cls, ASTNode) and cls is not ASTNode}
+
+
+class PatternError(Exception):
+    def __init__(self, message: str, pos: int):
+        super().__init__(message)
+        self.message = message
+        self.pos = pos
+
+    def __str__(self):
+        return f"{self.message} (posicao {self.pos})"
+
+
+@dataclass
+class Match:
+    path: str
+    kind: str
+    name: Optional[str]
+    line: int
+    col: int
+    end_line: int
+    end_col: int
+
+    def __str__(self):
+        label = f"{self.kind}({self.name})" if self.name else self.kind
+        return f"{self.path}:{self.line}:{self.col}  {label}"
+
+
+@dataclass
+class IndexStats:
+    indexed: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    failed: int = 0
+    missing: List[str] = field(default_factory=list)   # caminhos listados que nao existem
+
+
+# Linhas de um arquivo
+
+def _node_info(node: ASTNode) -> Tuple[Optional[str], Optional[str], Optional[int]]:
+    t = type(node).__name__
+    name = getattr(node, "name", None)
+    if isinstance(node, Call) and isinstance(node.callee, Var):
+        name = node.callee.name
+    value = None
+    if t in ("Num", "Char", "Str"):
+        value = node.value
+    elif t == "BinOp":
+        value = node.op
+    elif t == "FunctionDecl":
+        value = node.ret_type
+    elif t == "VarDecl":
+        value = node.var_type
+    arity = None
+    if t in _ARITY:
+        arity = len(getattr(node, _ARITY[t]))
+    return name, value, arity
+
+
+def tree_rows(root: ASTNode, source: Optional[str] = None) -> List[List[Any]]:
+    """
+    [id, pai, campo, tipo, nome, valor, aridade, tamanho, linha, col,
+    fim_linha, fim_col, arquivo] em pre-ordem; arquivo so e preenchido para
+    nos vindos de outro arquivo que nao source (cabecalhos incluidos).
+    """
+    rows: List[List[Any]] = []
+    stack: List[Tuple[ASTNode, int, Optional[str]]] = [(root, -1, None)]
+    while stack:
+        node, parent, field = stack.pop()
+        nid = len(rows)
+        name, value, arity = _node_info(node)
+        rows.append([nid, parent, field, type(node).__name__, name, value, arity, 1,
+                     node.line, node.col, node.line, node.col,
+                     node.file if node.file not in (None, source) else None])
+        kids: List[Tuple[ASTNode, int, Optional[str]]] = []
+        for fname, structural in node_layout(type(node)):
+            if not structural:
+                continue
+            v = getattr(node, fname)
+            if isinstance(v, ASTNode):
+                kids.append((v, nid, fname))
+            elif isinstance(v, list):
+                kids.extend((x, nid, fname) for x in v if isinstance(x, ASTNode))
+        stack.extend(reversed(kids))
+    # tamanho e fim da subarvore (posicao do ultimo no que comeca dentro dela)
+    for row in reversed(rows):
+        parent = row[1]
+        if parent >= 0:
+            p = rows[parent]
+            p[7] += row[7]
+            if (row[10], row[11]) > (p[10], p[11]):
+                p[10], p[11] = row[10], row[11]
+    return rows
+
+
+# um preprocessador por configuracao em cada processo: o cache de
+# cabecalhos vale para todos os arquivos que o processo analisa
+_preprocessors: Dict[Tuple[Tuple[str, ...], Tuple[Tuple[str, str], ...]], Preprocessor] = {}
+
+
+def _analyze_file(path: str, known_digest: Optional[str] = None, include_dirs: Tuple[str, ...] = (),
+                  defines: Tuple[Tuple[str, str], ...] = ()) -> Tuple[str, str, Optional[List[List[Any]]], List[Tuple[str, int, int]]]:
+    # executado nos processos do pool; se o conteudo e o ja indexado (so o
+    # mtime mudou) nem passa pelo preprocessador
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        code = f.read()
+    digest = hashlib.sha256(code.encode("utf-8")).hexdigest()
+    if digest == known_digest:
+        return digest, "inalterado", None, []
+    pp = _preprocessors.get((include_dirs, defines))
+    if pp is None:
+        pp = _preprocessors[(include_dirs, defines)] = Preprocessor(list(include_dirs), dict(defines))
+    tokens, lex_errors = pp.preprocess(code, path)
+    deps = file_stamps(pp.dependencies.get(path, ()))
+    if lex_errors:
+        return digest, "erro lexico", None, deps
+    program, _ = Parser(tokens).parse_program()
+    if program is None:
+        return digest, "erro sintatico", None, deps
+    return digest, "ok", tree_rows(program, path), deps
+
+
+# Padroes
+
+@dataclass
+class Pattern:
+    kind: Optional[str]
+    attrs: List[Tuple[str, Any]]   # (chave, literal | Pattern)
+    pos: int
+
+
+_token_re = re.compile(r"\s*(?:(\"(?:[^\"\\]|\\.)*\"|'[^']*')|(-?\d+(?:\.\d+)?)|([A-Za-z_]\w*)"
+                       r"|(<=|>=|==|!=|&&|\|\||\S))")
+_key_eq_re = re.compile(r"\s*=")
+
+
+def _tokenize(text: str) -> List[Tuple[str, str, int]]:
+    out: List[Tuple[str, str, int]] = []
+    pos = 0
+    while pos < len(text):
+        # depois de um nome, '=' e sempre o separador de "campo=valor": assim
+        # "op===" vira op, '=', '==' e "op=<=" vira op, '=', '<='
+        m = _key_eq_re.match(text, pos) if out and out[-1][0] == "id" else None
+        if m:
+            out.append(("sym", "=", m.end() - 1))
+            pos = m.end()
+            continue
+        m = _token_re.match(text, pos)
+        if not m or m.end() == pos:
+            break
+        start = m.start(m.lastindex) if m.lastindex else pos
+        if m.group(1) is not None:
+            out.append(("str", m.group(1)[1:-1], start))
+        elif m.group(2) is not None:
+            out.append(("num", m.group(2), start))
+        elif m.group(3) is not None:
+            out.append(("id", m.group(3), start))
+        elif m.group(4) is not None:
+            out.append(("sym", m.group(4), start))
+        pos = m.end()
+    out.append(("end", "", len(text)))
+    return out
+
+
+class _PatternParser:
+
+    def __init__(self, text: str):
+        self.toks = _tokenize(text)
+        self.i = 0
+
+    def peek(self) -> Tuple[str, str, int]:
+        return self.toks[self.i]
+
+    def take(self) -> Tuple[str, str, int]:
+        tok = self.toks[self.i]
+        self.i += 1
+        return tok
+
+    def expect(self, lex: str):
+        tok = self.take()
+        if tok[1] != lex or tok[0] == "str":
+            raise PatternError(f"esperado '{lex}'", tok[2])
+
+    def parse(self) -> Pattern:
+        p = self.pattern()
+        tok = self.peek()
+        if tok[0] != "end":
+            raise PatternError(f"texto sobrando: '{tok[1]}'", tok[2])
+        return p
+
+    def pattern(self) -> Pattern:
+        kind, name, pos = self.take()
+        if kind != "id":
+            raise PatternError("esperado tipo de no ou '_'", pos)
+        if name != "_" and name not in _KINDS:
+            raise PatternError(f"tipo de no desconhecido: {name}", pos)
+        p = Pattern(None if name == "_" else name, [], pos)
+        if self.peek()[1] != "(" or self.peek()[0] == "str":
+            return p
+        self.take()
+        while self.peek()[1] != ")" or self.peek()[0] == "str":
+            kind, key, kpos = self.take()
+            if kind != "id":
+                raise PatternError("esperado nome de campo", kpos)
+            self.expect("=")
+            p.attrs.append((key, self.value(p.kind, key, kpos)))
+            if self.peek()[1] == ",":
+                self.take()
+            elif self.peek()[1] != ")":
+                raise PatternError("esperado ',' ou ')'", self.peek()[2])
+        self.take()
+        return p
+
+    def value(self, owner: Optional[str], key: str, pos: int) -> Any:
+        structural = key == "contains" or _is_node_field(owner, key)
+        kind, text, vpos = self.peek()
+        if kind == "end":
+            raise PatternError("esperado valor", vpos)
+        if structural and kind == "id" and (text in _KINDS or text == "_"):
+            return self.pattern()
+        self.take()
+        if structural and key != "contains":
+            # atalhos: identificador -> Var(name=...), numero -> Num(value=...), numero em lista -> tamanho
+            if kind == "num" and _is_list_field(owner, key):
+                return int(text)
+            if kind == "id":
+                return Pattern("Var", [("name", text)], vpos)
+            if kind == "num":
+                return Pattern("Num", [("value", text)], vpos)
+        if structural:
+            raise PatternError(f"'{key}' espera um padrao", vpos)
+        if key not in _ATTRS and not (owner is None or _ARITY.get(owner) == key):
+            raise PatternError(f"campo desconhecido para {owner}: {key}", pos)
+        return text
+
+
+def _is_node_field(kind: Optional[str], key: str) -> bool:
+    if kind is None:
+        return any(_is_node_field(k, key) for k in _KINDS)
+    return any(name == key and structural for name, structural in node_layout(_KINDS[kind]))
+
+
+def _is_list_field(kind: Optional[str], key: str) -> bool:
+    if kind is None:
+        return key in _ARITY.values()
+    return _ARITY.get(kind) == key
+
+
+def parse_pattern(text: str) -> Pattern:
+    return _PatternParser(text).parse()
+
+
+def compile_pattern(pattern: Pattern) -> Tuple[str, List[Any]]:
+    """Traduz o padrao num SELECT; cada subpadrao vira um EXISTS correlacionado."""
+    params: List[Any] = []
+    counter = [0]
+
+    def conditions(p: Pattern, alias: str) -> List[str]:
+        where: List[str] = []
+        if p.kind is not None:
+            where.append(f"{alias}.kind = ?")
+            params.append(p.kind)
+        for key, value in p.attrs:
+            if isinstance(value, Pattern):
+                counter[0] += 1
+                child = f"n{counter[0]}"
+                # o indice e fixado: sem isso o planejador as vezes varre todos
+                # os nos do tipo no arquivo em vez de seguir o pai
+                if key == "contains":
+                    index = "nodes_kind" if value.kind is not None else "NOT INDEXED"
+                    link = (f"{child}.file = {alias}.file"
+                            f" AND {child}.id > {alias}.id AND {child}.id < {alias}.id + {alias}.size")
+                else:
+                    index = "nodes_parent"
+                    link = f"{child}.file = {alias}.file AND {child}.parent = {alias}.id AND {child}.field = ?"
+                    params.append(key)
+                index = index if index == "NOT INDEXED" else f"INDEXED BY {index}"
+                inner = conditions(value, child)
+                where.append(f"EXISTS (SELECT 1 FROM nodes {child} {index} WHERE "
+                             + " AND ".join([link] + inner) + ")")
+            elif isinstance(value, int):
+                where.append(f"{alias}.arity = ?")
+                params.append(value)
+            elif key in _ATTRS:
+                where.append(f"{alias}.{_ATTRS[key]} = ?")
+                params.append(value)
+            else:
+                where.append(f"{alias}.arity = ?")
+                params.append(int(value) if value.isdigit() else -1)
+        return where
+
+    where = conditions(pattern, "n0")
+    # nos de um cabecalho aparecem uma vez so, mesmo que varios arquivos o incluam
+    sql = ("SELECT DISTINCT COALESCE(n0.src, f.path), n0.kind, n0.name, n0.line, n0.col, n0.end_line, n0.end_col"
+           " FROM nodes n0 JOIN files f ON f.id = n0.file"
+           + (" WHERE " + " AND ".join(where) if where else "")
+           + " ORDER BY COALESCE(n0.src, f.path), f.path, n0.id")
+    return sql, params
+
+
+# Indice
+
+def _stat_into(found: Dict[str, os.stat_result], path: str):
+    try:
+        found[path] = os.stat(path)
+    except FileNotFoundError:
+        pass  # apagado durante a varredura
+
+
+class ASTIndex:
+
+    def __init__(self, db_path: str = DEFAULT_DB, include_dirs: Optional[List[str]] = None,
+                 defines: Optional[Dict[str, str]] = None):
+        self.include_dirs = tuple(os.path.abspath(d) for d in include_dirs or [])
+        self.defines = tuple(sorted((defines or {}).items()))
+        self.db = sqlite3.connect(db_path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        version, = self.db.execute("PRAGMA user_version").fetchone()
+        if version != _SCHEMA_VERSION:
+            self.db.executescript("DROP TABLE IF EXISTS nodes; DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS deps;")
+            self.db.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        self.db.executescript(_SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+    # Atualizacao incremental
+
+    def update(self, roots: Iterable[str], jobs: int = 1, extension: str = ".c") -> IndexStats:
+        stats = IndexStats()
+        found: Dict[str, os.stat_result] = {}
+        prefixes: List[str] = []
+        gone: set = set()
+        for root in roots:
+            root = os.path.abspath(root)
+            if not os.path.exists(root):
+                # arquivo (ou diretorio) apagado: sai do indice
+                stats.missing.append(root)
+                gone.add(root)
+                prefixes.append(os.path.join(root, ""))
+                continue
+            if os.path.isfile(root):
+                _stat_into(found, root)
+                continue
+            prefixes.append(os.path.join(root, ""))
+            for dirpath, _, names in os.walk(root):
+                for n in names:
+                    if n.endswith(extension):
+                        _stat_into(found, os.path.join(dirpath, n))
+
+        known = {path: (fid, digest, mtime, size) for fid, path, digest, mtime, size
+                 in self.db.execute("SELECT id, path, digest, mtime_ns, size FROM files")}
+        deps: Dict[int, List[Tuple[str, int, int]]] = {}
+        for fid, path, mtime, size in self.db.execute("SELECT file, path, mtime_ns, size FROM deps"):
+            deps.setdefault(fid, []).append((path, mtime, size))
+        current: Dict[str, Tuple[str, int, int]] = {}
+
+        def deps_changed(fid: int) -> bool:
+            for stamp in deps.get(fid, ()):
+                if stamp[0] not in current:
+                    current[stamp[0]] = file_stamps([stamp[0]])[0]
+                if current[stamp[0]] != stamp:
+                    return True
+            return False
+
+        with self.db:
+            for path, (fid, _, _, _) in known.items():
+                if path not in found and (path in gone or any(path.startswith(p) for p in prefixes)):
+                    self._delete(fid)
+                    stats.removed += 1
+
+            todo = []
+            digests: List[Optional[str]] = []
+            for path, st in sorted(found.items()):
+                old = known.get(path)
+                if not old:
+                    todo.append(path)
+                    digests.append(None)
+                elif deps_changed(old[0]):
+                    # um cabecalho mudou: reanalisa mesmo com o conteudo igual
+                    todo.append(path)
+                    digests.append(None)
+                elif (old[2], old[3]) != (st.st_mtime_ns, st.st_size):
+                    todo.append(path)
+                    digests.append(old[1])
+                else:
+                    stats.unchanged += 1
+
+            n = len(todo)
+            args = (todo, digests, [self.include_dirs] * n, [self.defines] * n)
+            if jobs > 1 and n > 1:
+                with ProcessPoolExecutor(max_workers=jobs) as pool:
+                    results = list(pool.map(_analyze_file, *args, chunksize=16))
+            else:
+                results = list(map(_analyze_file, *args))
+
+            for path, known_digest, (digest, status, rows, stamps) in zip(todo, digests, results):
+                st = found[path]
+                old = known.get(path)
+                if known_digest is not None and known_digest == digest:
+                    # so o stat mudou
+                    self.db.execute("UPDATE files SET mtime_ns = ?, size = ? WHERE id = ?",
+                                    (st.st_mtime_ns, st.st_size, old[0]))
+                    stats.unchanged += 1
+                    continue
+                if old:
+                    self._delete(old[0])
+                cur = self.db.execute(
+                    "INSERT INTO files (path, digest, mtime_ns, size, status) VALUES (?, ?, ?, ?, ?)",
+                    (path, digest, st.st_mtime_ns, st.st_size, status))
+                fid = cur.lastrowid
+                self.db.executemany("INSERT INTO deps VALUES (?, ?, ?, ?)", ((fid, *d) for d in stamps))
+                if rows is None:
+                    stats.failed += 1
+                    continue
+                self.db.executemany("INSERT INTO nodes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                    ([fid] + r for r in rows))
+                stats.indexed += 1
+        if stats.indexed or stats.removed:
+            # estatisticas para o planejador escolher o indice mais seletivo
+            self.db.execute("PRAGMA optimize")
+        return stats
+
+    def _delete(self, fid: int):
+        self.db.execute("DELETE FROM nodes WHERE file = ?", (fid,))
+        self.db.execute("DELETE FROM deps WHERE file = ?", (fid,))
+        self.db.execute("DELETE FROM files WHERE id = ?", (fid,))
+
+
+    # Consultas
+
+    def query(self, pattern: str, limit: Optional[int] = None) -> List[Match]:
+        sql, params = compile_pattern(parse_pattern(pattern))
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [Match(*row[:7]) for row in self.db.execute(sql, params)]
+
+    def stats(self) -> Dict[str, int]:
+        files, = self.db.execute("SELECT COUNT(*) FROM files").fetchone()
+        failed, = self.db.execute("SELECT COUNT(*) FROM files WHERE status != 'ok'").fetchone()
+        nodes, = self.db.execute("SELECT COUNT(*) FROM nodes").fetchone()
+        return {"files": files, "failed": failed, "nodes": nodes}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Indice persistente de ASTs e consultas estruturais")
+    ap.add_argument("--db", default=DEFAULT_DB)
+    sub = ap.add_subparsers(dest="command", required=True)
+    p_index = sub.add_parser("index", help="indexa (ou atualiza) arquivos e diretorios")
+    p_index.add_argument("paths", nargs="+")
+    p_index.add_argument("-j", "--jobs", type=int, default=1)
+    p_index.add_argument("-I", dest="include_dirs", action="append", default=[], metavar="DIR",
+                         help="diretorio de busca para #include")
+    p_index.add_argument("-D", dest="defines", action="append", default=[], metavar="NOME[=VALOR]",
+                         help="define uma macro antes do preprocessamento")
+    p_query = sub.add_parser("query", help="busca nos que casam com um padrao")
+    p_query.add_argument("pattern")
+    p_query.add_argument("--limit", type=int)
+    sub.add_parser("stats")
+    args = ap.parse_args()
+
+    with ASTIndex(args.db, getattr(args, "include_dirs", None), parse_defines(getattr(args, "defines", []))) as index:
+        if args.command == "index":
+            s = index.update(args.paths, args.jobs)
+            for path in s.missing:
+                print("Nao encontrado:", path, file=sys.stderr)
+            print(f"{s.indexed} indexados, {s.unchanged} inalterados, {s.removed} removidos, {s.failed} com erro")
+        elif args.command == "query":
+            try:
+                matches = index.query(args.pattern, args.limit)
+            except PatternError as e:
+                print("Padrao invalido:", e, file=sys.stderr)
+                sys.exit(2)
+            for m in matches:
+                print(m)
+            print(f"{len(matches)} resultado(s)", file=sys.stderr)
+        else:
+            for k, v in index.stats().items():
+                print(f"{k}: {v}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import List, Optional, Any
+import json
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 
 # Tokens e Erros
@@ -12,14 +13,18 @@ class Token:
     lex: str
     line: int
     col: int
+    file: Optional[str] = None  # preenchido pelo preprocessador
 
 @dataclass
 class LexError:
     message: str
     line: int
     col: int
+    file: Optional[str] = None
 
     def __str__(self):
+        if self.file:
+            return f"{self.message} @ {self.file}:{self.line}:{self.col}"
         return f"{self.message} @ {self.line}:{self.col}"
 
 @dataclass
@@ -27,8 +32,23 @@ class SyntaxErrorInfo:
     message: str
     line: int
     col: int
+    file: Optional[str] = None
 
     def __str__(self):
+        if self.file:
+            return f"{self.message} @ {self.file}:{self.line}:{self.col}"
+        return f"{self.message} @ {self.line}:{self.col}"
+
+@dataclass
+class AnalysisWarning:
+    message: str
+    line: int
+    col: int
+    file: Optional[str] = None
+
+    def __str__(self):
+        if self.file:
+            return f"{self.message} @ {self.file}:{self.line}:{self.col}"
         return f"{self.message} @ {self.line}:{self.col}"
 
 
@@ -36,7 +56,11 @@ class SyntaxErrorInfo:
 
 
 class ASTNode:
-    pass
+    # posicao do primeiro token do no; atribuida pelo parser fora dos campos
+    # do dataclass, entao nao participa de __eq__ nem de __repr__
+    line = 0
+    col = 0
+    file: Optional[str] = None
 
 @dataclass
 class Program(ASTNode):
@@ -124,3 +148,121 @@ class Char(ASTNode):
 @dataclass
 class Str(ASTNode):
     value: str
+
+
+# Percurso
+
+_layouts: Dict[type, Tuple[Tuple[str, bool], ...]] = {}
+
+
+def node_layout(cls: type) -> Tuple[Tuple[str, bool], ...]:
+    """
+    (campo, contem nos?) de uma classe de no, na ordem de declaracao; os
+    campos estruturais sao os anotados com ASTNode/Block (direto, Optional
+    ou List).
+    """
+    layout = _layouts.get(cls)
+    if layout is None:
+        layout = tuple((f.name, "ASTNode" in str(f.type) or "Block" in str(f.type)) for f in fields(cls))
+        _layouts[cls] = layout
+    return layout
+
+
+def child_nodes(node: ASTNode) -> Iterator[ASTNode]:
+    """Filhos diretos do no, na ordem dos campos."""
+    for name, structural in node_layout(type(node)):
+        if not structural:
+            continue
+        value = getattr(node, name)
+        if isinstance(value, ASTNode):
+            yield value
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, ASTNode):
+                    yield item
+
+
+def clone_tree(value: Any) -> Any:
+    """
+    Copia profunda de um no (ou lista de nos) sem recursao: copy.deepcopy
+    desce um nivel da pilha do Python por no e estoura em expressoes longas.
+    Como no deepcopy, a posicao e os demais atributos do no sao copiados e
+    uma subarvore compartilhada continua compartilhada na copia.
+    """
+    copies: Dict[int, ASTNode] = {}
+    stack = [n for n in (value if isinstance(value, list) else [value]) if isinstance(n, ASTNode)]
+    while stack:
+        node = stack.pop()
+        if id(node) in copies:
+            continue
+        dup = object.__new__(type(node))
+        dup.__dict__.update(node.__dict__)
+        copies[id(node)] = dup
+        stack.extend(child_nodes(node))
+
+    def remap(v: Any) -> Any:
+        if isinstance(v, ASTNode):
+            return copies[id(v)]
+        if isinstance(v, list):
+            return [remap(x) for x in v]
+        return v
+
+    for dup in copies.values():
+        for name, _ in node_layout(type(dup)):
+            v = dup.__dict__[name]
+            if isinstance(v, (ASTNode, list)):
+                dup.__dict__[name] = remap(v)
+    return remap(value)
+
+
+# Serializacao
+
+def node_to_dict(node: Any) -> Any:
+    # pilha explicita (cadeias longas de BinOp); cada valor composto ganha
+    # seu dict/lista no lugar reservado pelo pai, entao a ordem dos campos
+    # e a mesma da versao recursiva
+    root = [node]
+    stack: List[Tuple[Any, Any, Any]] = [(node, root, 0)]
+    while stack:
+        value, holder, slot = stack.pop()
+        if isinstance(value, ASTNode):
+            out: Dict[str, Any] = {"kind": type(value).__name__}
+            for name, _ in node_layout(type(value)):
+                out[name] = getattr(value, name)
+                stack.append((out[name], out, name))
+            holder[slot] = out
+        elif isinstance(value, (list, tuple)):
+            items = list(value)
+            stack.extend((x, items, k) for k, x in enumerate(items))
+            holder[slot] = items
+    return root[0]
+
+
+def node_to_json(node: Any) -> str:
+    """
+    Mesmo texto de json.dumps(node_to_dict(node)), sem recursao: o encoder
+    do modulo json estoura a pilha em arvores fundas.
+    """
+    parts: List[str] = []
+    # (literal?, valor): literais sao pedacos de JSON ja prontos
+    stack: List[Tuple[bool, Any]] = [(False, node)]
+    while stack:
+        literal, value = stack.pop()
+        if literal:
+            parts.append(value)
+        elif isinstance(value, ASTNode):
+            parts.append('{"kind": ' + json.dumps(type(value).__name__))
+            stack.append((True, "}"))
+            for name, _ in reversed(node_layout(type(value))):
+                stack.append((False, getattr(value, name)))
+                stack.append((True, ", " + json.dumps(name) + ": "))
+        elif isinstance(value, (list, tuple)):
+            parts.append("[")
+            stack.append((True, "]"))
+            for k in range(len(value) - 1, -1, -1):
+                stack.append((False, value[k]))
+                if k:
+                    stack.append((True, ", "))
+        else:
+            parts.append(json.dumps(value))
+    return "".join(parts)
@@ -0,0 +1,280 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from generator import GenConfig, generate_program
+from interpreter import run_program
+from lexer import lex
+from ll1_parser import LL1Parser, same_positions
+from parser import Parser, usable_cpus
+from transpiler import CompiledProgram, transpile
+from visualizer import children, draw_tree, _compute_layout
+
+
+# Escalas padrao: da ordem dos exemplos ate arquivos com milhares de funcoes.
+SCALES: Dict[str, GenConfig] = {
+    "small": GenConfig(functions=10, depth=2, expr_len=4, stmts=4),
+    "medium": GenConfig(functions=100, depth=2, expr_len=6, stmts=4),
+    "large": GenConfig(functions=1000, depth=2, expr_len=6, stmts=4),
+}
+
+# Programas de execucao: o laco de examples/valid3.c e variacoes com
+# chamadas, divisao truncada e float, com N iteracoes no laco externo.
+EXEC_PROGRAMS: Dict[str, str] = {
+    "loop": """int main() {
+    int i;
+    int sum = 0;
+    for (i = 0; i < N; i = i + 1) {
+        sum = sum + i;
+    }
+    return sum;
+}
+""",
+    "nested": """int step(int x, int k) {
+    return x / k - x / (k + 1);
+}
+int main() {
+    int i;
+    int j;
+    int acc = 0;
+    for (i = 0; i < N / 20; i = i + 1) {
+        for (j = 1; j < 20; j = j + 1) {
+            acc = acc + step(i * j - 50, j);
+        }
+    }
+    return acc;
+}
+""",
+    "while": """int main() {
+    float x = 0.0;
+    int n = 0;
+    while (n < N && x >= 0) {
+        x = x + n / 4.0;
+        n = n + 1;
+    }
+    return x / 1000;
+}
+""",
+}
+
+DEFAULT_BASELINE = "bench_baseline.json"
+
+
+def count_nodes(root: Any) -> int:
+    total = 0
+    stack = [root]
+    while stack:
+        n = stack.pop()
+        total += 1
+        stack.extend(c for c in children(n) if c is not None)
+    return total
+
+
+def best_of(fn: Callable[[], Any], repeat: int) -> Tuple[float, Any]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        dt = time.perf_counter() - t0
+        best = min(best, dt)
+    return best, result
+
+
+def _parse(tokens):
+    program, errors = Parser(tokens).parse_program()
+    if errors:
+        raise RuntimeError(f"programa gerado invalido: {errors[0]}")
+    return program
+
+
+def bench_scale(cfg: GenConfig, repeat: int = 3, render: bool = True,
+                render_max_nodes: int = 5000, jobs: int = 1) -> Dict[str, Optional[float]]:
+    code = generate_program(cfg)
+
+    lex_time, (tokens, lex_errors) = best_of(lambda: lex(code), repeat)
+    if lex_errors:
+        raise RuntimeError(f"programa gerado invalido: {lex_errors[0]}")
+    parse_time, program = best_of(lambda: _parse(tokens), repeat)
+    nodes = count_nodes(program)
+    ll1_time, ll1_program = best_of(lambda: LL1Parser(tokens).parse_program()[0], repeat)
+    if ll1_program != program or not same_positions(ll1_program, program):
+        raise RuntimeError("o parser LL(1) gerou uma AST diferente da do Parser")
+    parallel_time: Optional[float] = None
+    # com menos CPUs que -j o modo paralelo usa menos processos (ou nenhum)
+    workers = min(jobs, usable_cpus())
+    if jobs > 1:
+        parallel_time, _ = best_of(lambda: Parser(tokens).parse_program_parallel(jobs, min_tokens=0), repeat)
+    layout_time, _ = best_of(lambda: _compute_layout(program, 0.0, 0.0), repeat)
+
+    render_time: Optional[float] = None
+    if render and nodes <= render_max_nodes:
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, "tree.png")
+            render_time, _ = best_of(lambda: draw_tree(program, out), 1)
+
+    # medido a parte: tracemalloc distorce os tempos
+    tracemalloc.start()
+    toks, _ = lex(code)
+    _parse(toks)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "source_bytes": len(code),
+        "tokens": len(tokens),
+        "nodes": nodes,
+        "lex_tokens_per_sec": len(tokens) / lex_time,
+        "parse_nodes_per_sec": nodes / parse_time,
+        "ll1_parse_nodes_per_sec": nodes / ll1_time,
+        "parallel_parse_nodes_per_sec": nodes / parallel_time if parallel_time else None,
+        "parallel_workers": workers if parallel_time else None,
+        "layout_seconds": layout_time,
+        "render_seconds": render_time,
+        "peak_memory_bytes": peak,
+    }
+
+
+def bench_exec(source: str, iterations: int, repeat: int = 3) -> Dict[str, float]:
+    """Interpretador de referencia contra o codigo transpilado, no mesmo programa."""
+    code = source.replace("N", str(iterations))
+    tokens, _ = lex(code)
+    program = _parse(tokens)
+
+    def build() -> CompiledProgram:
+        py = transpile(program)
+        return CompiledProgram(py, compile(py, "<bench>", "exec"), [], "")
+
+    compile_time, compiled = best_of(build, repeat)
+    run_time, result = best_of(compiled.run, repeat)
+    interp_time, expected = best_of(lambda: run_program(program), 1)
+    if result != expected:
+        raise RuntimeError(f"transpilado devolveu {result}, interpretador {expected}")
+    return {
+        "iterations": iterations,
+        "compile_seconds": compile_time,
+        "interpret_seconds": interp_time,
+        "transpiled_seconds": run_time,
+        "speedup": interp_time / run_time,
+    }
+
+
+# Metricas de tamanho descrevem a entrada e nao entram na comparacao.
+_INFORMATIVE = ("source_bytes", "tokens", "nodes", "iterations", "speedup")
+
+
+def compare(current: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            threshold: float) -> List[str]:
+    regressions: List[str] = []
+    for scale, metrics in current.items():
+        base = baseline.get(scale)
+        if not base:
+            continue
+        for name, value in metrics.items():
+            old = base.get(name)
+            if name in _INFORMATIVE or value is None or not old:
+                continue
+            if name.endswith("_per_sec"):
+                change = (old - value) / old
+            else:
+                change = (value - old) / old
+            if change > threshold:
+                regressions.append(f"{scale}.{name}: {old:.4g} -> {value:.4g} ({change:+.1%})")
+    return regressions
+
+
+def load_baseline(path: str) -> Dict[str, Dict[str, Any]]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get("scales", {})
+
+
+def save_baseline(path: str, results: Dict[str, Dict[str, Any]]):
+    data = {
+        "python": sys.version.split()[0],
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "scales": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def print_results(results: Dict[str, Dict[str, Any]]):
+    for scale, m in results.items():
+        if "speedup" in m:
+            print(f"[{scale}] {m['iterations']} iteracoes")
+            print(f"  compilar:     {m['compile_seconds'] * 1000:.2f} ms")
+            print(f"  interpretado: {m['interpret_seconds'] * 1000:.1f} ms")
+            print(f"  transpilado:  {m['transpiled_seconds'] * 1000:.1f} ms ({m['speedup']:.1f}x)")
+            continue
+        render = "-" if m["render_seconds"] is None else f"{m['render_seconds'] * 1000:.1f} ms"
+        print(f"[{scale}] {m['tokens']} tokens, {m['nodes']} nos, {m['source_bytes']} bytes")
+        print(f"  lexer:   {m['lex_tokens_per_sec']:,.0f} tokens/s")
+        print(f"  parser:  {m['parse_nodes_per_sec']:,.0f} nos/s")
+        if m.get("ll1_parse_nodes_per_sec"):
+            print(f"  LL(1):   {m['ll1_parse_nodes_per_sec']:,.0f} nos/s "
+                  f"({m['ll1_parse_nodes_per_sec'] / m['parse_nodes_per_sec']:.2f}x)")
+        if m.get("parallel_parse_nodes_per_sec"):
+            workers = m.get("parallel_workers") or 1
+            mode = f"{workers} processos" if workers > 1 else "serial: 1 CPU disponivel"
+            print(f"  paralelo: {m['parallel_parse_nodes_per_sec']:,.0f} nos/s "
+                  f"({m['parallel_parse_nodes_per_sec'] / m['parse_nodes_per_sec']:.2f}x, {mode})")
+        print(f"  layout:  {m['layout_seconds'] * 1000:.1f} ms")
+        print(f"  render:  {render}")
+        print(f"  memoria: {m['peak_memory_bytes'] / 1024:.0f} KiB (pico lex+parse)")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark do lexer, parsers e visualizador")
+    ap.add_argument("--scales", nargs="+", default=list(SCALES), choices=list(SCALES))
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--no-render", action="store_true")
+    ap.add_argument("--render-max-nodes", type=int, default=5000)
+    ap.add_argument("-j", "--jobs", type=int, default=1, help="mede tambem o parse paralelo com N processos")
+    ap.add_argument("--exec", dest="exec_programs", nargs="*", choices=list(EXEC_PROGRAMS),
+                    help="mede tambem a execucao (interpretador x transpiler); sem nomes, todos")
+    ap.add_argument("--iterations", type=int, default=20000, help="N dos programas de --exec")
+    ap.add_argument("--baseline", default=DEFAULT_BASELINE)
+    ap.add_argument("--save", action="store_true", help="grava os resultados como nova baseline")
+    ap.add_argument("--threshold", type=float, default=0.2,
+                    help="piora relativa tolerada antes de acusar regressao (padrao: 0.2)")
+    args = ap.parse_args()
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for name in args.scales:
+        base_cfg = SCALES[name]
+        cfg = GenConfig(**{**base_cfg.__dict__, "seed": args.seed})
+        results[name] = bench_scale(cfg, args.repeat, not args.no_render, args.render_max_nodes, args.jobs)
+    if args.exec_programs is not None:
+        for name in args.exec_programs or list(EXEC_PROGRAMS):
+            results[f"exec-{name}"] = bench_exec(EXEC_PROGRAMS[name], args.iterations, args.repeat)
+    print_results(results)
+
+    if args.save:
+        save_baseline(args.baseline, results)
+        print("Baseline salva:", args.baseline)
+        return
+
+    baseline = load_baseline(args.baseline)
+    if not baseline:
+        print("Sem baseline em", args.baseline, "(use --save)")
+        return
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\nRegressoes acima de {args.threshold:.0%}:")
+        for r in regressions:
+            print(" ", r)
+        sys.exit(1)
+    print("\nSem regressoes em relacao a", args.baseline)
+
+
+if __name__ == "__main__":
+    main()
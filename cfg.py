@@ -0,0 +1,354 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ast_nodes import (
+    ASTNode, Assign, BinOp, Block, Call, For, FunctionDecl, If, Index, Num,
+    Program, Return, Var, VarDecl, While,
+)
+
+
+# Grafo de fluxo de controle de uma funcao. Cada bloco basico guarda as
+# instrucoes simples (VarDecl, Assign, expressoes, Return), o teste que
+# decide o desvio no fim do bloco e a sequencia de eventos de uso/definicao
+# de variaveis na ordem de avaliacao. Os nomes ja saem resolvidos pelo
+# escopo de bloco: cada declaracao vira uma variavel com indice proprio,
+# que e a posicao do seu bit nos conjuntos da analise de fluxo de dados.
+
+USE = 0
+DEF = 1
+MAY_DEF = 2  # definicao condicional (lado direito de && / ||): nao mata as anteriores
+
+
+@dataclass
+class VarInfo:
+    index: int
+    name: str
+    decl: ASTNode          # VarDecl, ou a FunctionDecl no caso de parametro
+    is_param: bool = False
+
+
+@dataclass
+class Event:
+    kind: int
+    var: int
+    node: ASTNode          # Var usada, Assign ou VarDecl que define
+    def_id: int = -1       # indice da definicao (DEF/MAY_DEF)
+
+
+@dataclass
+class BasicBlock:
+    id: int
+    stmts: List[ASTNode] = field(default_factory=list)
+    cond: Optional[ASTNode] = None
+    events: List[Event] = field(default_factory=list)
+    succs: List[int] = field(default_factory=list)
+    preds: List[int] = field(default_factory=list)
+
+    def anchor(self) -> Optional[ASTNode]:
+        # primeiro no do bloco com posicao de origem
+        if self.stmts:
+            return self.stmts[0]
+        return self.cond
+
+
+@dataclass
+class Definition:
+    id: int
+    var: int
+    node: Optional[ASTNode]  # None: valor indefinido (declaracao sem inicializador)
+    block: int
+
+
+@dataclass
+class CFG:
+    function: FunctionDecl
+    blocks: List[BasicBlock]
+    entry: int
+    exit: int
+    variables: List[VarInfo]
+    definitions: List[Definition]
+    undeclared: List[Var]
+
+    def reachable(self) -> Set[int]:
+        seen = {self.entry}
+        stack = [self.entry]
+        while stack:
+            for s in self.blocks[stack.pop()].succs:
+                if s not in seen:
+                    seen.add(s)
+                    stack.append(s)
+        return seen
+
+    def postorder(self) -> List[int]:
+        # sucessores visitados do ultimo para o primeiro: a saida do laco
+        # termina antes do corpo, que fica logo depois do cabecalho na
+        # pos-ordem reversa
+        order: List[int] = []
+        seen = {self.entry}
+        stack: List[Tuple[int, int]] = [(self.entry, 0)]
+        while stack:
+            b, i = stack[-1]
+            succs = self.blocks[b].succs
+            if i < len(succs):
+                stack[-1] = (b, i + 1)
+                s = succs[-1 - i]
+                if s not in seen:
+                    seen.add(s)
+                    stack.append((s, 0))
+            else:
+                stack.pop()
+                order.append(b)
+        return order
+
+    def to_dot(self) -> str:
+        lines = [f'digraph "{self.function.name}" {{', "  node [shape=box, fontname=monospace];"]
+        for b in self.blocks:
+            label = f"B{b.id}"
+            if b.id == self.entry:
+                label += " (entrada)"
+            elif b.id == self.exit:
+                label += " (saida)"
+            label += "\\l" + "".join(f"{type(s).__name__} @ {s.line}\\l" for s in b.stmts)
+            if b.cond is not None:
+                label += f"teste @ {b.cond.line}\\l"
+            lines.append(f'  B{b.id} [label="{label}"];')
+            for s in b.succs:
+                lines.append(f"  B{b.id} -> B{s};")
+        lines.append("}")
+        return "\n".join(lines) + "\n"
+
+
+def _constant(test: Optional[ASTNode]) -> Optional[bool]:
+    # testes literais (while (1), if (0), for (;;)) nao geram a aresta impossivel
+    if test is None:
+        return True
+    if isinstance(test, Num):
+        return float(test.value) != 0
+    return None
+
+
+class CFGBuilder:
+
+    def __init__(self, fn: FunctionDecl, global_names: Iterable[str] = ()):
+        self.fn = fn
+        self.global_names = set(global_names)
+        self.blocks: List[BasicBlock] = []
+        self.variables: List[VarInfo] = []
+        self.definitions: List[Definition] = []
+        self.undeclared: List[Var] = []
+        self.scopes: List[Dict[str, int]] = []
+        self.cur: Optional[BasicBlock] = None
+
+    def new_block(self) -> BasicBlock:
+        b = BasicBlock(len(self.blocks))
+        self.blocks.append(b)
+        return b
+
+    def edge(self, a: BasicBlock, b: BasicBlock):
+        a.succs.append(b.id)
+        b.preds.append(a.id)
+
+    def current(self) -> BasicBlock:
+        # codigo depois de return ou de laco infinito cai num bloco sem predecessores
+        if self.cur is None:
+            self.cur = self.new_block()
+        return self.cur
+
+    def build(self) -> CFG:
+        entry = self.new_block()
+        exit_block = BasicBlock(-1)
+        self.cur = entry
+        self.scopes.append({})
+        for ptype, pname in self.fn.params:
+            v = self.declare(pname, self.fn, is_param=True)
+            self.define(v, self.fn, DEF)
+        if self.fn.body is not None:
+            self.statements(self.fn.body.body)
+        self.scopes.pop()
+        exit_block.id = len(self.blocks)
+        self.blocks.append(exit_block)
+        for b in self.blocks[:-1]:
+            if b.succs and b.succs[-1] == -1:
+                b.succs[-1] = exit_block.id
+                exit_block.preds.append(b.id)
+        if self.cur is not None:
+            self.edge(self.cur, exit_block)
+        return CFG(self.fn, self.blocks, entry.id, exit_block.id, self.variables,
+                   self.definitions, self.undeclared)
+
+
+    # Variaveis
+
+    def declare(self, name: str, decl: ASTNode, is_param: bool = False) -> int:
+        index = len(self.variables)
+        self.variables.append(VarInfo(index, name, decl, is_param))
+        self.scopes[-1][name] = index
+        return index
+
+    def resolve(self, node: Var) -> Optional[int]:
+        for scope in reversed(self.scopes):
+            index = scope.get(node.name)
+            if index is not None:
+                return index
+        if node.name not in self.global_names:
+            self.undeclared.append(node)
+        return None  # globais nao entram na analise
+
+    def define(self, var: int, node: Optional[ASTNode], kind: int):
+        block = self.current()
+        d = Definition(len(self.definitions), var, node, block.id)
+        self.definitions.append(d)
+        block.events.append(Event(kind, var, node if node is not None else self.variables[var].decl, d.id))
+
+
+    # Instrucoes
+
+    def statements(self, stmts: List[ASTNode]):
+        for stmt in stmts:
+            self.statement(stmt)
+
+    def block(self, node: Optional[Block]):
+        if node is None:
+            return
+        self.scopes.append({})
+        self.statements(node.body)
+        self.scopes.pop()
+
+    def statement(self, node: ASTNode):
+        if isinstance(node, If):
+            self.branch(node)
+        elif isinstance(node, While):
+            self.loop(node.test, node.body, None, node)
+        elif isinstance(node, For):
+            self.scopes.append({})
+            if node.init is not None:
+                self.statement(node.init)
+            self.loop(node.cond, node.body, node.step, node)
+            self.scopes.pop()
+        elif isinstance(node, Block):
+            self.block(node)
+        else:
+            self.current().stmts.append(node)
+            if isinstance(node, VarDecl):
+                if node.init is not None:
+                    self.expr(node.init, DEF)
+                v = self.declare(node.name, node)
+                # sem inicializador a declaracao "define" um valor indefinido
+                self.define(v, node if node.init is not None else None, DEF)
+            elif isinstance(node, Return):
+                if node.value is not None:
+                    self.expr(node.value, DEF)
+                self.current().succs.append(-1)  # ligado a saida em build()
+                self.cur = None
+            else:
+                self.expr(node, DEF)
+
+    def branch(self, node: If):
+        head = self.current()
+        head.cond = node.test
+        self.expr(node.test, DEF)
+        const = _constant(node.test)
+
+        then_block = self.new_block()
+        if const is not False:
+            self.edge(head, then_block)
+        self.cur = then_block
+        self.block(node.then)
+        then_end = self.cur
+
+        else_end: Optional[BasicBlock] = head if const is not True else None
+        if node.otherwise is not None:
+            else_block = self.new_block()
+            if const is not True:
+                self.edge(head, else_block)
+            self.cur = else_block
+            self.block(node.otherwise)
+            else_end = self.cur
+
+        join = self.new_block()
+        for end in (then_end, else_end):
+            if end is not None:
+                self.edge(end, join)
+        self.cur = join
+
+    def loop(self, test: Optional[ASTNode], body: Optional[Block], step: Optional[ASTNode], node: ASTNode):
+        before = self.current()
+        header = self.new_block()
+        self.edge(before, header)
+        header.cond = test if test is not None else node
+        self.cur = header
+        if test is not None:
+            self.expr(test, DEF)
+        const = _constant(test)
+
+        body_block = self.new_block()
+        if const is not False:
+            self.edge(header, body_block)
+        self.cur = body_block
+        self.block(body)
+        if step is not None:
+            if self.cur is not None:
+                step_block = self.new_block()
+                self.edge(self.cur, step_block)
+                self.cur = step_block
+            self.current().stmts.append(step)
+            self.expr(step, DEF)
+        if self.cur is not None:
+            self.edge(self.cur, header)
+
+        after = self.new_block()
+        if const is not True:
+            self.edge(header, after)
+        self.cur = after
+
+
+    # Expressoes, na ordem de avaliacao
+
+    def expr(self, node: ASTNode, kind: int):
+        # pilha explicita (cadeias longas de BinOp nao estouram a pilha do
+        # Python); os filhos sao empilhados ao contrario para sair na ordem
+        # de avaliacao, e a definicao de um Assign vem depois do seu valor
+        stack: List[Tuple[Optional[ASTNode], int, Optional[Assign]]] = [(node, kind, None)]
+        while stack:
+            node, kind, assign = stack.pop()
+            if assign is not None:
+                v = self.resolve(assign.target)
+                if v is not None:
+                    self.define(v, assign, kind)
+                continue
+            t = type(node)
+            if t is Var:
+                v = self.resolve(node)
+                if v is not None:
+                    self.current().events.append(Event(USE, v, node))
+            elif t is BinOp:
+                # o lado direito de && / || pode nao ser avaliado
+                stack.append((node.right, MAY_DEF if node.op in ("&&", "||") else kind, None))
+                stack.append((node.left, kind, None))
+            elif t is Assign:
+                stack.append((None, kind, node))
+                stack.append((node.value, kind, None))
+            elif t is Call:
+                stack.extend((a, kind, None) for a in reversed(node.args))
+                if type(node.callee) is not Var:
+                    stack.append((node.callee, kind, None))
+            elif t is Index:
+                stack.append((node.index, kind, None))
+                stack.append((node.target, kind, None))
+
+
+def global_names(program: Program) -> Set[str]:
+    names = set()
+    for decl in program.body:
+        if isinstance(decl, (VarDecl, FunctionDecl)):
+            names.add(decl.name)
+    return names
+
+
+def build_cfg(fn: FunctionDecl, globals_: Iterable[str] = ()) -> CFG:
+    return CFGBuilder(fn, globals_).build()
+
+
+def build_cfgs(program: Program) -> List[CFG]:
+    names = global_names(program)
+    return [build_cfg(d, names) for d in program.body if isinstance(d, FunctionDecl)]
@@ -0,0 +1,105 @@
+import argparse
+import itertools
+import json
+import os
+import socket
+import sys
+import tempfile
+from typing import Any, Dict, Optional
+
+
+# Cliente do daemon (daemon.py). Importa so a biblioteca padrao para que a
+# partida do interpretador seja o unico custo fixo de cada chamada.
+
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), f"compiladores-n2-{os.getuid()}.sock")
+
+
+class RPCError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(f"{message} ({code})")
+        self.code = code
+        self.message = message
+
+
+class Client:
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(socket_path)
+        self.reader = self.sock.makefile("r", encoding="utf-8")
+        self.ids = itertools.count(1)
+
+    def call(self, method: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        req = {"jsonrpc": "2.0", "id": next(self.ids), "method": method, "params": params or {}}
+        self.sock.sendall((json.dumps(req) + "\n").encode("utf-8"))
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("daemon encerrou a conexao")
+        resp = json.loads(line)
+        if "error" in resp:
+            raise RPCError(resp["error"]["code"], resp["error"]["message"])
+        return resp["result"]
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+
+def _print_errors(result: Dict[str, Any]) -> bool:
+    ok = True
+    for key, title in (("lex_errors", "Erros lexicos"), ("syntax_errors", "Erros sintaticos")):
+        errs = result.get(key) or []
+        if errs:
+            ok = False
+            print(f"{title}:")
+            for e in errs:
+                where = f"{e['file']}:" if e.get("file") else ""
+                print(f"  {e['message']} @ {where}{e['line']}:{e['col']}")
+    # avisos nao tornam o resultado invalido
+    warnings = result.get("warnings") or []
+    if warnings:
+        print("Avisos:")
+        for w in warnings:
+            where = f"{w['file']}:" if w.get("file") else ""
+            print(f"  {w['message']} @ {where}{w['line']}:{w['col']}")
+    return ok
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Cliente do daemon de analise")
+    ap.add_argument("method", choices=("lex", "parse", "check", "render", "stats", "shutdown"))
+    ap.add_argument("files", nargs="*")
+    ap.add_argument("--socket", default=DEFAULT_SOCKET)
+    ap.add_argument("-o", "--output", help="imagem de saida (render com um unico arquivo)")
+    args = ap.parse_args()
+
+    client = Client(args.socket)
+    status = 0
+    try:
+        if args.method in ("stats", "shutdown"):
+            print(json.dumps(client.call(args.method), indent=2))
+            return
+        for path in args.files:
+            with open(path, "r", encoding="utf-8") as f:
+                params: Dict[str, Any] = {"code": f.read(), "path": os.path.abspath(path)}
+            if args.method == "render":
+                if args.output and len(args.files) == 1:
+                    params["output"] = os.path.abspath(args.output)
+            result = client.call(args.method, params)
+            if args.method in ("lex", "parse"):
+                print(json.dumps(result))
+            elif not _print_errors(result):
+                print(f"{path}: falhou")
+                status = 1
+            elif args.method == "render":
+                print("Salvo:", result["output"])
+    except RPCError as e:
+        print("Erro do daemon:", e, file=sys.stderr)
+        status = 2
+    finally:
+        client.close()
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
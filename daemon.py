@@ -0,0 +1,380 @@
+import argparse
+import errno
+import hashlib
+import json
+import os
+import socket
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from ast_nodes import node_to_json
+from client import DEFAULT_SOCKET
+from dataflow import analyze_program
+from parser import Parser
+from preprocessor import Preprocessor, file_stamps, parse_defines
+from visualizer import draw_tree
+
+
+# Servidor JSON-RPC 2.0 (uma mensagem por linha) que mantem lexer, parser e
+# matplotlib carregados entre chamadas. O codigo passa pelo mesmo
+# preprocessador de main.py (um por sessao, com o cache de cabecalhos).
+# Resultados sao memorizados pelo hash do conteudo e validados pelo stat dos
+# cabecalhos incluidos, entao reenviar um arquivo inalterado custa so a
+# serializacao.
+
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+class RPCFailure(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+def _errors(errs, source: Optional[str] = None) -> list:
+    # "file" so aparece para erros vindos de outro arquivo (cabecalho)
+    out = []
+    for e in errs:
+        item = {"message": e.message, "line": e.line, "col": e.col}
+        if e.file not in (None, source):
+            item["file"] = e.file
+        out.append(item)
+    return out
+
+
+def _fresh(stamps: List[Tuple[str, int, int]]) -> bool:
+    return file_stamps(p for p, _, _ in stamps) == stamps
+
+
+class Service:
+
+    def __init__(self, cache_size: int = 512, include_dirs: Optional[List[str]] = None,
+                 defines: Optional[Dict[str, str]] = None):
+        # (metodo, arquivo, hash) -> (resultado em JSON, stat dos cabecalhos)
+        self.cache: "OrderedDict[Tuple[str, str, str], Tuple[str, List[Tuple[str, int, int]]]]" = OrderedDict()
+        self.cache_size = cache_size
+        self.lock = threading.Lock()
+        self.pp = Preprocessor(include_dirs, defines)
+        self.pp_lock = threading.Lock()
+        self.render_lock = threading.Lock()  # pyplot nao e thread-safe
+        self.hits = 0
+        self.misses = 0
+        self.shutdown_requested = threading.Event()
+        self.methods: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            "lex": self.rpc_lex,
+            "parse": self.rpc_parse,
+            "check": self.rpc_check,
+            "render": self.rpc_render,
+            "stats": self.rpc_stats,
+            "shutdown": self.rpc_shutdown,
+        }
+
+
+    # Cache por conteudo
+
+    def memo(self, method: str, code: str, source: str, compute: Callable[[], Tuple[Any, Set[str]]]) -> str:
+        # compute devolve (resultado ou JSON pronto, cabecalhos de que dependeu)
+        key = (method, source, hashlib.sha256(code.encode("utf-8")).hexdigest())
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        result, deps = compute()
+        encoded = result if isinstance(result, str) else json.dumps(result)
+        self._store(key, encoded, deps)
+        return encoded
+
+    def _lookup(self, key: Tuple[str, str, str]) -> Optional[str]:
+        with self.lock:
+            cached = self.cache.get(key)
+        if cached is not None and _fresh(cached[1]):
+            with self.lock:
+                if key in self.cache:
+                    self.cache.move_to_end(key)
+                self.hits += 1
+            return cached[0]
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def _store(self, key: Tuple[str, str, str], encoded: str, deps: Iterable[str]):
+        stamps = file_stamps(deps)
+        with self.lock:
+            self.cache[key] = (encoded, stamps)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+    @staticmethod
+    def _code(params: Dict[str, Any]) -> str:
+        if "code" in params:
+            return params["code"]
+        if "path" in params:
+            with open(params["path"], "r", encoding="utf-8") as f:
+                return f.read()
+        raise RPCFailure(INVALID_PARAMS, "informe 'code' ou 'path'")
+
+    @staticmethod
+    def _source(params: Dict[str, Any]) -> str:
+        # nome do arquivo principal: base dos #include "..." e parte da chave do cache
+        return os.path.abspath(params["path"]) if "path" in params else "<input>"
+
+    def _preprocess(self, code: str, source: str):
+        with self.pp_lock:
+            tokens, errors = self.pp.preprocess(code, source)
+            deps = set(self.pp.dependencies.get(source, ()))
+        return tokens, errors, deps
+
+    def _analyze(self, code: str, source: str):
+        tokens, lex_errors, deps = self._preprocess(code, source)
+        if lex_errors:
+            return tokens, lex_errors, None, [], deps
+        program, syntax_errors = Parser(tokens).parse_program()
+        return tokens, lex_errors, program, syntax_errors, deps
+
+
+    # Metodos
+
+    def rpc_lex(self, params: Dict[str, Any]) -> str:
+        code = self._code(params)
+        source = self._source(params)
+
+        def compute():
+            tokens, errors, deps = self._preprocess(code, source)
+            return {
+                # quinto campo: arquivo de origem, se nao for o principal
+                "tokens": [[t.type, t.lex, t.line, t.col, t.file if t.file != source else None] for t in tokens],
+                "lex_errors": _errors(errors, source),
+            }, deps
+        return self.memo("lex", code, source, compute)
+
+    def rpc_parse(self, params: Dict[str, Any]) -> str:
+        code = self._code(params)
+        source = self._source(params)
+
+        def compute():
+            _, lex_errors, program, syntax_errors, deps = self._analyze(code, source)
+            head = json.dumps({
+                "ok": program is not None,
+                "lex_errors": _errors(lex_errors, source),
+                "syntax_errors": _errors(syntax_errors, source),
+            })
+            # a AST vai ja serializada: json.dumps estoura a pilha em arvores fundas
+            ast = node_to_json(program) if program is not None else "null"
+            return f'{head[:-1]}, "ast": {ast}}}', deps
+        return self.memo("parse", code, source, compute)
+
+    def rpc_check(self, params: Dict[str, Any]) -> str:
+        code = self._code(params)
+        source = self._source(params)
+
+        def compute():
+            _, lex_errors, program, syntax_errors, deps = self._analyze(code, source)
+            return {
+                "ok": program is not None,
+                "lex_errors": _errors(lex_errors, source),
+                "syntax_errors": _errors(syntax_errors, source),
+                "warnings": _errors(analyze_program(program), source) if program is not None else [],
+            }, deps
+        return self.memo("check", code, source, compute)
+
+    def rpc_render(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        code = self._code(params)
+        output = params.get("output")
+        if not output:
+            name = os.path.splitext(os.path.basename(params.get("path", "stdin.c")))[0]
+            output = os.path.abspath(os.path.join("trees", f"{name}_program.png"))
+        source = self._source(params)
+        digest = hashlib.sha256(code.encode("utf-8")).hexdigest()
+        key = ("render:" + output, source, digest)
+        with self.lock:
+            cached = self.cache.get(key)
+        if cached is not None and os.path.exists(output) and _fresh(cached[1]):
+            with self.lock:
+                if key in self.cache:
+                    self.cache.move_to_end(key)
+                self.hits += 1
+            return json.loads(cached[0])
+
+        _, lex_errors, program, syntax_errors, deps = self._analyze(code, source)
+        result = {
+            "ok": program is not None,
+            "lex_errors": _errors(lex_errors, source),
+            "syntax_errors": _errors(syntax_errors, source),
+            "output": None,
+        }
+        if program is not None:
+            os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+            with self.render_lock:
+                draw_tree(program, output)
+            result["output"] = output
+        with self.lock:
+            self.misses += 1
+        self._store(key, json.dumps(result), deps)
+        return result
+
+    def rpc_stats(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        with self.lock:
+            return {"entries": len(self.cache), "hits": self.hits, "misses": self.misses}
+
+    def rpc_shutdown(self, params: Dict[str, Any]) -> bool:
+        self.shutdown_requested.set()
+        return True
+
+
+    # JSON-RPC
+
+    def handle_line(self, line: str) -> Optional[str]:
+        req_id: Any = None
+        try:
+            try:
+                req = json.loads(line)
+            except ValueError:
+                raise RPCFailure(PARSE_ERROR, "JSON invalido")
+            if not isinstance(req, dict) or not isinstance(req.get("method"), str):
+                raise RPCFailure(INVALID_REQUEST, "requisicao invalida")
+            req_id = req.get("id")
+            method = self.methods.get(req["method"])
+            if method is None:
+                raise RPCFailure(METHOD_NOT_FOUND, f"metodo desconhecido: {req['method']}")
+            params = req.get("params") or {}
+            if not isinstance(params, dict):
+                raise RPCFailure(INVALID_PARAMS, "params deve ser um objeto")
+            result = method(params)
+            if "id" not in req:
+                return None  # notificacao
+            # resultados memorizados ja chegam serializados
+            encoded = result if isinstance(result, str) else json.dumps(result)
+            return f'{{"jsonrpc": "2.0", "id": {json.dumps(req_id)}, "result": {encoded}}}'
+        except RPCFailure as e:
+            error = {"code": e.code, "message": e.message}
+        except OSError as e:
+            error = {"code": INVALID_PARAMS, "message": str(e)}
+        except Exception as e:
+            error = {"code": INTERNAL_ERROR, "message": f"{type(e).__name__}: {e}"}
+        return json.dumps({"jsonrpc": "2.0", "id": req_id, "error": error})
+
+
+# Transportes
+
+def _is_shutdown(line: str) -> bool:
+    # a busca pela palavra evita decodificar de novo toda requisicao; quem
+    # decide e o metodo, nao um "shutdown" dentro do codigo ou de um caminho
+    if "shutdown" not in line:
+        return False
+    try:
+        req = json.loads(line)
+    except ValueError:
+        return False
+    return isinstance(req, dict) and req.get("method") == "shutdown"
+
+
+def _serve_stream(service: Service, pool: ThreadPoolExecutor, reader, write: Callable[[str], None]):
+    write_lock = threading.Lock()
+
+    def respond(line: str):
+        out = service.handle_line(line)
+        if out is not None:
+            with write_lock:
+                write(out + "\n")
+
+    pending: set = set()
+    for line in reader:
+        if line.strip():
+            fut = pool.submit(respond, line)
+            pending.add(fut)
+            fut.add_done_callback(pending.discard)
+            if _is_shutdown(line):
+                # a parada vale antes de ler a proxima linha (o stdin pode
+                # continuar aberto)
+                fut.result()
+        if service.shutdown_requested.is_set():
+            break
+    # respostas atrasadas ainda precisam do canal aberto
+    wait(list(pending))
+
+
+def serve_stdio(service: Service, workers: int):
+    def write(s: str):
+        sys.stdout.write(s)
+        sys.stdout.flush()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        _serve_stream(service, pool, sys.stdin, write)
+
+
+def _socket_in_use(path: str) -> bool:
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+def serve_unix(service: Service, path: str, workers: int):
+    if os.path.exists(path):
+        if _socket_in_use(path):
+            raise OSError(errno.EADDRINUSE, "ja existe um daemon ouvindo neste socket", path)
+        os.unlink(path)  # sobra de um daemon que nao terminou direito
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen()
+    server.settimeout(0.5)
+    pool = ThreadPoolExecutor(max_workers=workers)
+
+    def client_loop(conn: socket.socket):
+        with conn, conn.makefile("r", encoding="utf-8") as reader:
+            _serve_stream(service, pool, reader, lambda s: conn.sendall(s.encode("utf-8")))
+
+    print(f"daemon ouvindo em {path}", file=sys.stderr)
+    try:
+        while not service.shutdown_requested.is_set():
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                continue
+            threading.Thread(target=client_loop, args=(conn,), daemon=True).start()
+    finally:
+        server.close()
+        pool.shutdown(wait=True)
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Daemon JSON-RPC para lex/parse/render/check")
+    ap.add_argument("--socket", default=DEFAULT_SOCKET)
+    ap.add_argument("--stdio", action="store_true", help="atende em stdin/stdout em vez do socket")
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--cache-size", type=int, default=512)
+    ap.add_argument("-I", dest="include_dirs", action="append", default=[], metavar="DIR",
+                    help="diretorio de busca para #include")
+    ap.add_argument("-D", dest="defines", action="append", default=[], metavar="NOME[=VALOR]",
+                    help="define uma macro antes do preprocessamento")
+    args = ap.parse_args()
+
+    service = Service(args.cache_size, args.include_dirs, parse_defines(args.defines))
+    try:
+        if args.stdio:
+            serve_stdio(service, args.workers)
+        else:
+            serve_unix(service, args.socket, args.workers)
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print("Erro:", e, file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
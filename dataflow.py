@@ -0,0 +1,244 @@
+import heapq
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set
+
+from ast_nodes import AnalysisWarning, ASTNode, FunctionDecl, Program
+from cfg import CFG, DEF, MAY_DEF, USE, build_cfg, global_names
+
+
+# Analises de fluxo de dados sobre o CFG. Conjuntos de variaveis ou de
+# definicoes sao inteiros usados como bitsets (bit i = variavel/definicao i),
+# entao uniao, intersecao e diferenca custam uma operacao sobre o inteiro.
+# O solver e um worklist generico com prioridade pela pos-ordem reversa
+# (analises para frente) ou pela pos-ordem (para tras): o bloco pendente
+# mais cedo na ordem sai primeiro, entao um laco converge antes de o
+# resultado seguir adiante e grafos sem lacos fecham em uma passada.
+
+
+@dataclass
+class Solution:
+    ins: List[int]    # conjunto na entrada de cada bloco (ordem do programa)
+    outs: List[int]   # conjunto na saida de cada bloco
+
+
+def solve(cfg: CFG, gen: List[int], kill: List[int], forward: bool = True,
+          union: bool = True, boundary: int = 0, universe: int = 0) -> Solution:
+    """
+    Ponto fixo de OUT = gen | (IN & ~kill) (para tras, com IN e OUT
+    trocados). `union` escolhe o encontro (uniao para analises "may",
+    intersecao para "must", partindo de `universe`); `boundary` e o valor
+    na entrada (ou na saida, para tras) da funcao.
+    """
+    blocks = cfg.blocks
+    n = len(blocks)
+    top = 0 if union else universe
+    ins = [top] * n
+    outs = [top] * n
+    start = cfg.entry if forward else cfg.exit
+    order = cfg.postorder()
+    if forward:
+        order.reverse()
+    seen = set(order)
+    order.extend(b for b in range(n) if b not in seen)  # blocos inalcancaveis por ultimo
+    rank = [0] * n
+    for i, b in enumerate(order):
+        rank[b] = i
+
+    worklist = list(range(n))  # ja e um heap: posicao i guarda o bloco de rank i
+    queued = [True] * n
+    while worklist:
+        b = order[heapq.heappop(worklist)]
+        queued[b] = False
+        block = blocks[b]
+        sources, targets = (block.preds, block.succs) if forward else (block.succs, block.preds)
+        if b == start:
+            value = boundary
+        elif union:
+            value = 0
+            for p in sources:
+                value |= (outs if forward else ins)[p]
+        else:
+            value = universe
+            for p in sources:
+                value &= (outs if forward else ins)[p]
+        if forward:
+            ins[b] = value
+            new = gen[b] | (value & ~kill[b])
+            if new == outs[b]:
+                continue
+            outs[b] = new
+        else:
+            outs[b] = value
+            new = gen[b] | (value & ~kill[b])
+            if new == ins[b]:
+                continue
+            ins[b] = new
+        for t in targets:
+            if not queued[t]:
+                queued[t] = True
+                heapq.heappush(worklist, rank[t])
+    return Solution(ins, outs)
+
+
+# Vivacidade
+
+def liveness(cfg: CFG) -> Solution:
+    """Variaveis vivas (lidas adiante antes de serem redefinidas) por bloco."""
+    uses: List[int] = []
+    defs: List[int] = []
+    for block in cfg.blocks:
+        use = 0
+        kill = 0
+        for e in block.events:
+            bit = 1 << e.var
+            if e.kind == USE:
+                if not kill & bit:
+                    use |= bit
+            elif e.kind == DEF:
+                kill |= bit
+        uses.append(use)
+        defs.append(kill)
+    return solve(cfg, uses, defs, forward=False)
+
+
+# Definicoes que alcancam
+
+@dataclass
+class ReachingDefinitions:
+    solution: Solution
+    var_defs: List[int]      # por variavel: bits de todas as suas definicoes
+    undefined: List[int]     # por variavel: bits das declaracoes sem inicializador
+
+
+def reaching_definitions(cfg: CFG) -> ReachingDefinitions:
+    var_defs = [0] * len(cfg.variables)
+    undefined = [0] * len(cfg.variables)
+    for d in cfg.definitions:
+        var_defs[d.var] |= 1 << d.id
+        if d.node is None:
+            undefined[d.var] |= 1 << d.id
+    gens: List[int] = []
+    kills: List[int] = []
+    for block in cfg.blocks:
+        # ultimas definicoes de cada variavel no bloco; evita operar com os
+        # bitsets inteiros a cada evento
+        last: Dict[int, List[int]] = {}
+        killed: Set[int] = set()
+        for e in block.events:
+            if e.kind == DEF:
+                last[e.var] = [e.def_id]
+                killed.add(e.var)
+            elif e.kind == MAY_DEF:
+                last.setdefault(e.var, []).append(e.def_id)
+        gen = 0
+        kill = 0
+        for ids in last.values():
+            for d in ids:
+                gen |= 1 << d
+        for v in killed:
+            kill |= var_defs[v]
+        gens.append(gen)
+        kills.append(kill)
+    return ReachingDefinitions(solve(cfg, gens, kills), var_defs, undefined)
+
+
+# Diagnosticos
+
+def _warn(message: str, node: Optional[ASTNode]) -> AnalysisWarning:
+    return AnalysisWarning(message, getattr(node, "line", 0), getattr(node, "col", 0),
+                           getattr(node, "file", None))
+
+
+def use_before_def(cfg: CFG, rd: Optional[ReachingDefinitions] = None) -> List[AnalysisWarning]:
+    rd = rd or reaching_definitions(cfg)
+    out: List[AnalysisWarning] = []
+    for b in sorted(cfg.reachable()):
+        current = rd.solution.ins[b]
+        for e in cfg.blocks[b].events:
+            if e.kind == USE:
+                reaching = current & rd.var_defs[e.var]
+                undefined = reaching & rd.undefined[e.var]
+                if undefined:
+                    name = cfg.variables[e.var].name
+                    if reaching == undefined:
+                        out.append(_warn(f"variavel '{name}' usada sem inicializacao", e.node))
+                    else:
+                        out.append(_warn(f"variavel '{name}' pode ser usada sem inicializacao", e.node))
+            elif e.kind == DEF:
+                current = (current & ~rd.var_defs[e.var]) | (1 << e.def_id)
+            else:
+                current |= 1 << e.def_id
+    return out
+
+
+def _used_variables(cfg: CFG) -> Set[int]:
+    return {e.var for block in cfg.blocks for e in block.events if e.kind == USE}
+
+
+def unused_variables(cfg: CFG) -> List[AnalysisWarning]:
+    used = _used_variables(cfg)
+    return [_warn(f"variavel '{v.name}' declarada e nunca usada", v.decl)
+            for v in cfg.variables if not v.is_param and v.index not in used]
+
+
+def dead_stores(cfg: CFG, live: Optional[Solution] = None) -> List[AnalysisWarning]:
+    """Atribuicoes cujo valor nunca e lido (variaveis sem nenhum uso ficam com unused_variables)."""
+    live = live or liveness(cfg)
+    used = _used_variables(cfg)
+    out: List[AnalysisWarning] = []
+    for b in sorted(cfg.reachable()):
+        current = live.outs[b]
+        found: List[AnalysisWarning] = []
+        for e in reversed(cfg.blocks[b].events):
+            bit = 1 << e.var
+            if e.kind == USE:
+                current |= bit
+                continue
+            d = cfg.definitions[e.def_id]
+            if not current & bit and d.node is not None and e.var in used \
+                    and not cfg.variables[e.var].is_param:
+                found.append(_warn(f"valor atribuido a '{cfg.variables[e.var].name}' nunca e usado", e.node))
+            if e.kind == DEF:
+                current &= ~bit
+        out.extend(reversed(found))
+    return out
+
+
+def unreachable_code(cfg: CFG) -> List[AnalysisWarning]:
+    """Um aviso por regiao inalcancavel, no primeiro no com posicao."""
+    reachable = cfg.reachable()
+    covered: Set[int] = set()
+    out: List[AnalysisWarning] = []
+    for block in cfg.blocks:
+        if block.id in reachable or block.id in covered or block.anchor() is None:
+            continue
+        out.append(_warn("codigo inalcancavel", block.anchor()))
+        stack = [block.id]
+        while stack:
+            b = stack.pop()
+            if b in covered or b in reachable:
+                continue
+            covered.add(b)
+            stack.extend(cfg.blocks[b].succs)
+    return out
+
+
+def undeclared_variables(cfg: CFG) -> List[AnalysisWarning]:
+    return [_warn(f"variavel '{v.name}' nao declarada", v) for v in cfg.undeclared]
+
+
+def analyze_function(fn: FunctionDecl, globals_: Iterable[str] = ()) -> List[AnalysisWarning]:
+    cfg = build_cfg(fn, globals_)
+    warnings = (undeclared_variables(cfg) + use_before_def(cfg) + unused_variables(cfg)
+                + dead_stores(cfg) + unreachable_code(cfg))
+    warnings.sort(key=lambda w: (w.line, w.col))
+    return warnings
+
+
+def analyze_program(program: Program) -> List[AnalysisWarning]:
+    names = global_names(program)
+    out: List[AnalysisWarning] = []
+    for decl in program.body:
+        if isinstance(decl, FunctionDecl):
+            out.extend(analyze_function(decl, names))
+    return out
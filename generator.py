@@ -0,0 +1,254 @@
+import random
+import sys
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+# Gerador de programas validos para a gramatica aceita pelo Parser.
+#
+# Os programas respeitam as restricoes de layout do parser: '{' na mesma
+# linha do cabecalho, '} else {' numa linha so e uma instrucao por linha.
+# Com indexing=False o programa tambem e executavel: lacos tem numero de
+# iteracoes limitado, divisores sao literais nao nulos, multiplicacoes sao
+# por literais (os valores nao crescem exponencialmente dentro dos lacos) e
+# so ha chamadas para funcoes "folha" ja definidas (sem recursao).
+
+
+@dataclass
+class GenConfig:
+    functions: int = 10
+    depth: int = 2
+    expr_len: int = 4
+    stmts: int = 4
+    params: int = 3
+    calls: bool = True
+    indexing: bool = True
+    seed: int = 0
+
+
+@dataclass
+class _FuncSig:
+    name: str
+    arity: int
+    leaf: bool
+
+
+class ProgramGenerator:
+
+    def __init__(self, cfg: GenConfig):
+        self.cfg = cfg
+        self.rng = random.Random(cfg.seed)
+        self.lines: List[str] = []
+        self.funcs: List[_FuncSig] = []
+        self.counter = 0
+        self.scopes: List[List[str]] = []
+        self.frozen: set = set()  # contadores de laco: nunca atribuidos no corpo
+        self.leaf = True
+
+    def generate(self) -> str:
+        for i in range(self.cfg.functions):
+            self.gen_function(f"f{i}", i)
+        self.gen_main()
+        return "\n".join(self.lines) + "\n"
+
+
+    # Escopos
+
+    def fresh(self) -> str:
+        self.counter += 1
+        return f"v{self.counter}"
+
+    def declare(self, name: str):
+        self.scopes[-1].append(name)
+
+    def visible(self) -> List[str]:
+        return [n for scope in self.scopes for n in scope]
+
+    def assignable(self) -> List[str]:
+        return [n for n in self.visible() if n not in self.frozen]
+
+    def emit(self, indent: int, text: str):
+        self.lines.append("    " * indent + text)
+
+
+    # Funcoes
+
+    def gen_function(self, name: str, index: int):
+        arity = self.rng.randint(0, self.cfg.params)
+        params = [f"p{k}" for k in range(arity)]
+        self.counter = 0
+        self.frozen = set()
+        self.leaf = index == 0 or not self.cfg.calls or self.rng.random() < 0.5
+        self.scopes = [list(params)]
+        header = ", ".join(f"int {p}" for p in params)
+        self.emit(0, f"int {name}({header}) {{")
+        self.gen_block_body(1, 0)
+        self.emit(1, f"return {self.gen_expr(self.cfg.expr_len)};")
+        self.emit(0, "}")
+        self.scopes = []
+        self.funcs.append(_FuncSig(name, arity, self.leaf))
+
+    def gen_main(self):
+        self.counter = 0
+        self.frozen = set()
+        self.scopes = [[]]
+        self.emit(0, "int main() {")
+        self.emit(1, "int total = 0;")
+        for f in self.funcs:
+            args = ", ".join(str(self.rng.randint(0, 9)) for _ in range(f.arity))
+            self.emit(1, f"total = total + {f.name}({args});")
+        self.emit(1, "return total;")
+        self.emit(0, "}")
+        self.scopes = []
+
+
+    # Instrucoes
+
+    def gen_block_body(self, indent: int, depth: int):
+        for _ in range(self.cfg.stmts):
+            self.gen_statement(indent, depth)
+
+    def gen_statement(self, indent: int, depth: int):
+        roll = self.rng.random()
+        if depth < self.cfg.depth and roll < 0.35:
+            choice = self.rng.choice(("if", "while", "for"))
+            if choice == "if":
+                self.gen_if(indent, depth)
+            elif choice == "while":
+                self.gen_while(indent, depth)
+            else:
+                self.gen_for(indent, depth)
+            return
+        targets = self.assignable()
+        if not targets or roll < 0.6:
+            name = self.fresh()
+            self.emit(indent, f"int {name} = {self.gen_expr(self.cfg.expr_len)};")
+            self.declare(name)
+        elif roll < 0.9 or self.leaf:
+            target = self.rng.choice(targets)
+            self.emit(indent, f"{target} = {self.gen_expr(self.cfg.expr_len)};")
+        else:
+            self.emit(indent, f"{self.gen_call()};")
+
+    def gen_nested(self, indent: int, depth: int):
+        self.scopes.append([])
+        self.gen_block_body(indent, depth)
+        self.scopes.pop()
+
+    def gen_if(self, indent: int, depth: int):
+        self.emit(indent, f"if ({self.gen_cond()}) {{")
+        self.gen_nested(indent + 1, depth + 1)
+        if self.rng.random() < 0.5:
+            self.emit(indent, "} else {")
+            self.gen_nested(indent + 1, depth + 1)
+        self.emit(indent, "}")
+
+    def gen_while(self, indent: int, depth: int):
+        counter = self.fresh()
+        self.emit(indent, f"int {counter} = 0;")
+        self.declare(counter)
+        self.frozen.add(counter)
+        self.emit(indent, f"while ({counter} < {self.rng.randint(1, 4)}) {{")
+        self.gen_nested(indent + 1, depth + 1)
+        self.emit(indent + 1, f"{counter} = {counter} + 1;")
+        self.emit(indent, "}")
+
+    def gen_for(self, indent: int, depth: int):
+        counter = self.fresh()
+        bound = self.rng.randint(1, 4)
+        if self.rng.random() < 0.5:
+            self.emit(indent, f"int {counter};")
+            self.declare(counter)
+            init = f"{counter} = 0;"
+        else:
+            init = f"int {counter} = 0;"
+        self.frozen.add(counter)
+        self.emit(indent, f"for ({init} {counter} < {bound}; {counter} = {counter} + 1) {{")
+        self.scopes.append([counter])
+        self.gen_block_body(indent + 1, depth + 1)
+        self.scopes.pop()
+        self.emit(indent, "}")
+
+
+    # Expressoes
+
+    def gen_cond(self) -> str:
+        op = self.rng.choice(("<", ">", "<=", ">=", "==", "!="))
+        left = self.gen_expr(max(1, self.cfg.expr_len // 2))
+        right = self.gen_expr(max(1, self.cfg.expr_len // 2))
+        cond = f"{left} {op} {right}"
+        if self.rng.random() < 0.2:
+            cond = f"{cond} && {self.gen_operand(1)} > 0"
+        return cond
+
+    def gen_expr(self, length: int, nest: int = 0) -> str:
+        parts = [self.gen_operand(nest)]
+        for _ in range(length - 1):
+            op = self.rng.choice(("+", "-", "*", "+", "-", "/"))
+            if op == "/" or (op == "*" and not self.cfg.indexing):
+                parts.append(f"{op} {self.rng.randint(1, 9)}")
+                continue
+            parts.append(f"{op} {self.gen_operand(nest)}")
+        return " ".join(parts)
+
+    def gen_operand(self, nest: int) -> str:
+        roll = self.rng.random()
+        names = self.visible()
+        if roll < 0.1 and nest < 2:
+            return f"({self.gen_expr(3, nest + 1)})"
+        if roll < 0.2 and nest < 2 and self.cfg.calls and not self.leaf:
+            callees = [f for f in self.funcs if f.leaf]
+            if callees:
+                return self.gen_call()
+        if roll < 0.25 and self.cfg.indexing and names:
+            return f"{self.rng.choice(names)}[{self.gen_operand(nest + 1)}]"
+        if roll < 0.3:
+            return "-" + str(self.rng.randint(1, 9))
+        if names and roll < 0.75:
+            return self.rng.choice(names)
+        return str(self.rng.randint(0, 9))
+
+    def gen_call(self) -> str:
+        callees = [f for f in self.funcs if f.leaf]
+        if not callees:
+            return str(self.rng.randint(0, 9))
+        f = self.rng.choice(callees)
+        args = ", ".join(self.gen_expr(2, 2) for _ in range(f.arity))
+        return f"{f.name}({args})"
+
+
+def generate_program(cfg: Optional[GenConfig] = None, **kwargs) -> str:
+    if cfg is None:
+        cfg = GenConfig(**kwargs)
+    return ProgramGenerator(cfg).generate()
+
+
+def main():
+    import argparse
+    ap = argparse.ArgumentParser(description="Gera programas validos para o parser")
+    ap.add_argument("--functions", type=int, default=10)
+    ap.add_argument("--depth", type=int, default=2)
+    ap.add_argument("--expr-len", type=int, default=4)
+    ap.add_argument("--stmts", type=int, default=4)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--no-index", action="store_true", help="gera programa executavel (sem indexacao)")
+    ap.add_argument("-o", "--output", help="arquivo de saida (padrao: stdout)")
+    args = ap.parse_args()
+    cfg = GenConfig(
+        functions=args.functions,
+        depth=args.depth,
+        expr_len=args.expr_len,
+        stmts=args.stmts,
+        indexing=not args.no_index,
+        seed=args.seed,
+    )
+    code = generate_program(cfg)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(code)
+    else:
+        sys.stdout.write(code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from visualizer import children, node_label
+
+
+# Exporta a AST como um visualizador HTML/JS offline (abre direto do disco,
+# sem servidor). Os nos recebem ids em pre-ordem e sao gravados em blocos de
+# chunk_size registros (chunks/c<k>.js). O registro de um no traz os rotulos
+# e posicoes dos seus filhos, entao expandir um no carrega no maximo um bloco
+# e so os nos visiveis viram elementos na pagina.
+
+
+def _sizes(root: Any) -> Dict[int, int]:
+    sizes: Dict[int, int] = {}
+    stack = [(root, False)]
+    while stack:
+        node, ready = stack.pop()
+        kids = [c for c in children(node) if c is not None]
+        if ready:
+            sizes[id(node)] = 1 + sum(sizes[id(c)] for c in kids)
+        else:
+            stack.append((node, True))
+            stack.extend((c, False) for c in kids)
+    return sizes
+
+
+class _ChunkWriter:
+
+    def __init__(self, out_dir: str, chunk_size: int):
+        self.dir = os.path.join(out_dir, "chunks")
+        os.makedirs(self.dir, exist_ok=True)
+        self.chunk_size = chunk_size
+        self.records: List[Any] = []
+        self.index = 0
+
+    def add(self, record: Any):
+        self.records.append(record)
+        if len(self.records) == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if not self.records:
+            return
+        path = os.path.join(self.dir, f"c{self.index}.js")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"AST.chunk({self.index},")
+            json.dump(self.records, f, separators=(",", ":"))
+            f.write(");\n")
+        self.records = []
+        self.index += 1
+
+
+def export_html(root: Any, out_dir: str, title: str = "AST", chunk_size: int = 2000,
+                sources: Optional[Dict[str, str]] = None) -> str:
+    """
+    Grava out_dir/index.html e os blocos em out_dir/chunks/. `sources` mapeia
+    caminho -> texto dos arquivos citados nas posicoes dos nos; se omitido, os
+    arquivos sao lidos do disco quando existirem.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    sizes = _sizes(root)
+    files: List[Optional[str]] = []
+    file_ids: Dict[Optional[str], int] = {}
+
+    def file_id(node: Any) -> int:
+        f = getattr(node, "file", None)
+        if f not in file_ids:
+            file_ids[f] = len(files)
+            files.append(f)
+        return file_ids[f]
+
+    def info(node: Any, gid: int) -> List[Any]:
+        kids = [c for c in children(node) if c is not None]
+        return [gid, node_label(node), file_id(node), getattr(node, "line", 0),
+                getattr(node, "col", 0), sizes[id(node)], len(kids)]
+
+    root_info = info(root, 0)  # antes de gravar sources.js: o arquivo da raiz tambem conta
+    # pre-ordem iterativa: o id de cada filho e o id do pai + 1 + tamanho dos irmaos anteriores
+    writer = _ChunkWriter(out_dir, chunk_size)
+    stack = [(root, 0)]
+    while stack:
+        node, gid = stack.pop()
+        kids = [c for c in children(node) if c is not None]
+        record = []
+        next_id = gid + 1
+        for c in kids:
+            record.append(info(c, next_id))
+            next_id += sizes[id(c)]
+        writer.add(record)
+        stack.extend(reversed([(c, r[0]) for c, r in zip(kids, record)]))
+    writer.flush()
+
+    texts: Dict[str, str] = {}
+    for i, f in enumerate(files):
+        if f is None:
+            continue
+        if sources and f in sources:
+            texts[str(i)] = sources[f]
+        elif os.path.isfile(f):
+            with open(f, "r", encoding="utf-8", errors="replace") as fh:
+                texts[str(i)] = fh.read()
+    with open(os.path.join(out_dir, "sources.js"), "w", encoding="utf-8") as f:
+        f.write("AST.sources(")
+        json.dump(texts, f)
+        f.write(");\n")
+
+    manifest = {
+        "title": title,
+        "chunkSize": chunk_size,
+        "files": files,
+        "root": root_info,
+    }
+    page = _TEMPLATE.replace("__TITLE__", _escape(title)).replace(
+        "__MANIFEST__", json.dumps(manifest).replace("</", "<\\/"))
+    index = os.path.join(out_dir, "index.html")
+    with open(index, "w", encoding="utf-8") as f:
+        f.write(page)
+    return index
+
+
+def _escape(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+_TEMPLATE = """<!DOCTYPE html>
+<html lang="pt-br">
+<head>
+<meta charset="utf-8">
+<title>__TITLE__</title>
+<style>
+  body { margin: 0; display: flex; height: 100vh; font: 13px monospace; }
+  #tree { flex: 1; overflow: auto; padding: 8px; }
+  #src { flex: 1; overflow: auto; margin: 0; padding: 8px; background: #f6f6f6; border-left: 1px solid #ccc; }
+  ul { list-style: none; margin: 0; padding-left: 18px; }
+  .toggle { display: inline-block; width: 14px; cursor: pointer; color: #555; }
+  .size { color: #999; }
+  a.pos { color: #36c; margin-left: 6px; cursor: pointer; }
+  .more { color: #36c; cursor: pointer; }
+  .hl { background: #ffe48a; }
+</style>
+</head>
+<body>
+<div id="tree"></div>
+<pre id="src">Clique numa posicao (linha:coluna) para ver o codigo.</pre>
+<script>
+const MANIFEST = __MANIFEST__;
+const PAGE = 200;
+const AST = {
+  chunks: {}, waiting: {}, texts: null, onSources: [],
+  chunk(k, records) {
+    this.chunks[k] = records;
+    (this.waiting[k] || []).forEach(cb => cb());
+    delete this.waiting[k];
+  },
+  sources(texts) {
+    this.texts = texts;
+    this.onSources.forEach(cb => cb());
+    this.onSources = [];
+  }
+};
+
+function loadScript(src) {
+  const s = document.createElement("script");
+  s.src = src;
+  document.head.appendChild(s);
+}
+
+function withChunk(k, cb) {
+  if (AST.chunks[k]) return cb();
+  if (AST.waiting[k]) { AST.waiting[k].push(cb); return; }
+  AST.waiting[k] = [cb];
+  loadScript("chunks/c" + k + ".js");
+}
+
+function childrenOf(gid, cb) {
+  const k = Math.floor(gid / MANIFEST.chunkSize);
+  withChunk(k, () => cb(AST.chunks[k][gid - k * MANIFEST.chunkSize]));
+}
+
+let current = null;
+function showSource(fileId, line) {
+  const render = () => {
+    const text = AST.texts[String(fileId)];
+    const src = document.getElementById("src");
+    if (text === undefined) { src.textContent = "Codigo indisponivel: " + MANIFEST.files[fileId]; return; }
+    if (current !== fileId) {
+      src.textContent = "";
+      text.split("\\n").forEach((l, i) => {
+        const span = document.createElement("span");
+        span.id = "L" + (i + 1);
+        span.textContent = String(i + 1).padStart(5) + "  " + l + "\\n";
+        src.appendChild(span);
+      });
+      current = fileId;
+    }
+    src.querySelectorAll(".hl").forEach(e => e.classList.remove("hl"));
+    const target = document.getElementById("L" + line);
+    if (target) { target.classList.add("hl"); target.scrollIntoView({block: "center"}); }
+  };
+  if (AST.texts) return render();
+  AST.onSources.push(render);
+  if (AST.onSources.length === 1) loadScript("sources.js");
+}
+
+function makeNode(info) {
+  const [gid, label, fileId, line, col, size, nkids] = info;
+  const li = document.createElement("li");
+  const toggle = document.createElement("span");
+  toggle.className = "toggle";
+  toggle.textContent = nkids ? "+" : "";
+  li.appendChild(toggle);
+  li.appendChild(document.createTextNode(label));
+  if (line) {
+    const a = document.createElement("a");
+    a.className = "pos";
+    a.textContent = line + ":" + col;
+    a.title = MANIFEST.files[fileId] || "";
+    a.onclick = () => showSource(fileId, line);
+    li.appendChild(a);
+  }
+  if (nkids) {
+    const s = document.createElement("span");
+    s.className = "size";
+    s.textContent = " (" + size + " nos)";
+    li.appendChild(s);
+    let ul = null;
+    toggle.onclick = () => {
+      if (ul) {
+        ul.hidden = !ul.hidden;
+        toggle.textContent = ul.hidden ? "+" : "-";
+        return;
+      }
+      ul = document.createElement("ul");
+      li.appendChild(ul);
+      toggle.textContent = "-";
+      childrenOf(gid, kids => appendPage(ul, kids, 0));
+    };
+  }
+  return li;
+}
+
+function appendPage(ul, kids, start) {
+  kids.slice(start, start + PAGE).forEach(k => ul.appendChild(makeNode(k)));
+  const rest = kids.length - start - PAGE;
+  if (rest > 0) {
+    const li = document.createElement("li");
+    li.className = "more";
+    li.textContent = "... mais " + rest + " filhos";
+    li.onclick = () => { li.remove(); appendPage(ul, kids, start + PAGE); };
+    ul.appendChild(li);
+  }
+}
+
+const rootList = document.createElement("ul");
+rootList.style.paddingLeft = "0";
+rootList.appendChild(makeNode(MANIFEST.root));
+document.getElementById("tree").appendChild(rootList);
+</script>
+</body>
+</html>
+"""
@@ -0,0 +1,343 @@
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ast_nodes import ASTNode, Assign, BinOp, Block, Call, Char, FunctionDecl, Index, Num, Program, Str, Var
+
+
+# Interpretador de referencia: percorre a AST diretamente a cada execucao,
+# sem nenhuma preparacao. E a base de comparacao do transpiler e o oraculo
+# dos testes diferenciais, entao as regras de C emuladas aqui valem para os
+# dois: divisao inteira truncada em direcao a zero, comparacoes e && / ||
+# valendo 0 ou 1, conversao para o tipo declarado ao atribuir, passar
+# argumentos e retornar, e variaveis sem inicializador comecando em 0.
+# Inteiros nao tem limite (overflow em C e comportamento indefinido).
+
+
+class ExecutionError(Exception):
+    def __init__(self, message: str, node: Optional[ASTNode] = None):
+        super().__init__(message)
+        self.message = message
+        self.line = getattr(node, "line", 0)
+        self.col = getattr(node, "col", 0)
+
+    def __str__(self):
+        if self.line:
+            return f"{self.message} @ {self.line}:{self.col}"
+        return self.message
+
+
+# Semantica de C compartilhada com o transpiler
+
+def c_div(a: int, b: int) -> int:
+    q = abs(a) // abs(b)
+    return q if (a < 0) == (b < 0) else -q
+
+
+def div(a: Any, b: Any) -> Any:
+    if type(a) is int and type(b) is int:
+        return c_div(a, b)
+    return a / b
+
+
+def ctype(type_name: str) -> str:
+    # char e tratado como inteiro; void so aparece como tipo de retorno
+    if type_name == "float":
+        return "float"
+    if type_name == "void":
+        return "void"
+    return "int"
+
+
+def coerce(value: Any, target: str) -> Any:
+    if target == "int":
+        if type(value) is float or type(value) is bool:
+            return int(value)
+    elif target == "float":
+        if type(value) is int or type(value) is bool:
+            return float(value)
+    return value
+
+
+def default_value(target: str) -> Any:
+    if target == "float":
+        return 0.0
+    if target == "void":
+        return None
+    return 0
+
+
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "0": "\0", "\\": "\\", "\"": "\"", "'": "'"}
+
+
+def literal_value(node: ASTNode) -> Any:
+    if isinstance(node, Num):
+        return float(node.value) if "." in node.value else int(node.value)
+    if isinstance(node, Char):
+        return ord(node.value[1])
+    if isinstance(node, Str):
+        out: List[str] = []
+        text = node.value[1:-1]
+        i = 0
+        while i < len(text):
+            if text[i] == "\\" and i + 1 < len(text):
+                out.append(_ESCAPES.get(text[i + 1], text[i + 1]))
+                i += 2
+            else:
+                out.append(text[i])
+                i += 1
+        return "".join(out)
+    raise TypeError(type(node).__name__)
+
+
+_COMPARE: Dict[str, Callable[[Any, Any], bool]] = {
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+}
+
+
+_LEAVES = (Num, Char, Str, Var)
+
+
+class _Return(Exception):
+    def __init__(self, value: Any):
+        self.value = value
+
+
+class Interpreter:
+    """
+    Executa um Program. As instrucoes de topo (declaracoes globais) rodam na
+    construcao; `externs` fornece funcoes Python para nomes nao definidos
+    no programa.
+    """
+
+    def __init__(self, program: Program, externs: Optional[Dict[str, Callable[..., Any]]] = None):
+        self.functions: Dict[str, FunctionDecl] = {}
+        self.externs = dict(externs or {})
+        # cada escopo mapeia nome -> [tipo, valor]
+        self.globals: Dict[str, List[Any]] = {}
+        for decl in program.body:
+            if isinstance(decl, FunctionDecl):
+                self.functions[decl.name] = decl
+        try:
+            for decl in program.body:
+                if not isinstance(decl, FunctionDecl):
+                    self.exec_stmt(decl, [self.globals])
+        except RecursionError:
+            raise ExecutionError("recursao profunda demais") from None
+
+    def run(self, entry: str = "main", *args: Any) -> Any:
+        try:
+            return self.call(entry, list(args))
+        except RecursionError:
+            # recursao do programa C mais funda que a pilha do Python
+            raise ExecutionError("recursao profunda demais") from None
+
+    def call(self, name: str, args: List[Any], node: Optional[ASTNode] = None) -> Any:
+        fn = self.functions.get(name)
+        if fn is None:
+            if name in self.externs:
+                return self.externs[name](*args)
+            raise ExecutionError(f"funcao nao declarada: {name}", node)
+        if len(args) != len(fn.params):
+            raise ExecutionError(f"{name} espera {len(fn.params)} argumento(s), recebeu {len(args)}", node)
+        frame: Dict[str, List[Any]] = {}
+        for (ptype, pname), value in zip(fn.params, args):
+            t = ctype(ptype)
+            frame[pname] = [t, coerce(value, t)]
+        ret = ctype(fn.ret_type)
+        try:
+            if fn.body is not None:
+                self.exec_block(fn.body, [self.globals, frame])
+        except _Return as r:
+            if r.value is None:
+                return default_value(ret)
+            return r.value if ret == "void" else coerce(r.value, ret)
+        return default_value(ret)
+
+
+    # Escopos
+
+    def lookup(self, name: str, scopes: List[Dict[str, List[Any]]], node: ASTNode) -> List[Any]:
+        for scope in reversed(scopes):
+            cell = scope.get(name)
+            if cell is not None:
+                return cell
+        raise ExecutionError(f"variavel nao declarada: {name}", node)
+
+
+    # Instrucoes
+
+    def exec_stmt(self, node: ASTNode, scopes: List[Dict[str, List[Any]]]):
+        method = getattr(self, "exec_" + type(node).__name__, None)
+        if method is None:
+            self.eval(node, scopes)  # instrucao de expressao
+        else:
+            method(node, scopes)
+
+    def exec_block(self, node: Block, scopes):
+        inner = scopes + [{}]
+        for stmt in node.body:
+            self.exec_stmt(stmt, inner)
+
+    exec_Block = exec_block
+
+    def exec_VarDecl(self, node, scopes):
+        t = ctype(node.var_type)
+        value = default_value(t) if node.init is None else coerce(self.eval(node.init, scopes), t)
+        scopes[-1][node.name] = [t, value]
+
+    def exec_Assign(self, node, scopes):
+        self.eval(node, scopes)
+
+    def exec_If(self, node, scopes):
+        if self.eval(node.test, scopes):
+            if node.then is not None:
+                self.exec_block(node.then, scopes)
+        elif node.otherwise is not None:
+            self.exec_block(node.otherwise, scopes)
+
+    def exec_While(self, node, scopes):
+        while self.eval(node.test, scopes):
+            if node.body is not None:
+                self.exec_block(node.body, scopes)
+
+    def exec_For(self, node, scopes):
+        inner = scopes + [{}]
+        if node.init is not None:
+            self.exec_stmt(node.init, inner)
+        while node.cond is None or self.eval(node.cond, inner):
+            if node.body is not None:
+                self.exec_block(node.body, inner)
+            if node.step is not None:
+                self.eval(node.step, inner)
+
+    def exec_Return(self, node, scopes):
+        if len(scopes) == 1:
+            raise ExecutionError("return fora de funcao", node)
+        raise _Return(None if node.value is None else self.eval(node.value, scopes))
+
+    def exec_FunctionDecl(self, node, scopes):
+        pass  # registradas na construcao
+
+
+    # Expressoes
+
+    def eval(self, node: ASTNode, scopes) -> Any:
+        if isinstance(node, (Num, Char, Str)):
+            return literal_value(node)
+        if isinstance(node, Var):
+            return self.lookup(node.name, scopes, node)[1]
+        # pilha explicita (cadeias longas de BinOp): o estagio 0 empilha os
+        # filhos da esquerda para a direita, 1 combina os valores e 2 fecha
+        # o lado direito de && / || quando ele precisou ser avaliado
+        values: List[Any] = []
+        todo: List[Tuple[ASTNode, int]] = [(node, 0)]
+        while todo:
+            node, stage = todo.pop()
+            if isinstance(node, (Num, Char, Str)):
+                values.append(literal_value(node))
+            elif isinstance(node, Var):
+                values.append(self.lookup(node.name, scopes, node)[1])
+            elif isinstance(node, BinOp):
+                op = node.op
+                if stage == 0:
+                    if op in ("&&", "||"):
+                        todo += [(node, 1), (node.left, 0)]
+                    elif isinstance(node.left, _LEAVES) and isinstance(node.right, _LEAVES):
+                        # caso mais comum (i < n, x + 1): combina sem passar pela pilha
+                        values.append(self.binop(node, self.eval(node.left, scopes), self.eval(node.right, scopes)))
+                    else:
+                        todo += [(node, 1), (node.right, 0), (node.left, 0)]
+                elif stage == 2:
+                    values.append(1 if values.pop() else 0)
+                elif op in ("&&", "||"):
+                    a = values.pop()
+                    if bool(a) == (op == "&&"):
+                        todo += [(node, 2), (node.right, 0)]
+                    else:
+                        values.append(1 if a else 0)
+                else:
+                    b = values.pop()
+                    values.append(self.binop(node, values.pop(), b))
+            elif isinstance(node, Assign):
+                if stage == 0:
+                    todo += [(node, 1), (node.value, 0)]
+                else:
+                    cell = self.lookup(node.target.name, scopes, node.target)
+                    cell[1] = coerce(values.pop(), cell[0])
+                    values.append(cell[1])
+            elif isinstance(node, Call):
+                if stage == 0:
+                    if not isinstance(node.callee, Var):
+                        raise ExecutionError("chamada de algo que nao e funcao", node)
+                    todo.append((node, 1))
+                    todo.extend((a, 0) for a in reversed(node.args))
+                else:
+                    start = len(values) - len(node.args)
+                    args = values[start:]
+                    del values[start:]
+                    values.append(self.call(node.callee.name, args, node))
+            elif isinstance(node, Index):
+                if stage == 0:
+                    todo += [(node, 1), (node.index, 0), (node.target, 0)]
+                else:
+                    index = values.pop()
+                    values.append(values.pop()[index])
+            else:
+                raise ExecutionError(f"no nao suportado: {type(node).__name__}", node)
+        return values[0]
+
+    def binop(self, node: BinOp, a: Any, b: Any) -> Any:
+        op = node.op
+        if op == "+":
+            return a + b
+        if op == "-":
+            return a - b
+        if op == "*":
+            return a * b
+        if op == "/":
+            if b == 0:
+                raise ExecutionError("divisao por zero", node)
+            return div(a, b)
+        return 1 if _COMPARE[op](a, b) else 0
+
+
+def run_program(program: Program, entry: str = "main", *args: Any,
+                externs: Optional[Dict[str, Callable[..., Any]]] = None) -> Any:
+    return Interpreter(program, externs).run(entry, *args)
+
+
+def main():
+    import argparse
+    from lexer import lex
+    from parser import Parser
+
+    ap = argparse.ArgumentParser(description="Executa um programa C interpretando a AST")
+    ap.add_argument("file")
+    ap.add_argument("--entry", default="main")
+    args = ap.parse_args()
+    with open(args.file, "r", encoding="utf-8") as f:
+        code = f.read()
+    tokens, lex_errors = lex(code)
+    if lex_errors:
+        for e in lex_errors:
+            print("Erro lexico:", e, file=sys.stderr)
+        sys.exit(1)
+    program, errors = Parser(tokens).parse_program()
+    if program is None:
+        for e in errors:
+            print("Erro sintatico:", e, file=sys.stderr)
+        sys.exit(1)
+    try:
+        print(run_program(program, args.entry))
+    except ExecutionError as e:
+        print("Erro de execucao:", e, file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
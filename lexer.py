@@ -54,20 +54,52 @@ _keywords_map = {
 }
 
 
-def lex(code: str) -> Tuple[List[Token], List[LexError]]:
+def _directive_end(code: str, pos: int) -> int:
+    # a diretiva vai ate o fim da linha, emendando linhas terminadas em '\\'
+    while True:
+        nl = code.find('\n', pos)
+        if nl == -1:
+            return len(code)
+        if code[nl - 1:nl] == '\\' or code[nl - 2:nl] == '\\\r':
+            pos = nl + 1
+            continue
+        return nl
+
+
+def lex(code: str, directives: bool = False) -> Tuple[List[Token], List[LexError]]:
+    """
+    Com directives=True, linhas iniciadas por '#' viram um unico token
+    DIRECTIVE (usado pelo preprocessador); caso contrario '#' e um erro.
+    """
     tokens: List[Token] = []
     errors: List[LexError] = []
     line = 1
     col = 1
     pos = 0
     length = len(code)
+    line_start = True
 
     while pos < length:
+        if directives and line_start and code[pos] == '#':
+            end = _directive_end(code, pos)
+            text = code[pos:end]
+            tokens.append(Token("DIRECTIVE", text, line, col))
+            newlines = text.count('\n')
+            if newlines:
+                line += newlines
+                col = len(text) - text.rfind('\n')
+            else:
+                col += len(text)
+            pos = end
+            line_start = False
+            continue
+
         m = _master_regex.match(code, pos)
         if not m:
             ch = code[pos]
             errors.append(LexError(f"Simbolo inesperado '{ch}'", line, col))
             pos += 1
+            line_start = False
             if ch == '\n':
                 line += 1
                 col = 1
@@ -85,6 +117,7 @@ def lex(code: str) -> Tuple[List[Token], List[LexError]]:
             tokens.append(Token("EOL", "", line, col))
             line += 1
             col = 1
+            line_start = True
             continue
 
         if kind in ("WHITESPACE", "COMMENT_ML", "COMMENT_SL"):
@@ -97,6 +130,7 @@ def lex(code: str) -> Tuple[List[Token], List[LexError]]:
                 col += len(lexeme)
             continue
 
+        line_start = False
         ttype = kind
         if kind == "ID":
             ttype = _keywords_map.get(lexeme, "ID")
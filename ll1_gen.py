@@ -0,0 +1,405 @@
+import argparse
+import hashlib
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+
+# Gerador de parser LL(1): le uma gramatica (formato descrito em
+# c_grammar.ll1), calcula nulaveis, FIRST e FOLLOW, monta a tabela preditiva
+# e escreve um modulo Python so com dados (ll1_tables.py), executado pelo
+# driver iterativo de ll1_parser.py.
+#
+# Cada entrada (nao terminal, token) da tabela ja vem expandida ate o
+# primeiro terminal: as escolhas seguintes dependem do mesmo token de
+# lookahead, entao podem ser feitas na geracao. Em "a + b" o driver empilha
+# a cadeia expr -> or_expr -> ... -> primary de uma vez em vez de consultar
+# a tabela dez vezes.
+#
+# Erros: um nao terminal nulavel sem entrada para o token segue pela sua
+# alternativa vazia (DEFAULT), entao o erro aparece adiante, no mesmo token,
+# como "Esperado SEMI" em vez de listar tudo o que poderia vir. Os demais
+# reportam o que esperavam (EXPECTED), com os FIRST dos nao terminais de
+# %label trocados pelo rotulo ("Esperado expressao").
+
+EPSILON = "%empty"
+
+# Codificacao dos simbolos no modulo gerado (T = numero de terminais):
+#   [0, T)          terminal consumido
+#   [T, 2T)         terminal consumido e empilhado como valor
+#   [2T, 2T + N)    nao terminal
+#   [2T + N, ...)   acao semantica
+
+
+class GrammarError(Exception):
+    def __init__(self, message: str, line: int = 0):
+        super().__init__(message)
+        self.message = message
+        self.line = line
+
+    def __str__(self):
+        if self.line:
+            return f"{self.message} @ linha {self.line}"
+        return self.message
+
+
+@dataclass(frozen=True)
+class Symbol:
+    kind: str        # "t" terminal, "n" nao terminal, "a" acao
+    name: str
+    keep: bool = False
+
+    def __str__(self):
+        if self.kind == "a":
+            return "@" + self.name
+        return ("$" if self.keep else "") + self.name
+
+
+@dataclass
+class Grammar:
+    start: str
+    rules: Dict[str, List[List[Symbol]]]     # em ordem de definicao
+    prefer: Set[str] = field(default_factory=set)
+    labels: List[Tuple[str, str]] = field(default_factory=list)    # (nao terminal, rotulo)
+    anchor_previous: Set[str] = field(default_factory=set)
+    lines: Dict[str, int] = field(default_factory=dict)
+    digest: str = ""
+
+    def terminals(self) -> List[str]:
+        seen: Dict[str, None] = {}
+        for alts in self.rules.values():
+            for alt in alts:
+                for s in alt:
+                    if s.kind == "t":
+                        seen.setdefault(s.name)
+        return list(seen)
+
+    def actions(self) -> List[str]:
+        seen: Dict[str, None] = {}
+        for alts in self.rules.values():
+            for alt in alts:
+                for s in alt:
+                    if s.kind == "a":
+                        seen.setdefault(s.name)
+        return list(seen)
+
+
+_word_re = re.compile(r"[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def parse_grammar(text: str) -> Grammar:
+    start: Optional[str] = None
+    prefer: Set[str] = set()
+    labels: List[Tuple[str, str]] = []
+    anchor_previous: Set[str] = set()
+    words: List[Tuple[str, int]] = []
+    for lineno, raw in enumerate(text.splitlines(), 1):
+        line = raw.split("#", 1)[0].strip()
+        if not line:
+            continue
+        if line.startswith("%start"):
+            start = line.split()[1]
+            continue
+        if line.startswith("%prefer"):
+            prefer.update(line.split()[1:])
+            continue
+        if line.startswith("%label"):
+            parts = line.split(None, 2)
+            if len(parts) != 3:
+                raise GrammarError("uso: %label nao_terminal rotulo", lineno)
+            labels.append((parts[1], parts[2]))
+            continue
+        if line.startswith("%anchor_previous"):
+            anchor_previous.update(line.split()[1:])
+            continue
+        for w in line.replace(":", " : ").replace("|", " | ").replace(";", " ; ").split():
+            words.append((w, lineno))
+
+    rules: Dict[str, List[List[Symbol]]] = {}
+    lines: Dict[str, int] = {}
+    i = 0
+    while i < len(words):
+        name, lineno = words[i]
+        if not _word_re.match(name) or not name.islower():
+            raise GrammarError(f"esperado nome de regra em minusculas, encontrado '{name}'", lineno)
+        if i + 1 >= len(words) or words[i + 1][0] != ":":
+            raise GrammarError(f"esperado ':' depois de '{name}'", lineno)
+        if name in rules:
+            raise GrammarError(f"regra repetida: {name}", lineno)
+        lines[name] = lineno
+        i += 2
+        alts: List[List[Symbol]] = [[]]
+        while True:
+            if i >= len(words):
+                raise GrammarError(f"regra '{name}' sem ';' no fim", lineno)
+            w, wline = words[i]
+            i += 1
+            if w == ";":
+                break
+            if w == "|":
+                alts.append([])
+            elif w == EPSILON:
+                continue
+            elif w.startswith("@") and _word_re.match(w[1:]):
+                alts[-1].append(Symbol("a", w[1:]))
+            elif w.startswith("$") and _word_re.match(w[1:]) and w[1:].isupper():
+                alts[-1].append(Symbol("t", w[1:], True))
+            elif _word_re.match(w) and w.isupper():
+                alts[-1].append(Symbol("t", w))
+            elif _word_re.match(w) and w.islower():
+                alts[-1].append(Symbol("n", w))
+            else:
+                raise GrammarError(f"simbolo invalido: '{w}'", wline)
+        rules[name] = alts
+
+    if not rules:
+        raise GrammarError("gramatica vazia")
+    start = start or next(iter(rules))
+    for name, alts in rules.items():
+        for alt in alts:
+            for s in alt:
+                if s.kind == "n" and s.name not in rules:
+                    raise GrammarError(f"nao terminal sem regra: {s.name} (em {name})", lines[name])
+    for name in [start, *prefer, *anchor_previous, *(n for n, _ in labels)]:
+        if name not in rules:
+            raise GrammarError(f"nao terminal sem regra: {name}")
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return Grammar(start, rules, prefer, labels, anchor_previous, lines, digest)
+
+
+# Conjuntos
+
+def _grammar_symbols(alt: List[Symbol]) -> List[Symbol]:
+    # acoes nao consomem entrada: para FIRST/FOLLOW valem epsilon
+    return [s for s in alt if s.kind != "a"]
+
+
+def nullable_set(g: Grammar) -> Set[str]:
+    nullable: Set[str] = set()
+    changed = True
+    while changed:
+        changed = False
+        for name, alts in g.rules.items():
+            if name in nullable:
+                continue
+            if any(all(s.kind == "n" and s.name in nullable for s in _grammar_symbols(alt)) for alt in alts):
+                nullable.add(name)
+                changed = True
+    return nullable
+
+
+def first_sets(g: Grammar, nullable: Set[str]) -> Dict[str, Set[str]]:
+    first: Dict[str, Set[str]] = {name: set() for name in g.rules}
+    changed = True
+    while changed:
+        changed = False
+        for name, alts in g.rules.items():
+            for alt in alts:
+                extra = seq_first(_grammar_symbols(alt), first, nullable)[0] - first[name]
+                if extra:
+                    first[name] |= extra
+                    changed = True
+    return first
+
+
+def seq_first(seq: List[Symbol], first: Dict[str, Set[str]], nullable: Set[str]) -> Tuple[Set[str], bool]:
+    """(FIRST da sequencia, a sequencia inteira e nulavel?)"""
+    out: Set[str] = set()
+    for s in seq:
+        if s.kind == "a":
+            continue
+        if s.kind == "t":
+            out.add(s.name)
+            return out, False
+        out |= first[s.name]
+        if s.name not in nullable:
+            return out, False
+    return out, True
+
+
+def follow_sets(g: Grammar, nullable: Set[str], first: Dict[str, Set[str]]) -> Dict[str, Set[str]]:
+    follow: Dict[str, Set[str]] = {name: set() for name in g.rules}
+    changed = True
+    while changed:
+        changed = False
+        for name, alts in g.rules.items():
+            for alt in alts:
+                seq = _grammar_symbols(alt)
+                for k, s in enumerate(seq):
+                    if s.kind != "n":
+                        continue
+                    rest, rest_nullable = seq_first(seq[k + 1:], first, nullable)
+                    extra = rest | (follow[name] if rest_nullable else set())
+                    if extra - follow[s.name]:
+                        follow[s.name] |= extra
+                        changed = True
+    return follow
+
+
+# Tabela
+
+@dataclass
+class Conflict:
+    rule: str
+    token: str
+    alternatives: List[int]      # indices (a partir de 0) das alternativas em disputa
+    resolved: bool
+
+    def describe(self, g: Grammar) -> str:
+        alts = ", ".join(f"{k + 1} ({' '.join(map(str, g.rules[self.rule][k])) or EPSILON})"
+                         for k in self.alternatives)
+        status = "resolvido pela primeira (%prefer)" if self.resolved else "nao resolvido"
+        return f"conflito em '{self.rule}' com {self.token}: alternativas {alts}; {status}"
+
+
+def build_table(g: Grammar) -> Tuple[Dict[str, Dict[str, int]], List[Conflict],
+                                     Dict[str, Set[str]], Dict[str, Set[str]]]:
+    nullable = nullable_set(g)
+    first = first_sets(g, nullable)
+    follow = follow_sets(g, nullable, first)
+    table: Dict[str, Dict[str, int]] = {}
+    conflicts: List[Conflict] = []
+    for name, alts in g.rules.items():
+        candidates: Dict[str, List[int]] = {}
+        for k, alt in enumerate(alts):
+            predict, is_nullable = seq_first(alt, first, nullable)
+            if is_nullable:
+                predict = predict | follow[name]
+            for tok in predict:
+                candidates.setdefault(tok, []).append(k)
+        row: Dict[str, int] = {}
+        for tok, ks in candidates.items():
+            if len(ks) > 1:
+                conflicts.append(Conflict(name, tok, ks, name in g.prefer))
+            row[tok] = ks[0]
+        table[name] = row
+    return table, conflicts, first, follow
+
+
+def _expand(g: Grammar, table: Dict[str, Dict[str, int]], name: str, tok: str) -> List[Symbol]:
+    """Sequencia a empilhar para (name, tok), expandida ate o primeiro terminal."""
+    seq = list(g.rules[name][table[name][tok]])
+    k = 0
+    for _ in range(10000):
+        while k < len(seq) and seq[k].kind == "a":
+            k += 1
+        if k == len(seq) or seq[k].kind == "t":
+            return seq
+        nt = seq[k].name
+        if tok not in table[nt]:
+            return seq  # erro de sintaxe: o driver reporta ao chegar em nt
+        seq[k:k + 1] = g.rules[nt][table[nt][tok]]
+    raise GrammarError(f"expansao sem fim em '{name}' com {tok} (recursao a esquerda?)", g.lines[name])
+
+
+def _describe(expected: Set[str], g: Grammar, first: Dict[str, Set[str]], order: Dict[str, int]) -> str:
+    rest = set(expected)
+    labels: List[str] = []
+    for name, label in g.labels:
+        if first[name] and first[name] <= rest:
+            rest -= first[name]
+            labels.append(label)
+    return "/".join(sorted(rest, key=order.get) + labels)
+
+
+def generate(g: Grammar, source_name: str = "") -> Tuple[str, List[Conflict]]:
+    table, conflicts, first, _ = build_table(g)
+    nullable = nullable_set(g)
+    terminals = g.terminals()
+    if "EOF" not in terminals:
+        raise GrammarError("a gramatica tem de consumir EOF")
+    nonterminals = list(g.rules)
+    actions = g.actions()
+    nt_count = len(terminals)
+    t_index = {t: k for k, t in enumerate(terminals)}
+    n_index = {n: 2 * nt_count + k for k, n in enumerate(nonterminals)}
+    a_index = {a: 2 * nt_count + len(nonterminals) + k for k, a in enumerate(actions)}
+
+    def code(s: Symbol) -> int:
+        if s.kind == "t":
+            return t_index[s.name] + (nt_count if s.keep else 0)
+        if s.kind == "n":
+            return n_index[s.name]
+        return a_index[s.name]
+
+    rows: List[str] = []
+    defaults: List[str] = []
+    expected: List[str] = []
+    for name in nonterminals:
+        entries = []
+        for tok in sorted(table[name], key=t_index.get):
+            seq = _expand(g, table, name, tok)
+            entries.append(f"{t_index[tok]}: {tuple(code(s) for s in reversed(seq))!r}")
+        rows.append(f"    {{{', '.join(entries)}}},  # {name}")
+        default = None
+        if name in nullable:
+            # a primeira alternativa nulavel, sem expandir (nao ha token que a escolha)
+            alt = next(a for a in g.rules[name] if seq_first(a, first, nullable)[1])
+            default = tuple(code(s) for s in reversed(alt))
+        defaults.append(f"    {default!r},  # {name}")
+        expected.append(f"    {_describe(set(table[name]), g, first, t_index)!r},")
+
+    out = [
+        f"# Gerado por ll1_gen.py a partir de {source_name or 'uma gramatica'}; nao editar.",
+        "# Cada linha de TABLE e um nao terminal: token -> simbolos a empilhar (invertidos).",
+        "",
+        f"GRAMMAR_SHA256 = {g.digest!r}",
+        f"TERMINALS = {tuple(terminals)!r}",
+        f"NONTERMINALS = {tuple(nonterminals)!r}",
+        f"ACTIONS = {tuple(actions)!r}",
+        f"START = {n_index[g.start]}",
+        "TABLE = (",
+        *rows,
+        ")",
+        "# alternativa vazia de cada nao terminal nulavel, usada quando o token nao tem entrada",
+        "DEFAULT = (",
+        *defaults,
+        ")",
+        "# o que cada nao terminal esperava, para as mensagens de erro",
+        "EXPECTED = (",
+        *expected,
+        ")",
+        "# nao terminais cujos erros sao reportados no token anterior",
+        f"ANCHOR_PREVIOUS = {frozenset(n_index[n] - 2 * nt_count for n in g.anchor_previous)!r}",
+        "",
+    ]
+    return "\n".join(out), conflicts
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Gera as tabelas de um parser LL(1) a partir da gramatica")
+    ap.add_argument("grammar", nargs="?", default="c_grammar.ll1")
+    ap.add_argument("-o", "--output", default="ll1_tables.py")
+    ap.add_argument("--sets", action="store_true", help="mostra FIRST e FOLLOW de cada nao terminal")
+    args = ap.parse_args()
+
+    with open(args.grammar, "r", encoding="utf-8") as f:
+        text = f.read()
+    try:
+        g = parse_grammar(text)
+        source, conflicts = generate(g, args.grammar)
+    except GrammarError as e:
+        print("Erro na gramatica:", e, file=sys.stderr)
+        sys.exit(1)
+
+    if args.sets:
+        _, _, first, follow = build_table(g)
+        for name in g.rules:
+            print(f"{name}")
+            print(f"  FIRST:  {' '.join(sorted(first[name]))}")
+            print(f"  FOLLOW: {' '.join(sorted(follow[name]))}")
+    for c in conflicts:
+        print(c.describe(g), file=sys.stderr)
+    unresolved = [c for c in conflicts if not c.resolved]
+    if unresolved:
+        print(f"{len(unresolved)} conflito(s) LL(1) nao resolvido(s); nada foi gerado", file=sys.stderr)
+        sys.exit(1)
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(source)
+    print(f"{args.output}: {len(g.rules)} nao terminais, {len(g.terminals())} terminais, "
+          f"{len(conflicts)} conflito(s) resolvido(s)")
+
+
+if __name__ == "__main__":
+    main()
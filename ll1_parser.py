@@ -0,0 +1,311 @@
+import sys
+from typing import List, Optional, Tuple
+from ast_nodes import (
+    Token,
+    Program,
+    FunctionDecl,
+    VarDecl,
+    Assign,
+    If,
+    While,
+    For,
+    Return,
+    Block,
+    BinOp,
+    Call,
+    Index,
+    Var,
+    Num,
+    Char,
+    Str,
+    SyntaxErrorInfo,
+    child_nodes,
+)
+import ll1_tables as _tables
+
+# Parser preditivo dirigido pela tabela que ll1_gen.py gera a partir de
+# c_grammar.ll1 (depois de mudar a gramatica: python ll1_gen.py). O laco
+# principal e iterativo: uma pilha de simbolos (codificados como inteiros,
+# ver ll1_gen.py) e uma pilha de valores onde as acoes semanticas montam os
+# mesmos nos e posicoes que o Parser de parser.py.
+
+_T = len(_tables.TERMINALS)
+_N2 = 2 * _T
+_A0 = _N2 + len(_tables.NONTERMINALS)
+_CODES = {name: k for k, name in enumerate(_tables.TERMINALS)}
+_EOF = _CODES["EOF"]
+
+
+class _Stop(Exception):
+    pass
+
+
+def _at(node, where):
+    node.line, node.col, node.file = where.line, where.col, where.file
+    return node
+
+
+class LL1Parser:
+
+    def __init__(self, tokens: List[Token]):
+        self.tokens = tokens
+        self.pos = 0
+        self.errors: List[SyntaxErrorInfo] = []
+        self.had_error = False
+        self._actions = [getattr(self, "_a_" + name) for name in _tables.ACTIONS]
+
+    def _error(self, message: str, tok: Token):
+        self.errors.append(SyntaxErrorInfo(message, tok.line, tok.col, tok.file))
+        self.had_error = True
+        raise _Stop()
+
+    def parse_program(self) -> Tuple[Optional[Program], List[SyntaxErrorInfo]]:
+        toks = self.tokens
+        if not toks or toks[-1].type != "EOF":
+            last = toks[-1] if toks else Token("EOF", "", 0, 0)
+            toks = toks + [Token("EOF", "", last.line, last.col)]
+        get = _CODES.get
+        codes = [get(t.type, -1) for t in toks]
+        codes.append(_EOF)  # sentinela depois do EOF
+        table = _tables.TABLE
+        defaults = _tables.DEFAULT
+        actions = self._actions
+        T, N2, A0 = _T, _N2, _A0
+
+        stack = [_tables.START]
+        values: list = []
+        self._values = values
+        pos = 0
+        la = codes[0]
+        try:
+            while stack:
+                sym = stack.pop()
+                if sym < T:
+                    if sym != la:
+                        self.pos = pos
+                        self._mismatch(_tables.TERMINALS[sym], toks[pos])
+                    pos += 1
+                    la = codes[pos]
+                elif sym < N2:
+                    if sym - T != la:
+                        self.pos = pos
+                        self._mismatch(_tables.TERMINALS[sym - T], toks[pos])
+                    values.append(toks[pos])
+                    pos += 1
+                    la = codes[pos]
+                elif sym < A0:
+                    rhs = table[sym - N2].get(la)
+                    if rhs is None:
+                        rhs = defaults[sym - N2]
+                        if rhs is None:
+                            self.pos = pos
+                            self._unexpected(sym - N2, toks, pos)
+                    stack.extend(rhs)
+                else:
+                    self.pos = pos
+                    actions[sym - A0](values)
+        except _Stop:
+            return None, self.errors
+        self.pos = min(pos, len(toks) - 1)
+        return values.pop(), self.errors
+
+    def _mismatch(self, expected: str, cur: Token):
+        self._error(f"Esperado {expected} mas encontrado '{cur.lex or cur.type}'", cur)
+
+    def _unexpected(self, nt: int, toks: List[Token], pos: int):
+        cur = toks[pos]
+        where = toks[pos - 1] if nt in _tables.ANCHOR_PREVIOUS and pos > 0 else cur
+        self._error(f"Esperado {_tables.EXPECTED[nt]} mas encontrado '{cur.lex or cur.type}'", where)
+
+    # Acoes semanticas (uma por @nome da gramatica; recebem a pilha de valores)
+
+    def _a_list(self, v):
+        v.append([])
+
+    def _a_append(self, v):
+        x = v.pop()
+        v[-1].append(x)
+
+    def _a_none(self, v):
+        v.append(None)
+
+    def _a_program(self, v):
+        start = self.tokens[0] if self.tokens else Token("EOF", "", 0, 0)
+        v.append(_at(Program(v.pop()), start))
+
+    def _a_function(self, v):
+        body = v.pop()
+        params = v.pop()
+        name = v.pop()
+        typ = v.pop()
+        v.append(_at(FunctionDecl(typ.lex, name.lex, params, body), typ))
+
+    def _a_vardecl(self, v):
+        init = v.pop()
+        name = v.pop()
+        typ = v.pop()
+        v.append(_at(VarDecl(typ.lex, name.lex, init), typ))
+
+    def _a_param_named(self, v):
+        name = v.pop()
+        t = v.pop()
+        v[-1].append((t.lex if t.type in ("INT", "FLOAT", "CHAR_TYPE") else "int", name.lex))
+
+    def _a_param_bare(self, v):
+        tok = v.pop()
+        v[-1].append(("int", tok.lex))
+
+    def _a_block(self, v):
+        stmts = v.pop()
+        v.append(_at(Block(stmts), v.pop()))
+
+    def _a_single(self, v):
+        stmt = v.pop()
+        v.append(_at(Block([stmt]), stmt))
+
+    def _a_wrap(self, v):
+        # como no Parser, o else sem chaves fica num Block sem posicao
+        v.append(Block([v.pop()]))
+
+    def _a_if(self, v):
+        otherwise = v.pop()
+        then = v.pop()
+        test = v.pop()
+        v.append(_at(If(test, then, otherwise), v.pop()))
+
+    def _a_while(self, v):
+        body = v.pop()
+        test = v.pop()
+        v.append(_at(While(test, body), v.pop()))
+
+    def _a_for(self, v):
+        body = v.pop()
+        step = v.pop()
+        cond = v.pop()
+        init = v.pop()
+        v.append(_at(For(init, cond, step, body), v.pop()))
+
+    def _a_return(self, v):
+        value = v.pop()
+        v.append(_at(Return(value), v.pop()))
+
+    def _a_assign_init(self, v):
+        value = v.pop()
+        tok = v.pop()
+        v.append(_at(Assign(_at(Var(tok.lex), tok), value), tok))
+
+    def _a_assign(self, v):
+        value = v.pop()
+        target = v.pop()
+        if not isinstance(target, Var):
+            self._error("Left side of assignment must be a variable", self.tokens[self.pos])
+        v.append(_at(Assign(target, value), target))
+
+    def _a_binop(self, v):
+        right = v.pop()
+        op = v.pop()
+        left = v.pop()
+        v.append(_at(BinOp(op.lex, left, right), left))
+
+    def _a_negate(self, v):
+        node = v.pop()
+        op = v.pop()
+        v.append(_at(BinOp(op.lex, _at(Num("0"), op), node), op))
+
+    def _a_call(self, v):
+        args = v.pop()
+        callee = v.pop()
+        v.append(_at(Call(callee, args), callee))
+
+    def _a_index(self, v):
+        index = v.pop()
+        target = v.pop()
+        v.append(_at(Index(target, index), target))
+
+    def _a_num(self, v):
+        tok = v.pop()
+        v.append(_at(Num(tok.lex), tok))
+
+    def _a_char(self, v):
+        tok = v.pop()
+        v.append(_at(Char(tok.lex), tok))
+
+    def _a_string(self, v):
+        tok = v.pop()
+        v.append(_at(Str(tok.lex), tok))
+
+    def _a_var(self, v):
+        tok = v.pop()
+        v.append(_at(Var(tok.lex), tok))
+
+
+_missing = [name for name in _tables.ACTIONS if not hasattr(LL1Parser, "_a_" + name)]
+if _missing:
+    raise ImportError(f"ll1_tables.py usa acoes sem implementacao: {', '.join(_missing)}")
+
+
+def same_positions(a, b) -> bool:
+    """Compara as posicoes (line, col, file) de duas ASTs iguais no por no."""
+    stack = [(a, b)]
+    while stack:
+        x, y = stack.pop()
+        if (x.line, x.col, x.file) != (y.line, y.col, y.file):
+            return False
+        stack.extend(zip(child_nodes(x), child_nodes(y)))
+    return True
+
+
+def compare_with_parser(tokens: List[Token]) -> Optional[str]:
+    """
+    Analisa com os dois parsers; None se concordam (mesma AST com as mesmas
+    posicoes, ou primeiro erro no mesmo lugar), senao a divergencia.
+    """
+    from parser import Parser
+    program, errors = LL1Parser(tokens).parse_program()
+    reference, ref_errors = Parser(tokens).parse_program()
+    if (program is None) != (reference is None):
+        return f"so um dos parsers aceitou: LL(1) {errors[:1]}, Parser {ref_errors[:1]}"
+    if program is None:
+        a, b = errors[0], ref_errors[0]
+        if (a.line, a.col, a.file) != (b.line, b.col, b.file):
+            return f"primeiro erro em lugares diferentes: LL(1) {a}, Parser {b}"
+        return None
+    if program != reference or not same_positions(program, reference):
+        return "as ASTs dos dois parsers diferem"
+    return None
+
+
+def main():
+    import argparse
+    from lexer import lex
+
+    ap = argparse.ArgumentParser(description="Analisa um programa com o parser LL(1) gerado")
+    ap.add_argument("file")
+    ap.add_argument("--compare", action="store_true",
+                    help="confere que o Parser escrito a mao produz a mesma AST (inclusive "
+                         "posicoes) ou o primeiro erro no mesmo lugar")
+    args = ap.parse_args()
+
+    with open(args.file, "r", encoding="utf-8") as f:
+        code = f.read()
+    tokens, lex_errors = lex(code)
+    if lex_errors:
+        print("Erro lexico:", lex_errors[0], file=sys.stderr)
+        sys.exit(1)
+    program, errors = LL1Parser(tokens).parse_program()
+
+    if args.compare:
+        problem = compare_with_parser(tokens)
+        if problem:
+            print("Os parsers divergem:", problem, file=sys.stderr)
+            sys.exit(1)
+        print("ok", file=sys.stderr)
+    if program is None:
+        print("Erro sintatico:", errors[0], file=sys.stderr)
+        sys.exit(1)
+    if not args.compare:
+        print(program)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# Gerado por ll1_gen.py a partir de c_grammar.ll1; nao editar.
+# Cada linha de TABLE e um nao terminal: token -> simbolos a empilhar (invertidos).
+
+GRAMMAR_SHA256 = 'f3507b941cd271c844d0f31e0cb9a1ce0250a6e99c39890966873b2842c83128'
+TERMINALS = ('EOF', 'EOL', 'ID', 'LPAREN', 'RPAREN', 'SEMI', 'INT', 'FLOAT', 'CHAR_TYPE', 'VOID', 'COMMA', 'EQUAL', 'LBRACE', 'RBRACE', 'IF', 'WHILE', 'FOR', 'RETURN', 'ELSE', 'OR', 'AND', 'EQ', 'NE', 'LT', 'LE', 'GT', 'GE', 'PLUS', 'MINUS', 'STAR', 'SLASH', 'LBRACK', 'RBRACK', 'NUM', 'CHAR', 'STRING')
+NONTERMINALS = ('program', 'items', 'item', 'decl_name', 'decl_rest', 'type', 'params', 'param', 'param_type', 'param_name', 'params_tail', 'var_init', 'block', 'stmts', 'stmt', 'simple_stmt', 'else_part', 'else_body', 'for_init', 'for_cond', 'for_step', 'return_value', 'expr', 'assign_tail', 'or_expr', 'or_tail', 'and_expr', 'and_tail', 'eq_expr', 'eq_tail', 'rel_expr', 'rel_tail', 'add_expr', 'add_tail', 'mul_expr', 'mul_tail', 'unary', 'postfix', 'postfix_tail', 'args', 'args_tail', 'primary')
+ACTIONS = ('list', 'program', 'append', 'function', 'vardecl', 'param_named', 'param_bare', 'none', 'block', 'single', 'if', 'while', 'for', 'return', 'wrap', 'assign_init', 'assign', 'binop', 'negate', 'call', 'index', 'num', 'char', 'string', 'var')
+START = 72
+TABLE = (
+    {0: (115, 0, 114), 1: (115, 0, 73, 1, 114), 2: (115, 0, 73, 116, 5, 95, 97, 99, 101, 103, 105, 107, 110, 138, 38, 114), 3: (115, 0, 73, 116, 5, 95, 97, 99, 101, 103, 105, 107, 110, 4, 94, 3, 114), 6: (115, 0, 73, 116, 76, 75, 42, 114), 7: (115, 0, 73, 116, 76, 75, 43, 114), 8: (115, 0, 73, 116, 76, 75, 44, 114), 9: (115, 0, 73, 116, 76, 75, 45, 114), 14: (115, 0, 73, 116, 124, 88, 84, 4, 94, 3, 50, 114), 15: (115, 0, 73, 116, 125, 84, 4, 94, 3, 51, 114), 16: (115, 0, 73, 116, 126, 84, 4, 92, 5, 91, 90, 3, 52, 114), 17: (115, 0, 73, 116, 127, 5, 93, 53, 114), 28: (115, 0, 73, 116, 5, 95, 97, 99, 101, 103, 105, 107, 132, 108, 64, 114), 33: (115, 0, 73, 116, 5, 95, 97, 99, 101, 103, 105, 107, 110, 135, 69, 114), 34: (115, 0, 73, 116, 5, 95, 97, 99, 101, 103, 105, 107, 110, 136, 70, 114), 35: (115, 0, 73, 116, 5, 95, 97, 99, 101, 103, 105, 107, 110, 137, 71, 114)},  # program
+    {0: (), 1: (73, 1), 2: (73, 116, 5, 95, 97, 99, 101, 103, 105, 107, 110, 138, 38), 3: (73, 116, 5, 95, 97, 99, 101, 103, 105, 107, 110, 4, 94, 3), 6: (73, 116, 76, 75, 42), 7: (73, 116, 76, 75, 43), 8: (73, 116, 76, 75, 44), 9: (73, 116, 76, 75, 45), 14: (73, 116, 124, 88, 84, 4, 94, 3, 50), 15: (73, 116, 125, 84, 4, 94, 3, 51), 16: (73, 116, 126, 84, 4, 92, 5, 91, 90, 3, 52), 17: (73, 116, 127, 5, 93, 53), 28: (73, 116, 5, 95, 97, 99, 101, 103, 105, 107, 132, 108, 64), 33: (73, 116, 5, 95, 97, 99, 101, 103, 105, 107, 110, 135, 69), 34: (73, 116, 5, 95, 97, 99, 101, 103, 105, 107, 110, 136, 70), 35: (73, 116, 5, 95, 97, 99, 101, 103, 105, 107, 110, 137, 71)},  # items
+    {2: (5, 95, 97, 99, 101, 103, 105, 107, 110, 138, 38), 3: (5, 95, 97, 99, 101, 103, 105, 107, 110, 4, 94, 3), 6: (76, 75, 42), 7: (76, 75, 43), 8: (76, 75, 44), 9: (76, 75, 45), 14: (124, 88, 84, 4, 94, 3, 50), 15: (125, 84, 4, 94, 3, 51), 16: (126, 84, 4, 92, 5, 91, 90, 3, 52), 17: (127, 5, 93, 53), 28: (5, 95, 97, 99, 101, 103, 105, 107, 132, 108, 64), 33: (5, 95, 97, 99, 101, 103, 105, 107, 110, 135, 69), 34: (5, 95, 97, 99, 101, 103, 105, 107, 110, 136, 70), 35: (5, 95, 97, 99, 101, 103, 105, 107, 110, 137, 71)},  # item
+    {2: (38,)},  # decl_name
+    {3: (117, 84, 4, 78, 114, 3), 5: (118, 5, 121), 11: (118, 5, 94, 11)},  # decl_rest
+    {6: (42,), 7: (43,), 8: (44,), 9: (45,)},  # type
+    {2: (82, 81, 38), 4: (), 6: (82, 81, 42), 7: (82, 81, 43), 8: (82, 81, 44), 10: (78, 10)},  # params
+    {2: (81, 38), 4: (), 6: (81, 42), 7: (81, 43), 8: (81, 44), 10: ()},  # param
+    {2: (38,), 6: (42,), 7: (43,), 8: (44,)},  # param_type
+    {2: (119, 38), 4: (120,), 10: (120,)},  # param_name
+    {4: (), 10: (78, 10)},  # params_tail
+    {5: (121,), 11: (94, 11)},  # var_init
+    {2: (123, 5, 95, 97, 99, 101, 103, 105, 107, 110, 138, 38), 3: (123, 5, 95, 97, 99, 101, 103, 105, 107, 110, 4, 94, 3), 6: (123, 118, 5, 83, 38, 42), 7: (123, 118, 5, 83, 38, 43), 8: (123, 118, 5, 83, 38, 44), 9: (123, 118, 5, 83, 38, 45), 12: (122, 13, 85, 114, 48), 14: (123, 124, 88, 84, 4, 94, 3, 50), 15: (123, 125, 84, 4, 94, 3, 51), 16: (123, 126, 84, 4, 92, 5, 91, 90, 3, 52), 17: (123, 127, 5, 93, 53), 28: (123, 5, 95, 97, 99, 101, 103, 105, 107, 132, 108, 64), 33: (123, 5, 95, 97, 99, 101, 103, 105, 107, 110, 135, 69), 34: (123, 5, 95, 97, 99, 101, 103, 105, 107, 110, 136, 70), 35: (123, 5, 95, 97, 99, 101, 103, 105, 107, 110, 137, 71)},  # block
+    {1: (85, 1), 2: (85, 116, 5, 95, 97, 99, 101, 103, 105, 107, 110, 138, 38), 3: (85, 116, 5, 95, 97, 99, 101, 103, 105, 107, 110, 4, 94, 3), 6: (85, 116, 118, 5, 83, 38, 42), 7: (85, 116, 118, 5, 83, 38, 43), 8: (85, 116, 118, 5, 83, 38, 44), 9: (85, 116, 118, 5, 83, 38, 45), 13: (), 14: (85, 116, 124, 88, 84, 4, 94, 3, 50), 15: (85, 116, 125, 84, 4, 94, 3, 51), 16: (85, 116, 126, 84, 4, 92, 5, 91, 90, 3, 52), 17: (85, 116, 127, 5, 93, 53), 28: (85, 116, 5, 95, 97, 99, 101, 103, 105, 107, 132, 108, 64), 33: (85, 116, 5, 95, 97, 99, 101, 103, 105, 107, 110, 135, 69), 34: (85, 116, 5, 95, 97, 99, 101, 103, 105, 107, 110, 136, 70), 35: (85, 116, 5, 95, 97, 99, 101, 103, 105, 107, 110, 137, 71)},  # stmts
+    {2: (5, 95, 97, 99, 101, 103, 105, 107, 110, 138, 38), 3: (5, 95, 97, 99, 101, 103, 105, 107, 110, 4, 94, 3), 6: (118, 5, 83, 38, 42), 7: (118, 5, 83, 38, 43), 8: (118, 5, 83, 38, 44), 9: (118, 5, 83, 38, 45), 14: (124, 88, 84, 4, 94, 3, 50), 15: (125, 84, 4, 94, 3, 51), 16: (126, 84, 4, 92, 5, 91, 90, 3, 52), 17: (127, 5, 93, 53), 28: (5, 95, 97, 99, 101, 103, 105, 107, 132, 108, 64), 33: (5, 95, 97, 99, 101, 103, 105, 107, 110, 135, 69), 34: (5, 95, 97, 99, 101, 103, 105, 107, 110, 136, 70), 35: (5, 95, 97, 99, 101, 103, 105, 107, 110, 137, 71)},  # stmt
+    {2: (5, 95, 97, 99, 101, 103, 105, 107, 110, 138, 38), 3: (5, 95, 97, 99, 101, 103, 105, 107, 110, 4, 94, 3), 14: (124, 88, 84, 4, 94, 3, 50), 15: (125, 84, 4, 94, 3, 51), 16: (126, 84, 4, 92, 5, 91, 90, 3, 52), 17: (127, 5, 93, 53), 28: (5, 95, 97, 99, 101, 103, 105, 107, 132, 108, 64), 33: (5, 95, 97, 99, 101, 103, 105, 107, 110, 135, 69), 34: (5, 95, 97, 99, 101, 103, 105, 107, 110, 136, 70), 35: (5, 95, 97, 99, 101, 103, 105, 107, 110, 137, 71)},  # simple_stmt
+    {0: (121,), 1: (121,), 2: (121,), 3: (121,), 6: (121,), 7: (121,), 8: (121,), 9: (121,), 13: (121,), 14: (121,), 15: (121,), 16: (121,), 17: (121,), 18: (89, 18), 28: (121,), 33: (121,), 34: (121,), 35: (121,)},  # else_part
+    {2: (128, 5, 95, 97, 99, 101, 103, 105, 107, 110, 138, 38), 3: (128, 5, 95, 97, 99, 101, 103, 105, 107, 110, 4, 94, 3), 6: (128, 118, 5, 83, 38, 42), 7: (128, 118, 5, 83, 38, 43), 8: (128, 118, 5, 83, 38, 44), 9: (128, 118, 5, 83, 38, 45), 12: (122, 13, 85, 114, 48), 14: (128, 124, 88, 84, 4, 94, 3, 50), 15: (128, 125, 84, 4, 94, 3, 51), 16: (128, 126, 84, 4, 92, 5, 91, 90, 3, 52), 17: (128, 127, 5, 93, 53), 28: (128, 5, 95, 97, 99, 101, 103, 105, 107, 132, 108, 64), 33: (128, 5, 95, 97, 99, 101, 103, 105, 107, 110, 135, 69), 34: (128, 5, 95, 97, 99, 101, 103, 105, 107, 110, 136, 70), 35: (128, 5, 95, 97, 99, 101, 103, 105, 107, 110, 137, 71)},  # else_body
+    {2: (129, 5, 94, 11, 38), 3: (5, 95, 97, 99, 101, 103, 105, 107, 110, 4, 94, 3), 5: (121, 5), 6: (118, 5, 83, 38, 42), 7: (118, 5, 83, 38, 43), 8: (118, 5, 83, 38, 44), 9: (118, 5, 83, 38, 45), 28: (5, 95, 97, 99, 101, 103, 105, 107, 132, 108, 64), 33: (5, 95, 97, 99, 101, 103, 105, 107, 110, 135, 69), 34: (5, 95, 97, 99, 101, 103, 105, 107, 110, 136, 70), 35: (5, 95, 97, 99, 101, 103, 105, 107, 110, 137, 71)},  # for_init
+    {2: (95, 97, 99, 101, 103, 105, 107, 110, 138, 38), 3: (95, 97, 99, 101, 103, 105, 107, 110, 4, 94, 3), 5: (121,), 28: (95, 97, 99, 101, 103, 105, 107, 132, 108, 64), 33: (95, 97, 99, 101, 103, 105, 107, 110, 135, 69), 34: (95, 97, 99, 101, 103, 105, 107, 110, 136, 70), 35: (95, 97, 99, 101, 103, 105, 107, 110, 137, 71)},  # for_cond
+    {2: (95, 97, 99, 101, 103, 105, 107, 110, 138, 38), 3: (95, 97, 99, 101, 103, 105, 107, 110, 4, 94, 3), 4: (121,), 28: (95, 97, 99, 101, 103, 105, 107, 132, 108, 64), 33: (95, 97, 99, 101, 103, 105, 107, 110, 135, 69), 34: (95, 97, 99, 101, 103, 105, 107, 110, 136, 70), 35: (95, 97, 99, 101, 103, 105, 107, 110, 137, 71)},  # for_step
+    {2: (95, 97, 99, 101, 103, 105, 107, 110, 138, 38), 3: (95, 97, 99, 101, 103, 105, 107, 110, 4, 94, 3), 5: (121,), 28: (95, 97, 99, 101, 103, 105, 107, 132, 108, 64), 33: (95, 97, 99, 101, 103, 105, 107, 110, 135, 69), 34: (95, 97, 99, 101, 103, 105, 107, 110, 136, 70), 35: (95, 97, 99, 101, 103, 105, 107, 110, 137, 71)},  # return_value
+    {2: (95, 97, 99, 101, 103, 105, 107, 110, 138, 38), 3: (95, 97, 99, 101, 103, 105, 107, 110, 4, 94, 3), 28: (95, 97, 99, 101, 103, 105, 107, 132, 108, 64), 33: (95, 97, 99, 101, 103, 105, 107, 110, 135, 69), 34: (95, 97, 99, 101, 103, 105, 107, 110, 136, 70), 35: (95, 97, 99, 101, 103, 105, 107, 110, 137, 71)},  # expr
+    {4: (), 5: (), 10: (), 11: (130, 94, 11), 32: ()},  # assign_tail
+    {2: (97, 99, 101, 103, 105, 107, 110, 138, 38), 3: (97, 99, 101, 103, 105, 107, 110, 4, 94, 3), 28: (97, 99, 101, 103, 105, 107, 132, 108, 64), 33: (97, 99, 101, 103, 105, 107, 110, 135, 69), 34: (97, 99, 101, 103, 105, 107, 110, 136, 70), 35: (97, 99, 101, 103, 105, 107, 110, 137, 71)},  # or_expr
+    {4: (), 5: (), 10: (), 11: (), 19: (97, 131, 98, 55), 32: ()},  # or_tail
+    {2: (99, 101, 103, 105, 107, 110, 138, 38), 3: (99, 101, 103, 105, 107, 110, 4, 94, 3), 28: (99, 101, 103, 105, 107, 132, 108, 64), 33: (99, 101, 103, 105, 107, 110, 135, 69), 34: (99, 101, 103, 105, 107, 110, 136, 70), 35: (99, 101, 103, 105, 107, 110, 137, 71)},  # and_expr
+    {4: (), 5: (), 10: (), 11: (), 19: (), 20: (99, 131, 100, 56), 32: ()},  # and_tail
+    {2: (101, 103, 105, 107, 110, 138, 38), 3: (101, 103, 105, 107, 110, 4, 94, 3), 28: (101, 103, 105, 107, 132, 108, 64), 33: (101, 103, 105, 107, 110, 135, 69), 34: (101, 103, 105, 107, 110, 136, 70), 35: (101, 103, 105, 107, 110, 137, 71)},  # eq_expr
+    {4: (), 5: (), 10: (), 11: (), 19: (), 20: (), 21: (101, 131, 102, 57), 22: (101, 131, 102, 58), 32: ()},  # eq_tail
+    {2: (103, 105, 107, 110, 138, 38), 3: (103, 105, 107, 110, 4, 94, 3), 28: (103, 105, 107, 132, 108, 64), 33: (103, 105, 107, 110, 135, 69), 34: (103, 105, 107, 110, 136, 70), 35: (103, 105, 107, 110, 137, 71)},  # rel_expr
+    {4: (), 5: (), 10: (), 11: (), 19: (), 20: (), 21: (), 22: (), 23: (103, 131, 104, 59), 24: (103, 131, 104, 60), 25: (103, 131, 104, 61), 26: (103, 131, 104, 62), 32: ()},  # rel_tail
+    {2: (105, 107, 110, 138, 38), 3: (105, 107, 110, 4, 94, 3), 28: (105, 107, 132, 108, 64), 33: (105, 107, 110, 135, 69), 34: (105, 107, 110, 136, 70), 35: (105, 107, 110, 137, 71)},  # add_expr
+    {4: (), 5: (), 10: (), 11: (), 19: (), 20: (), 21: (), 22: (), 23: (), 24: (), 25: (), 26: (), 27: (105, 131, 106, 63), 28: (105, 131, 106, 64), 32: ()},  # add_tail
+    {2: (107, 110, 138, 38), 3: (107, 110, 4, 94, 3), 28: (107, 132, 108, 64), 33: (107, 110, 135, 69), 34: (107, 110, 136, 70), 35: (107, 110, 137, 71)},  # mul_expr
+    {4: (), 5: (), 10: (), 11: (), 19: (), 20: (), 21: (), 22: (), 23: (), 24: (), 25: (), 26: (), 27: (), 28: (), 29: (107, 131, 108, 65), 30: (107, 131, 108, 66), 32: ()},  # mul_tail
+    {2: (110, 138, 38), 3: (110, 4, 94, 3), 28: (132, 108, 64), 33: (110, 135, 69), 34: (110, 136, 70), 35: (110, 137, 71)},  # unary
+    {2: (110, 138, 38), 3: (110, 4, 94, 3), 33: (110, 135, 69), 34: (110, 136, 70), 35: (110, 137, 71)},  # postfix
+    {3: (110, 133, 4, 111, 114, 3), 4: (), 5: (), 10: (), 11: (), 19: (), 20: (), 21: (), 22: (), 23: (), 24: (), 25: (), 26: (), 27: (), 28: (), 29: (), 30: (), 31: (110, 134, 32, 94, 31), 32: ()},  # postfix_tail
+    {2: (112, 116, 95, 97, 99, 101, 103, 105, 107, 110, 138, 38), 3: (112, 116, 95, 97, 99, 101, 103, 105, 107, 110, 4, 94, 3), 4: (), 28: (112, 116, 95, 97, 99, 101, 103, 105, 107, 132, 108, 64), 33: (112, 116, 95, 97, 99, 101, 103, 105, 107, 110, 135, 69), 34: (112, 116, 95, 97, 99, 101, 103, 105, 107, 110, 136, 70), 35: (112, 116, 95, 97, 99, 101, 103, 105, 107, 110, 137, 71)},  # args
+    {4: (), 10: (112, 116, 94, 10)},  # args_tail
+    {2: (138, 38), 3: (4, 94, 3), 33: (135, 69), 34: (136, 70), 35: (137, 71)},  # primary
+)
+# alternativa vazia de cada nao terminal nulavel, usada quando o token nao tem entrada
+DEFAULT = (
+    None,  # program
+    (),  # items
+    None,  # item
+    None,  # decl_name
+    None,  # decl_rest
+    None,  # type
+    (82, 79),  # params
+    (),  # param
+    None,  # param_type
+    (120,),  # param_name
+    (),  # params_tail
+    (121,),  # var_init
+    None,  # block
+    (),  # stmts
+    None,  # stmt
+    None,  # simple_stmt
+    (121,),  # else_part
+    None,  # else_body
+    None,  # for_init
+    (121,),  # for_cond
+    (121,),  # for_step
+    (121,),  # return_value
+    None,  # expr
+    (),  # assign_tail
+    None,  # or_expr
+    (),  # or_tail
+    None,  # and_expr
+    (),  # and_tail
+    None,  # eq_expr
+    (),  # eq_tail
+    None,  # rel_expr
+    (),  # rel_tail
+    None,  # add_expr
+    (),  # add_tail
+    None,  # mul_expr
+    (),  # mul_tail
+    None,  # unary
+    None,  # postfix
+    (),  # postfix_tail
+    (),  # args
+    (),  # args_tail
+    None,  # primary
+)
+# o que cada nao terminal esperava, para as mensagens de erro
+EXPECTED = (
+    'EOF/EOL/instrucao',
+    'EOF/EOL/instrucao',
+    'instrucao',
+    'ID',
+    'LPAREN/SEMI/EQUAL',
+    'tipo',
+    'ID/RPAREN/INT/FLOAT/CHAR_TYPE/COMMA',
+    'ID/RPAREN/INT/FLOAT/CHAR_TYPE/COMMA',
+    'ID/INT/FLOAT/CHAR_TYPE',
+    'ID/RPAREN/COMMA',
+    'RPAREN/COMMA',
+    'SEMI/EQUAL',
+    'LBRACE/instrucao',
+    'EOL/RBRACE/instrucao',
+    'instrucao',
+    'IF/WHILE/FOR/RETURN/expressao',
+    'EOF/EOL/RBRACE/ELSE/instrucao',
+    'LBRACE/instrucao',
+    'SEMI/tipo/expressao',
+    'SEMI/expressao',
+    'RPAREN/expressao',
+    'SEMI/expressao',
+    'expressao',
+    'RPAREN/SEMI/COMMA/EQUAL/RBRACK',
+    'expressao',
+    'RPAREN/SEMI/COMMA/EQUAL/OR/RBRACK',
+    'expressao',
+    'RPAREN/SEMI/COMMA/EQUAL/OR/AND/RBRACK',
+    'expressao',
+    'RPAREN/SEMI/COMMA/EQUAL/OR/AND/EQ/NE/RBRACK',
+    'expressao',
+    'RPAREN/SEMI/COMMA/EQUAL/OR/AND/EQ/NE/LT/LE/GT/GE/RBRACK',
+    'expressao',
+    'RPAREN/SEMI/COMMA/EQUAL/OR/AND/EQ/NE/LT/LE/GT/GE/PLUS/MINUS/RBRACK',
+    'expressao',
+    'RPAREN/SEMI/COMMA/EQUAL/OR/AND/EQ/NE/LT/LE/GT/GE/PLUS/MINUS/STAR/SLASH/RBRACK',
+    'expressao',
+    'ID/LPAREN/NUM/CHAR/STRING',
+    'LPAREN/RPAREN/SEMI/COMMA/EQUAL/OR/AND/EQ/NE/LT/LE/GT/GE/PLUS/MINUS/STAR/SLASH/LBRACK/RBRACK',
+    'RPAREN/expressao',
+    'RPAREN/COMMA',
+    'ID/LPAREN/NUM/CHAR/STRING',
+)
+# nao terminais cujos erros sao reportados no token anterior
+ANCHOR_PREVIOUS = frozenset({3})
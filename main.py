@@ -1,64 +1,161 @@
-import os, sys
-from lexer import lex
+import argparse
+import os, shutil, sys
+from typing import Optional
+from ast_nodes import AnalysisWarning, LexError, SyntaxErrorInfo
 from parser import Parser
-from visualizer import draw_tree
+from preprocessor import Preprocessor, parse_defines
+from visualizer import draw_tree, draw_overview, draw_function_shards
+from watch import Watcher
+from html_viewer import export_html
+from dataflow import analyze_program
 
 def ensure_trees():
     if not os.path.exists("trees"):
         os.makedirs("trees")
 
-def run_file(path: str):
-    print(f"\n--- Processando: {path}")
+def tree_path(path: str) -> str:
+    fname = os.path.splitext(os.path.basename(path))[0]
+    return f"trees/{fname}_program.png"
 
-    
-    with open(path, "r", encoding="utf-8") as f:
-        code = f.read()
+def shard_dir(path: str) -> str:
+    fname = os.path.splitext(os.path.basename(path))[0]
+    return f"trees/{fname}"
 
-   
-    tokens, lex_errors = lex(code)
+def html_dir(path: str) -> str:
+    fname = os.path.splitext(os.path.basename(path))[0]
+    return f"trees/{fname}_html"
+
+def run_file(path: str, jobs: int = 1, pp: Optional[Preprocessor] = None, shard: bool = False,
+             html: bool = False, analyze: bool = False):
+    print(f"\n--- Processando: {path}")
+
+    pp = pp or Preprocessor()
+    tokens, lex_errors = pp.preprocess_file(path)
+    source = os.path.abspath(path)
 
     print("Tokens:")
     for t in tokens:
-        print(f"  {t.type:8s} '{t.lex}'  ({t.line}:{t.col})")
+        where = f"{t.line}:{t.col}" if t.file in (None, source) else f"{t.file}:{t.line}:{t.col}"
+        print(f"  {t.type:8s} '{t.lex}'  ({where})")
 
     if lex_errors:
         print("\nErros lexicos:")
         for e in lex_errors:
-            print(" ", e)
+            # o nome do arquivo so aparece para erros vindos de cabecalhos
+            print(" ", LexError(e.message, e.line, e.col) if e.file == source else e)
         print("Pulando analise sintatica por erros lexicos.\n")
         return  # DO NOT parse or generate AST
 
     
     parser = Parser(tokens)
-    program, errors = parser.parse_program()
+    if jobs > 1:
+        program, errors = parser.parse_program_parallel(jobs)
+    else:
+        program, errors = parser.parse_program()
 
     if errors:
         print("\nErros sintaticos:")
         for er in errors:
-            print(" ", er)
+            print(" ", SyntaxErrorInfo(er.message, er.line, er.col) if er.file == source else er)
         print("Pulando geracao da AST por erros sintaticos.\n")
         return
 
+    if analyze:
+        warnings = analyze_program(program)
+        print("\nAvisos:" if warnings else "\nSem avisos da analise de fluxo.")
+        for w in warnings:
+            print(" ", AnalysisWarning(w.message, w.line, w.col) if w.file in (None, source) else w)
    
+    if html:
+        print("\nParse concluido. Gerando visualizador HTML...")
+        ensure_trees()
+        index = export_html(program, html_dir(path), title=os.path.basename(path))
+        print("Salvo:", index)
+        return
+
     print("\nParse concluido. Gerando imagens da AST...")
     ensure_trees()
-    fname = os.path.splitext(os.path.basename(path))[0]
-    out = f"trees/{fname}_program.png"
+    out = tree_path(path)
+    if shard:
+        # visao geral resumida + uma imagem por funcao
+        draw_overview(program, out)
+        shards = draw_function_shards(program, shard_dir(path), jobs)
+        # imagens de funcoes removidas ou renomeadas desde a ultima execucao
+        current = {os.path.abspath(s) for s in shards}
+        for f in os.listdir(shard_dir(path)):
+            stale = os.path.join(shard_dir(path), f)
+            if f.endswith(".png") and os.path.abspath(stale) not in current:
+                os.remove(stale)
+        print(f"Salvo: {out} e {len(shards)} imagens em {shard_dir(path)}/")
+        return
     draw_tree(program, out)
     print("Salvo:", out)
 
-def run_examples_folder():
+def run_examples_folder(jobs: int = 1, pp: Optional[Preprocessor] = None, shard: bool = False,
+                        html: bool = False, analyze: bool = False):
     examples_dir = os.path.join(os.path.dirname(__file__), "examples")
     files = sorted(os.listdir(examples_dir))
     for f in files:
         if f.endswith(".c"):
-            run_file(os.path.join(examples_dir, f))
+            run_file(os.path.join(examples_dir, f), jobs, pp, shard, html, analyze)
+
+def remove_outputs(path: str):
+    out = tree_path(path)
+    if os.path.exists(out):
+        os.remove(out)
+        print("Removido:", out)
+    shards = shard_dir(path)
+    if os.path.isdir(shards):
+        for f in os.listdir(shards):
+            if f.endswith(".png"):
+                os.remove(os.path.join(shards, f))
+        if not os.listdir(shards):
+            os.rmdir(shards)
+        print("Removido:", shards)
+    viewer = html_dir(path)
+    if os.path.isdir(viewer):
+        shutil.rmtree(viewer)
+        print("Removido:", viewer)
+
+def watch_folder(directory: str, jobs: int = 1, pp: Optional[Preprocessor] = None, shard: bool = False,
+                 html: bool = False, analyze: bool = False):
+    pp = pp or Preprocessor()
+    watcher = Watcher(directory, lambda p: run_file(p, jobs, pp, shard, html, analyze), remove_outputs,
+                      dependencies=lambda p: pp.dependencies.get(os.path.abspath(p), ()))
+    print(f"Observando {directory} (Ctrl+C para sair)")
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
 
 def main():
-    if len(sys.argv) >= 2:
-        run_file(sys.argv[1])
+    ap = argparse.ArgumentParser(description="Lexer, parser e gerador de AST")
+    ap.add_argument("file", nargs="?", help="arquivo .c (padrao: todos em examples/)")
+    ap.add_argument("-j", "--jobs", type=int, default=1,
+                    help="processos para analisar as declaracoes de topo em paralelo "
+                         "(limitado as CPUs disponiveis; com uma so, modo serial)")
+    ap.add_argument("--watch", metavar="DIR",
+                    help="reprocessa apenas os arquivos de DIR cujo conteudo mudou")
+    ap.add_argument("-I", dest="include_dirs", action="append", default=[], metavar="DIR",
+                    help="diretorio de busca para #include")
+    ap.add_argument("-D", dest="defines", action="append", default=[], metavar="NOME[=VALOR]",
+                    help="define uma macro antes do preprocessamento")
+    ap.add_argument("--pp-cache", metavar="DIR",
+                    help="guarda em disco os tokens de cada cabecalho (chave: mtime e hash)")
+    ap.add_argument("--shard", action="store_true",
+                    help="imagem resumida do programa + uma imagem por funcao em trees/<nome>/")
+    ap.add_argument("--html", action="store_true",
+                    help="gera um visualizador HTML interativo em trees/<nome>_html/ em vez do PNG")
+    ap.add_argument("--analyze", action="store_true",
+                    help="avisos de fluxo de dados: uso sem inicializacao, variaveis nao usadas, codigo inalcancavel")
+    args = ap.parse_args()
+    pp = Preprocessor(args.include_dirs, parse_defines(args.defines), args.pp_cache)
+    if args.watch:
+        watch_folder(args.watch, args.jobs, pp, args.shard, args.html, args.analyze)
+    elif args.file:
+        run_file(args.file, args.jobs, pp, args.shard, args.html, args.analyze)
     else:
-        run_examples_folder()
+        run_examples_folder(args.jobs, pp, args.shard, args.html, args.analyze)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,682 @@
+import sys
+from collections import Counter
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ast_nodes import (
+    ASTNode, Assign, BinOp, Block, Call, Char, For, FunctionDecl, If, Num,
+    Program, Return, Var, VarDecl, While, child_nodes, clone_tree, node_layout,
+)
+from interpreter import ctype
+
+
+# Otimizacao de lacos AST -> AST, aplicada do laco mais interno para fora:
+#
+# - desenrolamento total (opcional) de For com contador inteiro, limites
+#   literais e poucas iteracoes: o corpo e copiado uma vez por iteracao, com
+#   o contador trocado pelo seu valor;
+# - movimento de codigo invariante: declaracoes "int t = e;" e atribuicoes
+#   "x = e;" no nivel de cima do corpo saem do laco quando e nao depende de
+#   nada escrito nele, e as maiores subexpressoes BinOp invariantes restantes
+#   sao calculadas uma vez antes do laco, em temporarios;
+# - reducao de forca: i * k, com i variavel de inducao (i = i +/- c, unica
+#   escrita de i no laco) e k inteiro invariante, vira uma variavel que soma
+#   c * k a cada passo.
+#
+# So sai do laco o que nao tem efeito colateral nem pode falhar: nada de
+# chamadas, atribuicoes, indexacao ou divisao por algo que nao seja um
+# literal nao nulo. Se o laco tem chamadas, variaveis globais contam como
+# escritas nele. A semantica e a de interpreter.py; --verify compara os dois
+# em programas gerados.
+
+_COMPARISONS = ("<", "<=", ">", ">=", "==", "!=")
+
+
+@dataclass
+class LoopStats:
+    loops: int = 0
+    unrolled: int = 0
+    unrolled_iterations: int = 0
+    hoisted_decls: int = 0
+    hoisted_assigns: int = 0
+    hoisted_exprs: int = 0
+    induction_vars: int = 0
+    reduced_multiplies: int = 0
+
+    def add(self, other: "LoopStats"):
+        for f in fields(self):
+            setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+
+    def __str__(self):
+        return "\n".join([
+            f"lacos:                     {self.loops}",
+            f"desenrolados:              {self.unrolled} ({self.unrolled_iterations} iteracoes)",
+            f"declaracoes movidas:       {self.hoisted_decls}",
+            f"atribuicoes movidas:       {self.hoisted_assigns}",
+            f"expressoes movidas:        {self.hoisted_exprs}",
+            f"variaveis de inducao:      {self.induction_vars}",
+            f"multiplicacoes reduzidas:  {self.reduced_multiplies}",
+        ])
+
+
+@dataclass
+class _Facts:
+    assigned: Counter      # nome -> atribuicoes dentro do laco (init, teste, passo e corpo)
+    declared: Counter      # nome -> declaracoes dentro do laco
+    has_call: bool
+    nodes: int
+
+
+def _at(node: ASTNode, where: ASTNode) -> ASTNode:
+    node.line, node.col, node.file = where.line, where.col, where.file
+    return node
+
+
+def _walk(root: Optional[ASTNode]):
+    stack = [root] if root is not None else []
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(child_nodes(node))
+
+
+def _facts(loop: ASTNode) -> _Facts:
+    assigned: Counter = Counter()
+    declared: Counter = Counter()
+    has_call = False
+    nodes = 0
+    for node in _walk(loop):
+        nodes += 1
+        if isinstance(node, Assign) and isinstance(node.target, Var):
+            assigned[node.target.name] += 1
+        elif isinstance(node, VarDecl):
+            declared[node.name] += 1
+        elif isinstance(node, Call):
+            has_call = True
+    return _Facts(assigned, declared, has_call, nodes)
+
+
+def _int_literal(node: Optional[ASTNode]) -> Optional[int]:
+    if isinstance(node, Num) and "." not in node.value:
+        return int(node.value)
+    if (isinstance(node, BinOp) and node.op == "-" and isinstance(node.left, Num)
+            and node.left.value == "0" and isinstance(node.right, Num) and "." not in node.right.value):
+        return -int(node.right.value)
+    return None
+
+
+def _num(value: int, where: ASTNode) -> ASTNode:
+    # negativos na forma que o parser produz para o menos unario
+    if value < 0:
+        return _at(BinOp("-", _at(Num("0"), where), _at(Num(str(-value)), where)), where)
+    return _at(Num(str(value)), where)
+
+
+def _references(root: Optional[ASTNode], name: str) -> bool:
+    return any(isinstance(n, Var) and n.name == name for n in _walk(root))
+
+
+def _rename(root: ASTNode, old: str, new: str):
+    for n in _walk(root):
+        if isinstance(n, Var) and n.name == old:
+            n.name = new
+
+
+def _step_of(stmt: Optional[ASTNode]) -> Optional[Tuple[str, int]]:
+    # "i = i + c", "i = c + i" ou "i = i - c" -> (i, +c / -c)
+    if not (isinstance(stmt, Assign) and isinstance(stmt.target, Var) and isinstance(stmt.value, BinOp)):
+        return None
+    name, value = stmt.target.name, stmt.value
+    if value.op == "+":
+        if isinstance(value.left, Var) and value.left.name == name:
+            c = _int_literal(value.right)
+        elif isinstance(value.right, Var) and value.right.name == name:
+            c = _int_literal(value.left)
+        else:
+            return None
+    elif value.op == "-" and isinstance(value.left, Var) and value.left.name == name:
+        c = _int_literal(value.right)
+        c = None if c is None else -c
+    else:
+        return None
+    return None if c is None or c == 0 else (name, c)
+
+
+class LoopOptimizer:
+
+    def __init__(self, unroll: bool = False, max_unroll_trips: int = 8, max_unroll_nodes: int = 400):
+        self.unroll = unroll
+        self.max_unroll_trips = max_unroll_trips
+        self.max_unroll_nodes = max_unroll_nodes
+        self.stats = LoopStats()
+        self.scopes: List[Dict[str, str]] = []
+        self.names: Set[str] = set()
+        self.counter = 0
+
+    def optimize(self, program: Program) -> Program:
+        """Devolve uma copia otimizada; a arvore original nao e alterada."""
+        program = clone_tree(program)
+        self.names = {n.name for n in _walk(program) if isinstance(n, (Var, VarDecl, FunctionDecl))}
+        self.scopes = [{d.name: ctype(d.var_type) for d in program.body if isinstance(d, VarDecl)}]
+        for decl in program.body:
+            if isinstance(decl, FunctionDecl):
+                self.names.update(name for _, name in decl.params)
+        self.statements(program.body)
+        # a copia herdou os hashes estruturais da arvore original
+        for node in _walk(program):
+            node.__dict__.pop("_merkle", None)
+        return program
+
+    def fresh(self, prefix: str) -> str:
+        while True:
+            self.counter += 1
+            name = f"_{prefix}{self.counter}"
+            if name not in self.names:
+                self.names.add(name)
+                return name
+
+
+    # Percurso com escopos
+
+    def lookup(self, name: str) -> Optional[Tuple[str, bool]]:
+        # (tipo, e local?)
+        for depth in range(len(self.scopes) - 1, -1, -1):
+            t = self.scopes[depth].get(name)
+            if t is not None:
+                return t, depth > 0
+        return None
+
+    def statements(self, stmts: List[ASTNode]):
+        i = 0
+        while i < len(stmts):
+            stmt = stmts[i]
+            if isinstance(stmt, FunctionDecl):
+                self.scopes.append({name: ctype(t) for t, name in stmt.params})
+                self.block(stmt.body)
+                self.scopes.pop()
+            elif isinstance(stmt, VarDecl):
+                self.scopes[-1][stmt.name] = ctype(stmt.var_type)
+            elif isinstance(stmt, Block):
+                self.block(stmt)
+            elif isinstance(stmt, If):
+                self.block(stmt.then)
+                self.block(stmt.otherwise)
+            elif isinstance(stmt, (While, For)):
+                if isinstance(stmt, For):
+                    self.scopes.append({})
+                    if isinstance(stmt.init, VarDecl):
+                        self.scopes[-1][stmt.init.name] = ctype(stmt.init.var_type)
+                self.block(stmt.body)
+                if isinstance(stmt, For):
+                    self.scopes.pop()
+                out = self.loop(stmt, stmts[i - 1] if i else None)
+                stmts[i:i + 1] = out
+                # o que saiu do laco ja foi visto; so faltam as declaracoes
+                for new in out:
+                    if isinstance(new, VarDecl):
+                        self.scopes[-1][new.name] = ctype(new.var_type)
+                i += len(out)
+                continue
+            i += 1
+
+    def block(self, block: Optional[Block]):
+        if block is not None:
+            self.scopes.append({})
+            self.statements(block.body)
+            self.scopes.pop()
+
+
+    # Um laco (os internos ja foram otimizados)
+
+    def loop(self, loop: ASTNode, prev: Optional[ASTNode]) -> List[ASTNode]:
+        self.stats.loops += 1
+        if self.unroll and isinstance(loop, For):
+            unrolled = self.try_unroll(loop)
+            if unrolled is not None:
+                return unrolled
+        if loop.body is None:
+            return [loop]
+        pre: List[ASTNode] = []
+        self.hoist_statements(loop, prev, pre)
+        self.hoist_expressions(loop, pre)
+        self.reduce_strength(loop, pre)
+        return pre + [loop]
+
+    def emit_before(self, stmt: ASTNode, pre: List[ASTNode]):
+        # o laco esta no escopo do topo da pilha; o que sai dele vai para la
+        pre.append(stmt)
+        if isinstance(stmt, VarDecl):
+            self.scopes[-1][stmt.name] = ctype(stmt.var_type)
+
+    def invariant_types(self, roots: List[Optional[ASTNode]], facts: _Facts) -> Dict[int, str]:
+        """id(no) -> tipo para toda subexpressao invariante e segura de calcular antes do laco."""
+        out: Dict[int, str] = {}
+        stack: List[Tuple[ASTNode, bool]] = [(r, False) for r in roots if r is not None]
+        while stack:
+            node, ready = stack.pop()
+            if not ready:
+                stack.append((node, True))
+                stack.extend((c, False) for c in child_nodes(node))
+                continue
+            if isinstance(node, Num):
+                out[id(node)] = "float" if "." in node.value else "int"
+            elif isinstance(node, Char):
+                out[id(node)] = "int"
+            elif isinstance(node, Var):
+                found = self.lookup(node.name)
+                if (found is not None and not facts.assigned[node.name] and not facts.declared[node.name]
+                        and (found[1] or not facts.has_call)):
+                    out[id(node)] = found[0]
+            elif isinstance(node, BinOp):
+                left, right = out.get(id(node.left)), out.get(id(node.right))
+                if left is None or right is None:
+                    continue
+                if node.op == "/" and not (isinstance(node.right, Num) and float(node.right.value) != 0):
+                    continue
+                if node.op in _COMPARISONS or node.op in ("&&", "||"):
+                    out[id(node)] = "int"
+                else:
+                    out[id(node)] = "float" if "float" in (left, right) else "int"
+        return out
+
+    def hoist_statements(self, loop: ASTNode, prev: Optional[ASTNode], pre: List[ASTNode]):
+        body = loop.body.body
+        runs = self.runs_at_least_once(loop, prev)
+        i = 0
+        while i < len(body):
+            stmt = body[i]
+            facts = _facts(loop)
+            if isinstance(stmt, VarDecl) and stmt.init is not None and stmt.var_type != "void":
+                inv = self.invariant_types([stmt.init], facts)
+                if (id(stmt.init) in inv and facts.declared[stmt.name] == 1
+                        and not facts.assigned[stmt.name]):
+                    # a mesma declaracao com o mesmo valor a cada volta: sai do
+                    # laco com nome novo (nao pode sombrear nada fora dele)
+                    name = self.fresh("inv")
+                    for later in body[i + 1:]:
+                        _rename(later, stmt.name, name)
+                    stmt.name = name
+                    self.emit_before(body.pop(i), pre)
+                    self.stats.hoisted_decls += 1
+                    continue
+            elif isinstance(stmt, Assign) and isinstance(stmt.target, Var) and runs:
+                name = stmt.target.name
+                found = self.lookup(name)
+                inv = self.invariant_types([stmt.value], facts)
+                earlier = body[:i]
+                if (id(stmt.value) in inv and found is not None
+                        and facts.assigned[name] == 1 and not facts.declared[name]
+                        and (found[1] or not facts.has_call)
+                        and not _references(getattr(loop, "init", None), name)
+                        and not _references(getattr(loop, "cond", None) or getattr(loop, "test", None), name)
+                        and not any(_references(s, name) for s in earlier)
+                        and (found[1] or not any(isinstance(n, Return) for s in earlier for n in _walk(s)))):
+                    pre.append(body.pop(i))
+                    self.stats.hoisted_assigns += 1
+                    continue
+            i += 1
+
+    def hoist_expressions(self, loop: ASTNode, pre: List[ASTNode]):
+        if isinstance(loop, For):
+            roots = [loop.cond, loop.step, loop.body]
+        else:
+            roots = [loop.test, loop.body]
+        inv = self.invariant_types(roots, _facts(loop))
+        temps: List[Tuple[ASTNode, str]] = []
+
+        def worth(node: ASTNode) -> bool:
+            # "-3" e so a forma do literal negativo, nao vale um temporario
+            return (isinstance(node, BinOp) and id(node) in inv
+                    and not (node.op == "-" and node.left == Num("0") and isinstance(node.right, Num)))
+
+        def temp_for(node: ASTNode) -> ASTNode:
+            for expr, name in temps:
+                if expr == node:
+                    break
+            else:
+                name = self.fresh("inv")
+                temps.append((node, name))
+                self.emit_before(_at(VarDecl(inv[id(node)], name, node), node), pre)
+                self.stats.hoisted_exprs += 1
+            return _at(Var(name), node)
+
+        # os temporarios sao calculados antes do laco, entao a raiz tambem conta
+        if isinstance(loop, While) and worth(loop.test):
+            loop.test = temp_for(loop.test)
+        if isinstance(loop, For) and loop.cond is not None and worth(loop.cond):
+            loop.cond = temp_for(loop.cond)
+        if isinstance(loop, For):
+            roots = [loop.cond, loop.step, loop.body]
+        else:
+            roots = [loop.test, loop.body]
+        stack = [r for r in roots if r is not None]
+        while stack:
+            node = stack.pop()
+            for fname, structural in node_layout(type(node)):
+                if not structural:
+                    continue
+                value = getattr(node, fname)
+                if isinstance(value, ASTNode):
+                    if worth(value):
+                        setattr(node, fname, temp_for(value))
+                    else:
+                        stack.append(value)
+                elif isinstance(value, list):
+                    for k, item in enumerate(value):
+                        if not isinstance(item, ASTNode):
+                            continue
+                        if worth(item):
+                            value[k] = temp_for(item)
+                        else:
+                            stack.append(item)
+
+
+    # Variaveis de inducao
+
+    def induction_var(self, loop: ASTNode, facts: _Facts) -> Optional[Tuple[str, int, Optional[ASTNode]]]:
+        """(nome, passo, instrucao de incremento no corpo ou None se for o passo do For)."""
+        if isinstance(loop, For):
+            step = _step_of(loop.step)
+            if step is None:
+                return None
+            name = step[0]
+            own = isinstance(loop.init, VarDecl) and loop.init.name == name
+            writes = 1 + (isinstance(loop.init, Assign) and isinstance(loop.init.target, Var)
+                          and loop.init.target.name == name)
+            if facts.assigned[name] != writes or facts.declared[name] != int(own):
+                return None
+            t = ctype(loop.init.var_type) if own else (self.lookup(name) or (None, False))[0]
+            local = own or (self.lookup(name) or (None, False))[1]
+            if t != "int" or (not local and facts.has_call):
+                return None
+            return name, step[1], None
+        for stmt in loop.body.body:
+            step = _step_of(stmt)
+            if step is None:
+                continue
+            name = step[0]
+            found = self.lookup(name)
+            if (facts.assigned[name] == 1 and not facts.declared[name] and found is not None
+                    and found[0] == "int" and (found[1] or not facts.has_call)):
+                return name, step[1], stmt
+        return None
+
+    def runs_at_least_once(self, loop: ASTNode, prev: Optional[ASTNode]) -> bool:
+        if isinstance(loop, For):
+            start = loop.init.init if isinstance(loop.init, VarDecl) else getattr(loop.init, "value", None)
+            name = getattr(loop.init, "name", None) or getattr(getattr(loop.init, "target", None), "name", None)
+            test = loop.cond
+        else:
+            start = prev.init if isinstance(prev, VarDecl) else getattr(prev, "value", None)
+            name = getattr(prev, "name", None) or getattr(getattr(prev, "target", None), "name", None)
+            test = loop.test
+        if test is None:
+            return isinstance(loop, For)
+        value = _int_literal(start)
+        if value is None or not isinstance(test, BinOp) or test.op not in _COMPARISONS:
+            return False
+        bound = _int_literal(test.right)
+        if bound is None or not (isinstance(test.left, Var) and test.left.name == name):
+            return False
+        return _compare(test.op, value, bound)
+
+    def reduce_strength(self, loop: ASTNode, pre: List[ASTNode]):
+        facts = _facts(loop)
+        iv = self.induction_var(loop, facts)
+        if iv is None:
+            return
+        name, step, update = iv
+        start = self.induction_start(loop, name)
+        if start is None:
+            return
+        roots = [loop.cond, loop.body] if isinstance(loop, For) else [loop.test, loop.body]
+        inv = self.invariant_types(roots, facts)
+
+        def factor(node: ASTNode) -> Optional[ASTNode]:
+            # o outro fator de "i * k" com k inteiro invariante
+            if not (isinstance(node, BinOp) and node.op == "*"):
+                return None
+            for a, b in ((node.left, node.right), (node.right, node.left)):
+                if (isinstance(a, Var) and a.name == name and isinstance(b, (Num, Var))
+                        and inv.get(id(b)) == "int"):
+                    return b
+            return None
+
+        derived: Dict[str, str] = {}
+        stack = [r for r in roots if r is not None]
+        while stack:
+            node = stack.pop()
+            for fname, structural in node_layout(type(node)):
+                if not structural:
+                    continue
+                value = getattr(node, fname)
+                items = list(enumerate(value)) if isinstance(value, list) else [(None, value)]
+                for k, item in items:
+                    if not isinstance(item, ASTNode):
+                        continue
+                    other = factor(item)
+                    if other is None:
+                        stack.append(item)
+                        continue
+                    key = other.value if isinstance(other, Num) else other.name
+                    if key not in derived:
+                        derived[key] = self.new_derived(loop, start, step, other, update, pre)
+                    replacement = _at(Var(derived[key]), item)
+                    if k is None:
+                        setattr(node, fname, replacement)
+                    else:
+                        value[k] = replacement
+                    self.stats.reduced_multiplies += 1
+        self.stats.induction_vars += bool(derived)
+
+    def induction_start(self, loop: ASTNode, name: str) -> Optional[ASTNode]:
+        """Expressao com o valor de i logo antes da primeira volta, calculavel antes do laco."""
+        init = getattr(loop, "init", None)
+        if isinstance(init, VarDecl) and init.name == name:
+            start = init.init if init.init is not None else _at(Num("0"), init)
+        elif isinstance(init, Assign) and init.target.name == name:
+            start = init.value
+        else:
+            return _at(Var(name), loop)
+        # a inicializacao e avaliada de novo antes do laco: tem de ser pura
+        pure = self.invariant_types([start], _Facts(Counter(), Counter(), False, 0))
+        return start if id(start) in pure else None
+
+    def new_derived(self, loop: ASTNode, base: ASTNode, step: int, k: ASTNode,
+                    update: Optional[ASTNode], pre: List[ASTNode]) -> str:
+        t = self.fresh("iv")
+        a, b = _int_literal(base), _int_literal(k)
+        if a is not None and b is not None or a == 0 or b == 0:
+            init = _num((a or 0) * (b or 0), loop)
+        else:
+            init = _at(BinOp("*", clone_tree(base), clone_tree(k)), loop)
+        self.emit_before(_at(VarDecl("int", t, init), loop), pre)
+        # incremento: t = t +/- |c| * k
+        c = _int_literal(k)
+        if c is not None:
+            amount: ASTNode = _num(abs(step * c), loop)
+            op = "+" if step * c >= 0 else "-"
+        else:
+            amount = clone_tree(k) if abs(step) == 1 else _at(BinOp("*", _num(abs(step), loop), clone_tree(k)), loop)
+            op = "+" if step > 0 else "-"
+        bump = _at(Assign(_at(Var(t), loop), _at(BinOp(op, _at(Var(t), loop), amount), loop)), loop)
+        body = loop.body.body
+        if update is None:
+            body.append(bump)
+        else:
+            body.insert(next(j for j, s in enumerate(body) if s is update) + 1, bump)
+        return t
+
+
+    # Desenrolamento
+
+    def try_unroll(self, loop: For) -> Optional[List[ASTNode]]:
+        step = _step_of(loop.step)
+        if step is None or not isinstance(loop.cond, BinOp) or loop.cond.op not in _COMPARISONS:
+            return None
+        name, delta = step
+        init = loop.init
+        if isinstance(init, VarDecl) and init.name == name and ctype(init.var_type) == "int":
+            start, local = _int_literal(init.init) if init.init is not None else 0, True
+        elif isinstance(init, Assign) and isinstance(init.target, Var) and init.target.name == name:
+            found = self.lookup(name)
+            if found is None or found[0] != "int":
+                return None
+            start, local = _int_literal(init.value), found[1]
+        else:
+            return None
+        bound = _int_literal(loop.cond.right)
+        if start is None or bound is None or not (isinstance(loop.cond.left, Var) and loop.cond.left.name == name):
+            return None
+        facts = _facts(loop.body)
+        if facts.assigned[name] or facts.declared[name] or (not local and facts.has_call):
+            return None
+        # as copias entram direto na lista de quem contem o laco (o parser nao
+        # aceita bloco solto), entao as declaracoes do corpo ganham nomes novos
+        stmts = loop.body.body if loop.body is not None else []
+        if any(isinstance(s, VarDecl) and facts.declared[s.name] > 1 for s in stmts):
+            return None
+
+        values: List[int] = []
+        i = start
+        while _compare(loop.cond.op, i, bound):
+            if len(values) == self.max_unroll_trips:
+                return None
+            values.append(i)
+            i += delta
+        if facts.nodes * len(values) > self.max_unroll_nodes:
+            return None
+
+        out: List[ASTNode] = []
+        for v in values:
+            copies = clone_tree(stmts)
+            for k, stmt in enumerate(copies):
+                if isinstance(stmt, Var) and stmt.name == name:
+                    copies[k] = _num(v, stmt)
+                    continue
+                _substitute(stmt, name, v)
+                if isinstance(stmt, VarDecl):
+                    new = self.fresh("u")
+                    for later in copies[k + 1:]:
+                        _rename(later, stmt.name, new)
+                    stmt.name = new
+            out.extend(copies)
+        if isinstance(init, Assign):
+            out.append(_at(Assign(_at(Var(name), init), _num(i, init)), init))
+        self.stats.unrolled += 1
+        self.stats.unrolled_iterations += len(values)
+        return out
+
+
+def _compare(op: str, a: int, b: int) -> bool:
+    return {"<": a < b, "<=": a <= b, ">": a > b, ">=": a >= b, "==": a == b, "!=": a != b}[op]
+
+
+def _substitute(root: ASTNode, name: str, value: int):
+    # troca as leituras de `name` pelo literal (o laco nao escreve nem redeclara o nome)
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        for fname, structural in node_layout(type(node)):
+            if not structural:
+                continue
+            child = getattr(node, fname)
+            if isinstance(child, Var) and child.name == name:
+                setattr(node, fname, _num(value, child))
+            elif isinstance(child, ASTNode):
+                stack.append(child)
+            elif isinstance(child, list):
+                for k, item in enumerate(child):
+                    if isinstance(item, Var) and item.name == name:
+                        child[k] = _num(value, item)
+                    elif isinstance(item, ASTNode):
+                        stack.append(item)
+
+
+def optimize_loops(program: Program, unroll: bool = False, **kwargs: Any) -> Tuple[Program, LoopStats]:
+    opt = LoopOptimizer(unroll, **kwargs)
+    return opt.optimize(program), opt.stats
+
+
+# Verificacao diferencial
+
+def verify(programs: int = 200, seed: int = 0, unroll: bool = True, **gen: Any) -> Tuple[LoopStats, List[str]]:
+    """
+    Executa programas gerados (modo executavel) no interpretador antes e
+    depois da otimizacao, e tambem a versao otimizada transpilada; devolve
+    as estatisticas somadas e a lista de divergencias.
+    """
+    from generator import GenConfig, generate_program
+    from interpreter import ExecutionError, run_program
+    from lexer import lex
+    from parser import Parser
+    from transpiler import compile_program
+
+    total = LoopStats()
+    failures: List[str] = []
+    for s in range(seed, seed + programs):
+        cfg = GenConfig(**{"functions": 4, "depth": 3, "stmts": 4, **gen, "indexing": False, "seed": s})
+        program, errors = Parser(lex(generate_program(cfg))[0]).parse_program()
+        if program is None:
+            failures.append(f"seed {s}: programa gerado invalido: {errors[0]}")
+            continue
+        optimized, stats = optimize_loops(program, unroll)
+        total.add(stats)
+        try:
+            expected = run_program(program)
+        except ExecutionError as e:
+            expected = f"erro: {e.message}"
+        for label, run in (("interpretado", lambda: run_program(optimized)),
+                           ("transpilado", lambda: compile_program(optimized).run())):
+            try:
+                got = run()
+            except ExecutionError as e:
+                got = f"erro: {e.message}"
+            if got != expected:
+                failures.append(f"seed {s} ({label}): esperado {expected!r}, obtido {got!r}")
+    return total, failures
+
+
+def main():
+    import argparse
+    from lexer import lex
+    from parser import Parser
+    from pretty_printer import pretty_print
+
+    ap = argparse.ArgumentParser(description="Otimizacao de lacos: codigo invariante, reducao de forca e desenrolamento")
+    ap.add_argument("file", nargs="?", help="arquivo .c; o resultado sai como C em stdout")
+    ap.add_argument("--unroll", action="store_true", help="desenrola For com poucas iteracoes constantes")
+    ap.add_argument("--max-trips", type=int, default=8, help="iteracoes maximas para desenrolar")
+    ap.add_argument("--verify", type=int, metavar="N",
+                    help="compara a execucao antes/depois em N programas gerados")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    if args.verify:
+        stats, failures = verify(args.verify, args.seed, args.unroll)
+        print(stats)
+        for f in failures:
+            print(f, file=sys.stderr)
+        print(f"{args.verify - len(failures)}/{args.verify} programas sem divergencia" if not failures
+              else f"{len(failures)} divergencia(s)")
+        sys.exit(1 if failures else 0)
+    if not args.file:
+        ap.error("informe um arquivo ou --verify N")
+
+    with open(args.file, "r", encoding="utf-8") as f:
+        code = f.read()
+    tokens, lex_errors = lex(code)
+    if lex_errors:
+        print("Erro lexico:", lex_errors[0], file=sys.stderr)
+        sys.exit(1)
+    program, errors = Parser(tokens).parse_program()
+    if program is None:
+        print("Erro sintatico:", errors[0], file=sys.stderr)
+        sys.exit(1)
+    optimized, stats = optimize_loops(program, args.unroll, max_unroll_trips=args.max_trips)
+    pretty_print(optimized, sys.stdout)
+    print(stats, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,14 @@
+import gc
+import marshal
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import fields
 from typing import List, Optional, Tuple
+import ast_nodes
 from ast_nodes import (
+    ASTNode,
     Token,
     Program,
     FunctionDecl,
@@ -18,6 +27,7 @@ from ast_nodes import (
     Char,
     Str,
     SyntaxErrorInfo,
+    node_layout,
 )
 
 class Parser:
@@ -47,19 +57,25 @@ class Parser:
         if self.match(ttype):
             return self.advance()
         cur = self.current()
-        self._error(f"Esperado {ttype} mas encontrado '{cur.lex or cur.type}'", cur.line, cur.col)
+        self._error(f"Esperado {ttype} mas encontrado '{cur.lex or cur.type}'", cur.line, cur.col, cur.file)
         return None
 
-    def _error(self, message: str, line: int, col: int):
+    def _error(self, message: str, line: int, col: int, file: Optional[str] = None):
         if not self.had_error:
-            self.errors.append(SyntaxErrorInfo(message, line, col))
+            self.errors.append(SyntaxErrorInfo(message, line, col, file))
             self.had_error = True
 
+    def _at(self, node, where):
+        # posicao de origem (token ou no ja posicionado), fora dos campos do dataclass
+        node.line, node.col, node.file = where.line, where.col, where.file
+        return node
+
 
 
 
 
     def parse_program(self) -> Tuple[Optional[Program], List[SyntaxErrorInfo]]:
+        start = self.current()
         decls: List = []
         while not self.match("EOF"):
             if self.had_error:
@@ -86,12 +102,62 @@ class Parser:
                     decls.append(stmt)
                 else:
                     cur = self.current()
-                    self._error(f"Unexpected token '{cur.lex or cur.type}'", cur.line, cur.col)
+                    self._error(f"Unexpected token '{cur.lex or cur.type}'", cur.line, cur.col, cur.file)
                     break
 
         if self.had_error:
             return None, self.errors
-        return Program(decls), self.errors
+        return self._at(Program(decls), start), self.errors
+
+    def parse_program_parallel(self, workers: Optional[int] = None,
+                               min_tokens: int = 20000) -> Tuple[Optional[Program], List[SyntaxErrorInfo]]:
+        """
+        Igual a parse_program, mas as declaracoes de topo sao divididas em
+        lotes e analisadas num pool de processos. Os lotes comecam sempre em
+        fronteiras onde o parser serial estaria no laco de topo, entao o
+        resultado (inclusive o primeiro erro) e o mesmo do modo serial.
+
+        Os processos sao criados por fork e herdam os tokens: so os limites
+        de cada lote vao para o worker, que devolve a AST num formato plano
+        (_pack_nodes) em vez de nos Python serializados um a um. Sem fork,
+        com uma CPU so ou com entrada pequena, cai no modo serial.
+        """
+        workers = min(workers or usable_cpus(), usable_cpus())
+        if workers < 2 or len(self.tokens) < min_tokens or "fork" not in multiprocessing.get_all_start_methods():
+            return self.parse_program()
+        spans = split_top_level(self.tokens, self.pos)
+        if not spans or len(spans) < 2:
+            return self.parse_program()
+
+        global _fork_tokens
+        batches = _batch_spans(spans, workers * 4)
+        first = self.current()
+        decls: List = []
+        _fork_tokens = self.tokens
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork"),
+                                     initializer=_init_worker) as pool:
+                # os lotes sao remontados na ordem, enquanto os seguintes
+                # ainda estao sendo analisados
+                for start, packed in zip((a for a, _ in batches), pool.map(_parse_chunk, batches)):
+                    if packed is None:
+                        # o primeiro lote com erro e reanalisado em serie a partir
+                        # do seu inicio para reproduzir a mensagem do modo serial
+                        pool.shutdown(cancel_futures=True)
+                        self.pos = start
+                        program, errors = self.parse_program()
+                        if program is None:
+                            return None, errors
+                        return self._at(Program(decls + program.body), first), errors
+                    decls.extend(_unpack_nodes(packed))
+        except (OSError, BrokenProcessPool, ValueError):
+            # sem processos ou um lote que o marshal nao grava: modo serial
+            self.pos = batches[0][0]
+            return self.parse_program()
+        finally:
+            _fork_tokens = None
+        self.pos = len(self.tokens) - 1
+        return self._at(Program(decls), first), self.errors
 
     
     
@@ -101,7 +167,7 @@ class Parser:
             return None
 
         if not self.match("ID"):
-            self._error("Esperado identificador apos tipo", typ_tok.line, typ_tok.col)
+            self._error("Esperado identificador apos tipo", typ_tok.line, typ_tok.col, typ_tok.file)
             return None
         name_tok = self.advance()
 
@@ -129,7 +195,7 @@ class Parser:
             body = self.parse_block()
             if self.had_error:
                 return None
-            return FunctionDecl(typ_tok.lex, name_tok.lex, params, body)
+            return self._at(FunctionDecl(typ_tok.lex, name_tok.lex, params, body), typ_tok)
 
         init = None
         if self.match("EQUAL"):
@@ -137,18 +203,18 @@ class Parser:
             init = self.parse_expression()
             if init is None:
                         cur = self.current()
-                        self._error("Esperado expressao apos '='", cur.line, cur.col)
+                        self._error("Esperado expressao apos '='", cur.line, cur.col, cur.file)
             return None
         if not self.expect("SEMI"):
             return None
-        return VarDecl(typ_tok.lex, name_tok.lex, init)
+        return self._at(VarDecl(typ_tok.lex, name_tok.lex, init), typ_tok)
 
     
     # Block
     
     def parse_block(self) -> Optional[Block]:
         if self.match("LBRACE"):
-            self.advance()
+            lbrace = self.advance()
             stmts: List = []
             while not self.match("RBRACE", "EOF"):
                 if self.had_error:
@@ -163,19 +229,19 @@ class Parser:
                     stmts.append(stmt)
                 else:
                     cur = self.current()
-                    self._error(f"Token inesperado no bloco: '{cur.lex or cur.type}'", cur.line, cur.col)
+                    self._error(f"Token inesperado no bloco: '{cur.lex or cur.type}'", cur.line, cur.col, cur.file)
                     return None
             if not self.expect("RBRACE"):
                 return None
-            return Block(stmts)
+            return self._at(Block(stmts), lbrace)
         else:
             stmt = self.parse_statement()
             if self.had_error:
                 return None
             if stmt:
-                return Block([stmt])
+                return self._at(Block([stmt]), stmt)
             cur = self.current()
-            self._error(f"Esperado bloco ou instrucao mas encontrado '{cur.lex or cur.type}'", cur.line, cur.col)
+            self._error(f"Esperado bloco ou instrucao mas encontrado '{cur.lex or cur.type}'", cur.line, cur.col, cur.file)
             return None
 
     
@@ -191,18 +257,18 @@ class Parser:
         if self.match("FOR"):
             return self.parse_for()
         if self.match("RETURN"):
-            self.advance()
+            ret_tok = self.advance()
             if self.match("SEMI"):
                 self.advance()
-                return Return(None)
+                return self._at(Return(None), ret_tok)
             v = self.parse_expression()
             if v is None:
                 cur = self.current()
-                self._error("Esperado expressao apos 'return'", cur.line, cur.col)
+                self._error("Esperado expressao apos 'return'", cur.line, cur.col, cur.file)
                 return None
             if not self.expect("SEMI"):
                 return None
-            return Return(v)
+            return self._at(Return(v), ret_tok)
 
         if self.match("ID"):
             cur_pos = self.pos
@@ -212,11 +278,11 @@ class Parser:
                 val = self.parse_expression()
                 if val is None:
                     cur = self.current()
-                    self._error("Expected expression after '='", cur.line, cur.col)
+                    self._error("Expected expression after '='", cur.line, cur.col, cur.file)
                     return None
                 if not self.expect("SEMI"):
                     return None
-                return Assign(Var(id_tok.lex), val)
+                return self._at(Assign(self._at(Var(id_tok.lex), id_tok), val), id_tok)
             self.pos = cur_pos
 
         expr = self.parse_expression()
@@ -226,7 +292,7 @@ class Parser:
             return expr
 
         cur = self.current()
-        self._error(f"Unexpected token in statement: '{cur.lex or cur.type}'", cur.line, cur.col)
+        self._error(f"Unexpected token in statement: '{cur.lex or cur.type}'", cur.line, cur.col, cur.file)
         return None
 
     
@@ -237,7 +303,7 @@ class Parser:
             return None
         if not self.match("ID"):
             cur = self.current()
-            self._error("Expected identifier after type", cur.line, cur.col)
+            self._error("Expected identifier after type", cur.line, cur.col, cur.file)
             return None
         name_tok = self.advance()
 
@@ -247,24 +313,24 @@ class Parser:
             init = self.parse_expression()
             if init is None:
                 cur = self.current()
-                self._error("Expected expression after '='", cur.line, cur.col)
+                self._error("Expected expression after '='", cur.line, cur.col, cur.file)
                 return None
 
         if not self.expect("SEMI"):
             return None
 
-        return VarDecl(type_tok.lex, name_tok.lex, init)
+        return self._at(VarDecl(type_tok.lex, name_tok.lex, init), type_tok)
 
     
     
     def parse_if(self):
-        self.advance() 
+        kw = self.advance()
         if not self.expect("LPAREN"):
             return None
         cond = self.parse_expression()
         if cond is None:
             cur = self.current()
-            self._error("Expected expression in 'if' condition", cur.line, cur.col)
+            self._error("Expected expression in 'if' condition", cur.line, cur.col, cur.file)
             return None
         if not self.expect("RPAREN"):
             return None
@@ -286,28 +352,28 @@ class Parser:
                     otherwise = Block([stmt])
                 else:
                     cur = self.current()
-                    self._error("Expected statement after 'else'", cur.line, cur.col)
+                    self._error("Expected statement after 'else'", cur.line, cur.col, cur.file)
                     return None
-        return If(cond, then_block, otherwise)
+        return self._at(If(cond, then_block, otherwise), kw)
 
     def parse_while(self):
-        self.advance()
+        kw = self.advance()
         if not self.expect("LPAREN"):
             return None
         cond = self.parse_expression()
         if cond is None:
             cur = self.current()
-            self._error("Expected expression in 'while' condition", cur.line, cur.col)
+            self._error("Expected expression in 'while' condition", cur.line, cur.col, cur.file)
             return None
         if not self.expect("RPAREN"):
             return None
         body = self.parse_block()
         if body is None and self.had_error:
             return None
-        return While(cond, body)
+        return self._at(While(cond, body), kw)
 
     def parse_for(self):
-        self.advance()
+        kw = self.advance()
         if not self.expect("LPAREN"):
             return None
 
@@ -322,16 +388,16 @@ class Parser:
                 val = self.parse_expression()
                 if val is None:
                     cur = self.current()
-                    self._error("Esperado expressao na atribuicao do for-init", cur.line, cur.col)
+                    self._error("Esperado expressao na atribuicao do for-init", cur.line, cur.col, cur.file)
                     return None
-                init = Assign(Var(id_tok.lex), val)
+                init = self._at(Assign(self._at(Var(id_tok.lex), id_tok), val), id_tok)
                 if not self.expect("SEMI"):
                     return None
             else:
                 init = self.parse_expression()
                 if init is None:
                     cur = self.current()
-                    self._error("Esperado expressao ou atribuicao em for-init", cur.line, cur.col)
+                    self._error("Esperado expressao ou atribuicao em for-init", cur.line, cur.col, cur.file)
                     return None
                 if not self.expect("SEMI"):
                     return None
@@ -344,7 +410,7 @@ class Parser:
             cond = self.parse_expression()
             if cond is None:
                 cur = self.current()
-                self._error("Esperado expressao na condicao do for", cur.line, cur.col)
+                self._error("Esperado expressao na condicao do for", cur.line, cur.col, cur.file)
                 return None
         if not self.expect("SEMI"):
             return None
@@ -354,7 +420,7 @@ class Parser:
             step = self.parse_expression()
             if step is None:
                 cur = self.current()
-                self._error("Esperado expressao no passo do for", cur.line, cur.col)
+                self._error("Esperado expressao no passo do for", cur.line, cur.col, cur.file)
                 return None
         if not self.expect("RPAREN"):
             return None
@@ -362,7 +428,7 @@ class Parser:
         body = self.parse_block()
         if body is None and self.had_error:
             return None
-        return For(init, cond, step, body)
+        return self._at(For(init, cond, step, body), kw)
 
     
     
@@ -383,15 +449,15 @@ class Parser:
             right = self.parse_assignment()
             if right is None:
                 cur = self.current()
-                self._error("Esperado expressao apos '='", cur.line, cur.col)
+                self._error("Esperado expressao apos '='", cur.line, cur.col, cur.file)
                 return None
 
             if not isinstance(left, Var):
                 cur = self.current()
-                self._error("Left side of assignment must be a variable", cur.line, cur.col)
+                self._error("Left side of assignment must be a variable", cur.line, cur.col, cur.file)
                 return None
 
-            return Assign(left, right)
+            return self._at(Assign(left, right), left)
 
         return left
 
@@ -404,9 +470,9 @@ class Parser:
             right = self.parse_and()
             if right is None:
                 cur = self.current()
-                self._error("Esperado expressao apos operador", cur.line, cur.col)
+                self._error("Esperado expressao apos operador", cur.line, cur.col, cur.file)
                 return None
-            left = BinOp(op, left, right)
+            left = self._at(BinOp(op, left, right), left)
         return left
 
     def parse_and(self):
@@ -418,9 +484,9 @@ class Parser:
             right = self.parse_equality()
             if right is None:
                 cur = self.current()
-                self._error("Esperado expressao apos operador", cur.line, cur.col)
+                self._error("Esperado expressao apos operador", cur.line, cur.col, cur.file)
                 return None
-            left = BinOp(op, left, right)
+            left = self._at(BinOp(op, left, right), left)
         return left
 
     def parse_equality(self):
@@ -432,9 +498,9 @@ class Parser:
             right = self.parse_relational()
             if right is None:
                 cur = self.current()
-                self._error("Esperado expressao apos operador", cur.line, cur.col)
+                self._error("Esperado expressao apos operador", cur.line, cur.col, cur.file)
                 return None
-            left = BinOp(op, left, right)
+            left = self._at(BinOp(op, left, right), left)
         return left
 
     def parse_relational(self):
@@ -446,9 +512,9 @@ class Parser:
             right = self.parse_add()
             if right is None:
                 cur = self.current()
-                self._error("Esperado expressao apos operador", cur.line, cur.col)
+                self._error("Esperado expressao apos operador", cur.line, cur.col, cur.file)
                 return None
-            left = BinOp(op, left, right)
+            left = self._at(BinOp(op, left, right), left)
         return left
 
     def parse_add(self):
@@ -460,9 +526,9 @@ class Parser:
             right = self.parse_mul()
             if right is None:
                 cur = self.current()
-                self._error("Esperado expressao apos '+' ou '-'", cur.line, cur.col)
+                self._error("Esperado expressao apos '+' ou '-'", cur.line, cur.col, cur.file)
                 return None
-            left = BinOp(op, left, right)
+            left = self._at(BinOp(op, left, right), left)
         return left
 
     def parse_mul(self):
@@ -474,20 +540,21 @@ class Parser:
             right = self.parse_unary()
             if right is None:
                 cur = self.current()
-                self._error("Esperado expressao apos '*' ou '/'", cur.line, cur.col)
+                self._error("Esperado expressao apos '*' ou '/'", cur.line, cur.col, cur.file)
                 return None
-            left = BinOp(op, left, right)
+            left = self._at(BinOp(op, left, right), left)
         return left
 
     def parse_unary(self):
         if self.match("MINUS"):
-            op = self.advance().lex
+            op_tok = self.advance()
+            op = op_tok.lex
             node = self.parse_unary()
             if node is None:
                 cur = self.current()
-                self._error("Esperado expressao apos unario '-'", cur.line, cur.col)
+                self._error("Esperado expressao apos unario '-'", cur.line, cur.col, cur.file)
                 return None
-            return BinOp(op, Num("0"), node)
+            return self._at(BinOp(op, self._at(Num("0"), op_tok), node), op_tok)
         return self.parse_postfix()
 
     def parse_postfix(self):
@@ -503,7 +570,7 @@ class Parser:
                     a = self.parse_expression()
                     if a is None:
                         cur = self.current()
-                        self._error("Esperado expressao no argumento da chamada", cur.line, cur.col)
+                        self._error("Esperado expressao no argumento da chamada", cur.line, cur.col, cur.file)
                         return None
                     args.append(a)
                     while self.match("COMMA"):
@@ -511,45 +578,207 @@ class Parser:
                         a = self.parse_expression()
                         if a is None:
                             cur = self.current()
-                            self._error("Esperado expressao no argumento da chamada", cur.line, cur.col)
+                            self._error("Esperado expressao no argumento da chamada", cur.line, cur.col, cur.file)
                             return None
                         args.append(a)
                 if not self.expect("RPAREN"):
                     return None
-                node = Call(node, args)
+                node = self._at(Call(node, args), node)
 
             elif self.match("LBRACK"):
                 self.advance()
                 idx = self.parse_expression()
                 if idx is None:
                     cur = self.current()
-                    self._error("Esperado expressao dentro de []", cur.line, cur.col)
+                    self._error("Esperado expressao dentro de []", cur.line, cur.col, cur.file)
                     return None
                 if not self.expect("RBRACK"):
                     return None
-                node = Index(node, idx)
+                node = self._at(Index(node, idx), node)
             else:
                 break
 
         return node
 
     def parse_primary(self):
+        tok = self.current()
         if self.match("NUM"):
-            return Num(self.advance().lex)
+            return self._at(Num(self.advance().lex), tok)
         if self.match("CHAR"):
-            return Char(self.advance().lex)
+            return self._at(Char(self.advance().lex), tok)
         if self.match("STRING"):
-            return Str(self.advance().lex)
+            return self._at(Str(self.advance().lex), tok)
         if self.match("ID"):
-            return Var(self.advance().lex)
+            return self._at(Var(self.advance().lex), tok)
         if self.match("LPAREN"):
             self.advance()
             e = self.parse_expression()
             if e is None:
                 cur = self.current()
-                self._error("Esperado expressao entre parenteses", cur.line, cur.col)
+                self._error("Esperado expressao entre parenteses", cur.line, cur.col, cur.file)
                 return None
             if not self.expect("RPAREN"):
                 return None
             return e
         return None
+
+
+
+# Divisao do programa em declaracoes de topo (modo paralelo)
+
+def split_top_level(tokens: List[Token], start: int = 0) -> Optional[List[Tuple[int, int]]]:
+    """
+    Intervalos [a, b) de tokens que terminam em ';' ou '}' fora de qualquer
+    parentese, colchete ou chave. Retorna None se os delimitadores nao
+    fecham, caso em que so o modo serial sabe reportar o erro.
+    """
+    spans: List[Tuple[int, int]] = []
+    depth = 0
+    n = len(tokens)
+    for i in range(start, n):
+        t = tokens[i].type
+        if t in ("LBRACE", "LPAREN", "LBRACK"):
+            depth += 1
+        elif t in ("RBRACE", "RPAREN", "RBRACK"):
+            depth -= 1
+            if depth < 0:
+                return None
+        if depth == 0 and t in ("RBRACE", "SEMI"):
+            j = i + 1
+            while j < n and tokens[j].type == "EOL":
+                j += 1
+            if j < n and tokens[j].type == "ELSE":
+                continue  # o else pertence ao if anterior
+            spans.append((start, i + 1))
+            start = i + 1
+    if depth != 0:
+        return None
+    if start < n and any(tok.type not in ("EOL", "EOF") for tok in tokens[start:]):
+        spans.append((start, n))
+    return spans
+
+
+def _batch_spans(spans: List[Tuple[int, int]], count: int) -> List[Tuple[int, int]]:
+    size = max(1, -(-len(spans) // count))
+    return [(spans[i][0], spans[min(i + size, len(spans)) - 1][1]) for i in range(0, len(spans), size)]
+
+
+def _eof_after(tok: Token) -> Token:
+    return Token("EOF", "", tok.line, tok.col)
+
+
+def usable_cpus() -> int:
+    """CPUs que este processo pode usar (o limite de workers do modo paralelo)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+# tokens do parse_program_parallel em andamento, herdados pelos workers no fork
+_fork_tokens: Optional[List[Token]] = None
+
+
+def _init_worker():
+    # a AST nao tem ciclos e o worker termina com o pool: sem o coletor de
+    # ciclos, que com tantos objetos vivos passa a maior parte do tempo
+    # varrendo a arvore
+    gc.disable()
+
+
+def _parse_chunk(span: Tuple[int, int]) -> Optional[bytes]:
+    a, b = span
+    tokens = _fork_tokens[a:b]
+    program, _ = Parser(tokens + [_eof_after(tokens[-1])]).parse_program()
+    return _pack_nodes(program.body) if program is not None else None
+
+
+# Formato plano dos lotes: um registro por no em pos-ordem, so com tipos
+# basicos, gravado com marshal: (indice da classe, dicionario com line, col,
+# file e os campos que nao sao nos, tamanho de cada lista de filhos...), ou
+# None no lugar de um filho opcional ausente. Na leitura o dicionario recebe
+# os filhos e vira o __dict__ do no. Nem a gravacao nem a leitura usam
+# recursao.
+
+_NODE_CLASSES = [c for c in vars(ast_nodes).values()
+                 if isinstance(c, type) and issubclass(c, ASTNode) and c is not ASTNode]
+
+
+def _pack_fields(cls: type) -> Tuple[List[str], List[str], List[str]]:
+    # campos sem nos, campos com um no (ou None), campos com lista de nos
+    is_list = {f.name: "List" in str(f.type) for f in fields(cls)}
+    layout = node_layout(cls)
+    return ([n for n, s in layout if not s],
+            [n for n, s in layout if s and not is_list[n]],
+            [n for n, s in layout if s and is_list[n]])
+
+
+_PACK = {c: (k, *_pack_fields(c)) for k, c in enumerate(_NODE_CLASSES)}
+_UNPACK = [(c, single, lists) for c, (_, _, single, lists) in _PACK.items()]
+
+
+def _pack_nodes(nodes: List[ASTNode]) -> bytes:
+    # pre-ordem visitando os filhos da direita para a esquerda; invertida,
+    # vira a pos-ordem com os filhos na ordem dos campos
+    records: list = []
+    emit = records.append
+    stack = list(nodes)
+    pop, push, extend = stack.pop, stack.append, stack.extend
+    while stack:
+        node = pop()
+        if node is None:
+            emit(None)
+            continue
+        k, plain, single, lists = _PACK[type(node)]
+        d = node.__dict__
+        state = {f: d[f] for f in plain}
+        if "line" in d:
+            state["line"], state["col"], state["file"] = d["line"], d["col"], d.get("file")
+        emit((k, state, *[len(d[f]) for f in lists]) if lists else (k, state))
+        for f in single:
+            push(d[f])
+        for f in lists:
+            extend(d[f])
+    records.reverse()
+    return marshal.dumps(records)
+
+
+def _unpack_nodes(data: bytes) -> List[ASTNode]:
+    # os nos remontados formam uma arvore (sem ciclos): o coletor fica
+    # desligado durante a leitura, como nos workers
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _unpack_records(marshal.loads(data))
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _unpack_records(records: list) -> List[ASTNode]:
+    stack: list = []
+    push = stack.append
+    new = object.__new__
+    for rec in records:
+        if rec is None:
+            push(None)
+            continue
+        cls, single, lists = _UNPACK[rec[0]]
+        node = new(cls)
+        state = rec[1]
+        if lists:
+            sizes = rec[2:]
+            count = len(single) + sum(sizes)
+            kids = stack[len(stack) - count:]
+            del stack[len(stack) - count:]
+            state.update(zip(single, kids))
+            j = len(single)
+            for f, n in zip(lists, sizes):
+                state[f] = kids[j:j + n]
+                j += n
+        elif single:
+            count = len(single)
+            state.update(zip(single, stack[-count:]))
+            del stack[-count:]
+        node.__dict__ = state
+        push(node)
+    return stack
@@ -0,0 +1,554 @@
+import hashlib
+import os
+import pickle
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ast_nodes import Token, LexError
+from lexer import lex
+
+
+# Preprocessador que roda entre o texto e o parser: trata #define (objeto e
+# funcao), #undef, #include "..." / <...>, #if/#ifdef/#ifndef/#elif/#else/
+# #endif, #pragma once e #error. Trabalha sobre os tokens do lexer, entao
+# cada token carrega o arquivo e a linha de origem; tokens vindos de uma
+# expansao de macro recebem a posicao do uso da macro.
+#
+# O lexing de cada arquivo e feito uma vez por sessao (e, com cache_dir, uma
+# vez por versao do arquivo em disco). Inclusoes repetidas de um cabecalho
+# com include guard ou #pragma once nem sequer percorrem os tokens de novo.
+
+
+MAX_INCLUDE_DEPTH = 200
+
+
+@dataclass
+class Macro:
+    name: str
+    params: Optional[List[str]]  # None para macros do tipo objeto
+    body: List[Token]
+
+
+@dataclass
+class SourceFile:
+    path: str
+    mtime_ns: int
+    size: int
+    digest: str
+    tokens: List[Token]
+    errors: List[LexError]
+    guard: Optional[str] = None
+
+
+@dataclass
+class _Cond:
+    active: bool       # o ramo atual esta ativo
+    taken: bool        # algum ramo desta cadeia ja foi ativado
+    seen_else: bool = False
+
+
+@dataclass
+class _Unit:
+    macros: Dict[str, Macro]
+    once: Set[str] = field(default_factory=set)
+    errors: List[LexError] = field(default_factory=list)
+    stack: List[str] = field(default_factory=list)
+    deps: Set[str] = field(default_factory=set)    # cabecalhos incluidos (ou procurados)
+
+
+_directive_re = re.compile(r"#\s*([A-Za-z_]\w*)?\s*(.*)", re.DOTALL)
+_define_re = re.compile(r"([A-Za-z_]\w*)(\(([^)]*)\))?\s*(.*)", re.DOTALL)
+_comment_re = re.compile(r"/\*[\s\S]*?\*/|//[^\n]*")
+_expr_token_re = re.compile(
+    r"\s*(?:(\d+)[uUlL]*|([A-Za-z_]\w*)|(\|\||&&|==|!=|<=|>=|[-+*/%<>!()]))"
+)
+
+
+_NO_HIDE: frozenset = frozenset()
+
+
+def parse_defines(items: List[str]) -> Dict[str, str]:
+    """Opcoes -D NOME[=VALOR] da linha de comando; sem valor a macro vale 1."""
+    defines = {}
+    for item in items:
+        name, sep, value = item.partition("=")
+        defines[name] = value if sep else "1"
+    return defines
+
+
+def file_stamps(paths: Iterable[str]) -> List[Tuple[str, int, int]]:
+    """(caminho, mtime_ns, tamanho) de cada arquivo; (-1, -1) se nao existe."""
+    out = []
+    for path in sorted(paths):
+        try:
+            st = os.stat(path)
+            out.append((path, st.st_mtime_ns, st.st_size))
+        except OSError:
+            out.append((path, -1, -1))
+    return out
+
+
+def _located(tok: Token, at: Token) -> Token:
+    return Token(tok.type, tok.lex, at.line, at.col, at.file)
+
+
+class Preprocessor:
+
+    def __init__(self, include_dirs: Optional[List[str]] = None,
+                 defines: Optional[Dict[str, str]] = None,
+                 cache_dir: Optional[str] = None):
+        self.include_dirs = list(include_dirs or [])
+        self.defines = dict(defines or {})
+        self.cache_dir = cache_dir
+        self.files: Dict[str, SourceFile] = {}
+        self.hits = 0
+        self.misses = 0
+        # arquivo principal -> cabecalhos de que dependeu no ultimo preprocess_file
+        # (ou preprocess, pelo nome dado)
+        self.dependencies: Dict[str, Set[str]] = {}
+
+    def preprocess_file(self, path: str) -> Tuple[List[Token], List[LexError]]:
+        unit = self._new_unit()
+        src = self.load(path)
+        out = self._process(src, unit)
+        self.dependencies[src.path] = unit.deps
+        return self._finish(out, unit, src.tokens[-1])
+
+    def preprocess(self, code: str, filename: str = "<input>") -> Tuple[List[Token], List[LexError]]:
+        unit = self._new_unit()
+        tokens, errors = lex(code, directives=True)
+        src = SourceFile(filename, 0, len(code), "", self._tag(tokens, filename),
+                         [LexError(e.message, e.line, e.col, filename) for e in errors])
+        out = self._process(src, unit)
+        self.dependencies[filename] = unit.deps
+        return self._finish(out, unit, src.tokens[-1])
+
+    def _new_unit(self) -> _Unit:
+        macros: Dict[str, Macro] = {}
+        for name, value in self.defines.items():
+            body, _ = lex(value)
+            macros[name] = Macro(name, None, [t for t in body if t.type not in ("EOL", "EOF")])
+        return _Unit(macros)
+
+    @staticmethod
+    def _finish(out: List[Token], unit: _Unit, eof: Token) -> Tuple[List[Token], List[LexError]]:
+        # mesmo fechamento que lex(): EOL final seguido do EOF do arquivo principal
+        if not out or out[-1].type != "EOL":
+            out.append(Token("EOL", "", eof.line, eof.col, eof.file))
+        out.append(eof)
+        return out, unit.errors
+
+
+    # Cache de arquivos lexados
+
+    def load(self, path: str) -> SourceFile:
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        cached = self.files.get(path)
+        if cached and (cached.mtime_ns, cached.size) == (st.st_mtime_ns, st.st_size):
+            self.hits += 1
+            return cached
+
+        disk = self._disk_load(path)
+        if disk and (disk.mtime_ns, disk.size) == (st.st_mtime_ns, st.st_size):
+            self.hits += 1
+            self.files[path] = disk
+            return disk
+
+        with open(path, "r", encoding="utf-8") as f:
+            code = f.read()
+        digest = hashlib.sha256(code.encode("utf-8")).hexdigest()
+        for old in (cached, disk):
+            if old and old.digest == digest:
+                # so o mtime mudou: reaproveita os tokens
+                self.hits += 1
+                old.mtime_ns, old.size = st.st_mtime_ns, st.st_size
+                self.files[path] = old
+                self._disk_store(old)
+                return old
+
+        self.misses += 1
+        tokens, errors = lex(code, directives=True)
+        src = SourceFile(path, st.st_mtime_ns, st.st_size, digest, self._tag(tokens, path),
+                         [LexError(e.message, e.line, e.col, path) for e in errors])
+        src.guard = _find_guard(src.tokens)
+        self.files[path] = src
+        self._disk_store(src)
+        return src
+
+    @staticmethod
+    def _tag(tokens: List[Token], path: str) -> List[Token]:
+        for t in tokens:
+            t.file = path
+        return tokens
+
+    def _disk_path(self, path: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        key = hashlib.sha256(path.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key + ".tokens")
+
+    def _disk_load(self, path: str) -> Optional[SourceFile]:
+        disk_path = self._disk_path(path)
+        if not disk_path or not os.path.exists(disk_path):
+            return None
+        try:
+            with open(disk_path, "rb") as f:
+                src = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+        if not isinstance(src, SourceFile) or src.path != path:
+            return None
+        # entradas antigas podem ter sido gravadas sem o guard detectado
+        src.guard = _find_guard(src.tokens)
+        return src
+
+    def _disk_store(self, src: SourceFile):
+        disk_path = self._disk_path(src.path)
+        if not disk_path:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = disk_path + f".{os.getpid()}"
+        with open(tmp, "wb") as f:
+            pickle.dump(src, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, disk_path)
+
+
+    # Processamento de um arquivo
+
+    def _process(self, src: SourceFile, unit: _Unit) -> List[Token]:
+        unit.errors.extend(src.errors)
+        unit.stack.append(src.path)
+        out: List[Token] = []
+        pending: List[Token] = []
+        conds: List[_Cond] = []
+        for tok in src.tokens:
+            if tok.type == "EOF":
+                break
+            if tok.type == "DIRECTIVE":
+                out.extend(self._expand(pending, unit))
+                pending = []
+                self._directive(tok, src, unit, conds, out)
+            elif not conds or conds[-1].active:
+                pending.append(tok)
+        out.extend(self._expand(pending, unit))
+        if conds:
+            self._error(unit, "#if sem #endif correspondente", src.tokens[-1])
+        unit.stack.pop()
+        return out
+
+    def _error(self, unit: _Unit, message: str, tok: Token):
+        unit.errors.append(LexError(message, tok.line, tok.col, tok.file))
+
+    def _directive(self, tok: Token, src: SourceFile, unit: _Unit, conds: List[_Cond], out: List[Token]):
+        text = _comment_re.sub(" ", tok.lex.replace("\\\r\n", " ").replace("\\\n", " "))
+        m = _directive_re.match(text)
+        name = (m.group(1) or "") if m else ""
+        arg = m.group(2).strip() if m else ""
+        active = not conds or conds[-1].active
+
+        if name in ("if", "ifdef", "ifndef"):
+            if not active:
+                conds.append(_Cond(False, True))
+            elif name == "if":
+                value = self._eval(arg, tok, unit)
+                conds.append(_Cond(value, value))
+            else:
+                defined = arg.split()[0] in unit.macros if arg else False
+                if not arg:
+                    self._error(unit, f"#{name} sem nome de macro", tok)
+                value = defined if name == "ifdef" else not defined
+                conds.append(_Cond(value, value))
+            return
+        if name in ("elif", "else", "endif"):
+            if not conds:
+                self._error(unit, f"#{name} sem #if", tok)
+                return
+            cond = conds[-1]
+            if name == "endif":
+                conds.pop()
+                return
+            if cond.seen_else:
+                self._error(unit, f"#{name} depois de #else", tok)
+                return
+            parent_active = len(conds) < 2 or conds[-2].active
+            if name == "else":
+                cond.seen_else = True
+                cond.active = parent_active and not cond.taken
+            else:
+                cond.active = parent_active and not cond.taken and self._eval(arg, tok, unit)
+            cond.taken = cond.taken or cond.active
+            return
+        if not active:
+            return
+
+        if name == "define":
+            self._define(arg, tok, unit)
+        elif name == "undef":
+            unit.macros.pop(arg.split()[0] if arg else "", None)
+        elif name == "include":
+            self._include(arg, tok, src, unit, out)
+        elif name == "pragma":
+            if arg.split()[:1] == ["once"]:
+                unit.once.add(src.path)
+        elif name == "error":
+            self._error(unit, f"#error {arg}".rstrip(), tok)
+        elif name:
+            self._error(unit, f"Diretiva desconhecida '#{name}'", tok)
+
+    def _define(self, arg: str, tok: Token, unit: _Unit):
+        m = _define_re.match(arg)
+        if not m:
+            self._error(unit, "Esperado nome de macro apos #define", tok)
+            return
+        name, has_params, params_text, body_text = m.groups()
+        params = None
+        if has_params is not None:
+            params = [p.strip() for p in params_text.split(",")] if params_text.strip() else []
+            if not all(re.fullmatch(r"[A-Za-z_]\w*", p) for p in params):
+                self._error(unit, f"Parametros invalidos na macro '{name}'", tok)
+                return
+        body, errors = lex(body_text)
+        for e in errors:
+            self._error(unit, f"{e.message} na macro '{name}'", tok)
+        body = [t for t in body if t.type not in ("EOL", "EOF")]
+        unit.macros[name] = Macro(name, params, body)
+
+    def _include(self, arg: str, tok: Token, src: SourceFile, unit: _Unit, out: List[Token]):
+        m = re.match(r'"([^"]+)"|<([^>]+)>', arg)
+        if not m:
+            self._error(unit, "Esperado \"arquivo\" ou <arquivo> apos #include", tok)
+            return
+        quoted, system = m.groups()
+        dirs = list(self.include_dirs)
+        if quoted:
+            dirs.insert(0, os.path.dirname(src.path) or ".")
+        name = quoted or system
+        path = next((os.path.join(d, name) for d in dirs if os.path.isfile(os.path.join(d, name))), None)
+        if path is None:
+            # criar o arquivo depois tambem conta como mudanca (modo --watch)
+            unit.deps.add(os.path.abspath(os.path.join(dirs[0], name)) if dirs else os.path.abspath(name))
+            self._error(unit, f"Arquivo de inclusao nao encontrado: {name}", tok)
+            return
+        path = os.path.abspath(path)
+        unit.deps.add(path)
+        if path in unit.once:
+            return
+        if len(unit.stack) >= MAX_INCLUDE_DEPTH:
+            self._error(unit, f"Inclusao aninhada demais (ciclo?): {name}", tok)
+            return
+        header = self.load(path)
+        if header.guard and header.guard in unit.macros:
+            return
+        out.extend(self._process(header, unit))
+
+
+    # Expansao de macros
+
+    def _expand(self, tokens: List[Token], unit: _Unit) -> List[Token]:
+        if not unit.macros:
+            return tokens
+        return [tok for tok, _ in self._expand_hidden([(t, _NO_HIDE) for t in tokens], unit)]
+
+    def _expand_hidden(self, tokens: List[Tuple[Token, frozenset]], unit: _Unit) -> List[Tuple[Token, frozenset]]:
+        # Cada token carrega o conjunto de macros que ja o produziram (hide
+        # set) e nao e expandido de novo por elas. A substituicao volta para
+        # o inicio da entrada restante e e reexaminada junto com o que vem
+        # depois (C11 6.10.3.4): com "#define g f", g(1) chama f(1).
+        out: List[Tuple[Token, frozenset]] = []
+        pending = tokens[::-1]  # o proximo token fica no fim
+        while pending:
+            tok, hide = pending.pop()
+            macro = unit.macros.get(tok.lex) if tok.type == "ID" else None
+            if macro is None or tok.lex in hide:
+                out.append((tok, hide))
+                continue
+            if macro.params is None:
+                hide = hide | {macro.name}
+                pending.extend((_located(t, tok), hide) for t in reversed(macro.body))
+                continue
+            j = len(pending) - 1
+            while j >= 0 and pending[j][0].type == "EOL":
+                j -= 1
+            if j < 0 or pending[j][0].type != "LPAREN":
+                out.append((tok, hide))  # nome de macro-funcao sem chamada
+                continue
+            args, end = _collect_args(pending, j)
+            if args is None:
+                self._error(unit, f"Chamada da macro '{macro.name}' sem ')'", tok)
+                out.append((tok, hide))
+                continue
+            rparen_hide = pending[end][1]
+            del pending[end:]
+            if len(args) != len(macro.params) and not (not macro.params and args == [[]]):
+                self._error(unit, f"Macro '{macro.name}' espera {len(macro.params)} argumento(s), recebeu {len(args)}", tok)
+                continue
+            # o resultado herda as macros que escondiam tanto o nome quanto o ')'
+            hide = (hide & rparen_hide) | {macro.name}
+            expanded = {p: self._expand_hidden(a, unit) for p, a in zip(macro.params, args)}
+            body: List[Tuple[Token, frozenset]] = []
+            for t in macro.body:
+                if t.type == "ID" and t.lex in expanded:
+                    body.extend((_located(a, tok), h | hide) for a, h in expanded[t.lex])
+                else:
+                    body.append((_located(t, tok), hide))
+            pending.extend(reversed(body))
+        return out
+
+
+    # Expressoes de #if
+
+    def _eval(self, text: str, tok: Token, unit: _Unit) -> bool:
+        try:
+            toks = self._expr_tokens(text, unit, frozenset())
+            value, pos = _parse_expr(toks, 0, 0)
+            if pos != len(toks):
+                raise ValueError(f"token inesperado '{toks[pos]}'")
+            return value != 0
+        except (ValueError, IndexError, ZeroDivisionError) as e:
+            self._error(unit, f"Expressao invalida em #if: {e}", tok)
+            return False
+
+    def _expr_tokens(self, text: str, unit: _Unit, hide: frozenset) -> List[str]:
+        raw: List[str] = []
+        pos = 0
+        text = text.strip()
+        while pos < len(text):
+            m = _expr_token_re.match(text, pos)
+            if not m or m.end() == pos:
+                raise ValueError(f"simbolo inesperado '{text[pos:].strip()[:1]}'")
+            raw.append(m.group(m.lastindex))
+            pos = m.end()
+            while pos < len(text) and text[pos].isspace():
+                pos += 1
+
+        out: List[str] = []
+        i = 0
+        while i < len(raw):
+            t = raw[i]
+            if t == "defined":
+                if raw[i + 1] == "(":
+                    name, i = raw[i + 2], i + 4
+                    if raw[i - 1] != ")":
+                        raise ValueError("esperado ')' apos defined(")
+                else:
+                    name, i = raw[i + 1], i + 2
+                out.append("1" if name in unit.macros else "0")
+                continue
+            if re.match(r"[A-Za-z_]", t):
+                macro = unit.macros.get(t)
+                if macro is not None and macro.params is None and t not in hide:
+                    body = " ".join(b.lex for b in macro.body)
+                    out.extend(self._expr_tokens(body, unit, hide | {t}) or ["0"])
+                else:
+                    out.append("0")  # identificador desconhecido vale 0, como em C
+                i += 1
+                continue
+            out.append(t)
+            i += 1
+        return out
+
+
+def _collect_args(pending: List[Tuple[Token, frozenset]], lparen: int) -> Tuple[Optional[List[List[Tuple[Token, frozenset]]]], int]:
+    # pending esta invertido: os argumentos ficam abaixo do '(' e o indice
+    # devolvido e o do ')' que fecha a chamada
+    args: List[List[Tuple[Token, frozenset]]] = [[]]
+    depth = 0
+    for k in range(lparen - 1, -1, -1):
+        t = pending[k][0]
+        if t.type == "EOL":
+            continue
+        if t.type == "LPAREN":
+            depth += 1
+        elif t.type == "RPAREN":
+            if depth == 0:
+                return args, k
+            depth -= 1
+        elif t.type == "COMMA" and depth == 0:
+            args.append([])
+            continue
+        args[-1].append(pending[k])
+    return None, 0
+
+
+_BINARY_PREC = {
+    "||": 1, "&&": 2, "==": 3, "!=": 3,
+    "<": 4, "<=": 4, ">": 4, ">=": 4,
+    "+": 5, "-": 5, "*": 6, "/": 6, "%": 6,
+}
+
+
+def _parse_expr(toks: List[str], pos: int, min_prec: int) -> Tuple[int, int]:
+    left, pos = _parse_unary(toks, pos)
+    while pos < len(toks) and _BINARY_PREC.get(toks[pos], -1) > min_prec:
+        op = toks[pos]
+        right, pos = _parse_expr(toks, pos + 1, _BINARY_PREC[op])
+        left = _apply(op, left, right)
+    return left, pos
+
+
+def _parse_unary(toks: List[str], pos: int) -> Tuple[int, int]:
+    t = toks[pos]
+    if t == "!":
+        v, pos = _parse_unary(toks, pos + 1)
+        return int(not v), pos
+    if t == "-":
+        v, pos = _parse_unary(toks, pos + 1)
+        return -v, pos
+    if t == "+":
+        return _parse_unary(toks, pos + 1)
+    if t == "(":
+        v, pos = _parse_expr(toks, pos + 1, 0)
+        if pos >= len(toks) or toks[pos] != ")":
+            raise ValueError("esperado ')'")
+        return v, pos + 1
+    if t.isdigit():
+        return int(t), pos + 1
+    raise ValueError(f"token inesperado '{t}'")
+
+
+def _apply(op: str, a: int, b: int) -> int:
+    if op == "||":
+        return int(bool(a) or bool(b))
+    if op == "&&":
+        return int(bool(a) and bool(b))
+    if op in ("/", "%"):
+        if b == 0:
+            raise ZeroDivisionError("divisao por zero")
+        q = abs(a) // abs(b)
+        q = q if (a < 0) == (b < 0) else -q
+        return q if op == "/" else a - q * b
+    return {
+        "==": lambda: int(a == b), "!=": lambda: int(a != b),
+        "<": lambda: int(a < b), "<=": lambda: int(a <= b),
+        ">": lambda: int(a > b), ">=": lambda: int(a >= b),
+        "+": lambda: a + b, "-": lambda: a - b, "*": lambda: a * b,
+    }[op]()
+
+
+def _find_guard(tokens: List[Token]) -> Optional[str]:
+    # #ifndef X / #define X ... #endif envolvendo o arquivo inteiro
+    sig = [t for t in tokens if t.type not in ("EOL", "EOF")]
+    if len(sig) < 3 or any(t.type != "DIRECTIVE" for t in (sig[0], sig[1], sig[-1])):
+        return None
+    first = _directive_re.match(sig[0].lex)
+    second = _directive_re.match(sig[1].lex)
+    if not first or not second or first.group(1) != "ifndef" or second.group(1) != "define":
+        return None
+    guard = first.group(2).split()[:1]
+    if not guard or second.group(2).split()[:1] != guard:
+        return None
+    depth = 0
+    for i, t in enumerate(sig):
+        if t.type != "DIRECTIVE":
+            continue
+        d = _directive_re.match(t.lex)
+        kind = d.group(1) if d else None
+        if kind in ("if", "ifdef", "ifndef"):
+            depth += 1
+        elif kind == "endif":
+            depth -= 1
+            if depth == 0 and i != len(sig) - 1:
+                return None
+    return guard[0] if depth == 0 else None
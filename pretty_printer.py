@@ -0,0 +1,397 @@
+import io
+import sys
+from collections import deque
+from typing import Any, Deque, List, Optional, TextIO
+
+from ast_nodes import (
+    ASTNode, Assign, BinOp, Block, Call, Char, For, FunctionDecl, If, Index,
+    Num, Program, Return, Str, Var, VarDecl, While,
+)
+
+
+# Regenera codigo C a partir da AST. A arvore vira um fluxo de comandos de
+# layout (texto, quebra opcional, quebra obrigatoria, inicio/fim de grupo,
+# indentacao) que um formatador no estilo de Oppen consome em tempo linear:
+# cada grupo fica pendente ate fechar ou ate sua largura "plana" passar da
+# margem, e so entao e escrito na saida plano ou quebrado.
+#
+# O lexer emite EOL e o parser so aceita quebras de linha entre instrucoes
+# (inclusive logo apos '{' e antes de '}'), entao as quebras opcionais so
+# aparecem nesses pontos: um bloco de uma instrucao cabe numa linha
+# ("if (n < 2) { return n; }"), blocos maiores sempre quebram, e expressoes
+# nunca sao divididas.
+#
+# Parenteses seguem as precedencias do parser. O menos unario, que o parser
+# guarda como BinOp('-', Num('0'), x), volta a ser escrito como '-x'.
+
+_LINE = 0       # espaco se o grupo couber, senao quebra de linha
+_HARD = 1       # quebra de linha sempre
+_BEGIN = 2
+_END = 3
+_INDENT = 4
+_DEDENT = 5
+
+_P_ASSIGN, _P_UNARY, _P_POSTFIX, _P_ATOM = 0, 7, 8, 9
+
+_BINARY_PREC = {
+    "||": 1, "&&": 2,
+    "==": 3, "!=": 3,
+    "<": 4, "<=": 4, ">": 4, ">=": 4,
+    "+": 5, "-": 5,
+    "*": 6, "/": 6,
+}
+
+# palavras que o lexer nao entrega como ID (parametro sem nome: so o tipo)
+_TYPE_KEYWORDS = ("int", "float", "char")
+
+
+class _Group:
+    __slots__ = ("start", "items")
+
+    def __init__(self, start: int):
+        self.start = start
+        self.items: List[Any] = []
+
+
+class _Layout:
+    """Formatador de Oppen: decide cada grupo olhando so ate a margem."""
+
+    def __init__(self, out: TextIO, width: int, indent: int):
+        self.out = out
+        self.width = width
+        self.step = indent
+        self.pos = 0                    # posicao se tudo que veio ate aqui fosse plano
+        self.col = 0                    # coluna real na saida
+        self.level = 0                  # indentacao corrente
+        self.pending_indent = False     # indentacao so e escrita antes do proximo texto
+        self.pending: Deque[_Group] = deque()
+
+    def feed(self, item: Any):
+        if item == _BEGIN:
+            self.pending.append(_Group(self.pos))
+        elif item == _END:
+            if self.pending:
+                group = self.pending.pop()
+                if self.pending:
+                    self.pending[-1].items.append(group)
+                else:
+                    self._flat(group)
+            # sem grupos pendentes o grupo ja foi escrito quebrado
+        elif item == _HARD:
+            while self.pending:
+                self._break_outermost()
+            self._newline()
+        elif self.pending:
+            self.pending[-1].items.append(item)
+            if isinstance(item, str):
+                self.pos += len(item)
+            elif item == _LINE:
+                self.pos += 1
+            while self.pending and self.pos - self.pending[0].start > self.width - self.col:
+                self._break_outermost()
+        else:
+            self._broken(item)
+
+    def close(self):
+        while self.pending:
+            self._break_outermost()
+
+    def _break_outermost(self):
+        # tudo antes do grupo mais externo ja foi escrito, entao self.col e a
+        # coluna onde ele comeca; os grupos internos ja fechados cabem planos
+        for item in self.pending.popleft().items:
+            if isinstance(item, _Group):
+                self._flat(item)
+            else:
+                self._broken(item)
+
+    def _broken(self, item: Any):
+        if isinstance(item, str):
+            self._text(item)
+        elif item == _LINE:
+            self._newline()
+        elif item == _INDENT:
+            self.level += self.step
+        elif item == _DEDENT:
+            self.level -= self.step
+
+    def _flat(self, group: _Group):
+        stack = [iter(group.items)]
+        while stack:
+            item = next(stack[-1], None)
+            if item is None:
+                stack.pop()
+            elif isinstance(item, _Group):
+                stack.append(iter(item.items))
+            elif isinstance(item, str):
+                self._text(item)
+            elif item == _LINE:
+                self._text(" ")
+            elif item == _INDENT:
+                self.level += self.step
+            elif item == _DEDENT:
+                self.level -= self.step
+
+    def _text(self, text: str):
+        if self.pending_indent:
+            self.out.write(" " * self.level)
+            self.col = self.level
+            self.pending_indent = False
+        self.out.write(text)
+        self.col += len(text)
+
+    def _newline(self):
+        self.out.write("\n")
+        self.col = self.level
+        self.pending_indent = True
+
+
+def _is_unary_minus(node: BinOp) -> bool:
+    return node.op == "-" and isinstance(node.left, Num) and node.left.value == "0"
+
+
+def _prec(node: ASTNode) -> int:
+    if isinstance(node, Assign):
+        return _P_ASSIGN
+    if isinstance(node, BinOp):
+        if _is_unary_minus(node):
+            return _P_UNARY
+        if node.op not in _BINARY_PREC:
+            raise ValueError(f"operador desconhecido: {node.op}")
+        return _BINARY_PREC[node.op]
+    if isinstance(node, (Call, Index)):
+        return _P_POSTFIX
+    if isinstance(node, Num) and node.value.startswith("-"):
+        return _P_UNARY
+    return _P_ATOM
+
+
+def _starts_with_id(node: ASTNode) -> bool:
+    # o for-init so aceita "ID = expr" quando comeca com identificador
+    while True:
+        if isinstance(node, Var):
+            return True
+        if isinstance(node, Call):
+            node = node.callee
+        elif isinstance(node, Index):
+            node = node.target
+        elif isinstance(node, Assign):
+            node = node.target
+        elif isinstance(node, BinOp) and not _is_unary_minus(node):
+            node = node.left
+        else:
+            return False
+
+
+class PrettyPrinter:
+    """
+    Escreve a AST em out. A arvore e percorrida com uma pilha explicita
+    (cadeias longas de BinOp nao estouram a recursao) e cada pedaco vai
+    direto para o formatador, que escreve no arquivo assim que decide.
+    """
+
+    def __init__(self, out: TextIO, width: int = 80, indent: int = 4):
+        self.layout = _Layout(out, width, indent)
+        self.work: List[Any] = []
+
+    def print(self, node: ASTNode):
+        self.work = [("top", node)]
+        feed = self.layout.feed
+        while self.work:
+            item = self.work.pop()
+            if isinstance(item, tuple):
+                self._expand(item)
+            else:
+                feed(item)
+        self.layout.close()
+
+    def _push(self, *items: Any):
+        # itens em ordem de escrita; a pilha os consome de tras para frente
+        self.work.extend(reversed(items))
+
+    def _expand(self, item: tuple):
+        what, node = item[0], item[1]
+        if what == "expr":
+            self._expr(node, item[2])
+        elif what == "stmt":
+            self._stmt(node)
+        elif what == "block":
+            self._block(node, *item[2:])
+        else:
+            self._top(node)
+
+    def _top(self, node: ASTNode):
+        if not isinstance(node, Program):
+            if isinstance(node, (FunctionDecl, VarDecl, Assign, If, While, For, Return, Block)):
+                self._push(("stmt", node), _HARD)
+            else:
+                self._push(("expr", node, _P_ASSIGN), _HARD)
+            return
+        items: List[Any] = []
+        for i, decl in enumerate(node.body):
+            if i and (isinstance(decl, FunctionDecl) or isinstance(node.body[i - 1], FunctionDecl)):
+                items.append(_HARD)     # linha em branco em volta de funcoes
+            items.extend((("stmt", decl), _HARD))
+        self._push(*items)
+
+    def _block(self, block: Optional[Block], grouped: bool = True):
+        # grouped=False: as quebras pertencem ao grupo de quem chamou
+        if block is None or not block.body:
+            self._push("{}")
+            return
+        sep = _LINE if len(block.body) == 1 else _HARD
+        items: List[Any] = ["{", _INDENT]
+        for stmt in block.body:
+            items.extend((sep, ("stmt", stmt)))
+        items.extend((_DEDENT, sep, "}"))
+        if grouped:
+            items = [_BEGIN] + items + [_END]
+        self._push(*items)
+
+    def _stmt(self, node: ASTNode):
+        if isinstance(node, FunctionDecl):
+            # "int f(float)" vira ("int", "float"): o nome e o proprio tipo
+            params = ", ".join(name if name in _TYPE_KEYWORDS else f"{ptype} {name}"
+                               for ptype, name in node.params)
+            self._push(f"{node.ret_type} {node.name}({params}) ", ("block", node.body))
+        elif isinstance(node, VarDecl):
+            if node.init is None:
+                self._push(f"{node.var_type} {node.name};")
+            else:
+                self._push(f"{node.var_type} {node.name} = ", ("expr", node.init, _P_ASSIGN), ";")
+        elif isinstance(node, If):
+            self._if(node)
+        elif isinstance(node, While):
+            self._push("while (", ("expr", node.test, _P_ASSIGN), ") ", ("block", node.body))
+        elif isinstance(node, For):
+            self._for(node)
+        elif isinstance(node, Return):
+            if node.value is None:
+                self._push("return;")
+            else:
+                self._push("return ", ("expr", node.value, _P_ASSIGN), ";")
+        elif isinstance(node, Block):
+            self._block(node)
+        else:
+            self._push(("expr", node, _P_ASSIGN), ";")
+
+    def _if(self, node: If):
+        if node.otherwise is None:
+            self._push("if (", ("expr", node.test, _P_ASSIGN), ") ", ("block", node.then))
+            return
+        # a cadeia if/else if/else e um grupo so: ou todos os ramos cabem
+        # numa linha cada, ou todos quebram
+        items: List[Any] = [_BEGIN]
+        while True:
+            items.extend(("if (", ("expr", node.test, _P_ASSIGN), ") ", ("block", node.then, False)))
+            other = node.otherwise
+            if other is None:
+                break
+            items.append(" else ")
+            if len(other.body) == 1 and isinstance(other.body[0], If):
+                node = other.body[0]
+                continue
+            items.append(("block", other, False))
+            break
+        items.append(_END)
+        self._push(*items)
+
+    def _for(self, node: For):
+        items: List[Any] = ["for ("]
+        init = node.init
+        if isinstance(init, VarDecl):
+            items.append(("stmt", init))
+        elif init is None:
+            items.append(";")
+        elif isinstance(init, Assign) and isinstance(init.target, Var) or not _starts_with_id(init):
+            items.extend((("expr", init, _P_ASSIGN), ";"))
+        else:
+            items.extend(("(", ("expr", init, _P_ASSIGN), ");"))
+        if node.cond is not None:
+            items.extend((" ", ("expr", node.cond, _P_ASSIGN)))
+        items.append(";")
+        if node.step is not None:
+            items.extend((" ", ("expr", node.step, _P_ASSIGN)))
+        items.extend((") ", ("block", node.body)))
+        self._push(*items)
+
+    def _expr(self, node: ASTNode, min_prec: int):
+        prec = _prec(node)
+        if prec < min_prec:
+            self._push("(", ("expr", node, _P_ASSIGN), ")")
+        elif isinstance(node, BinOp):
+            if prec == _P_UNARY:
+                self._push("-", ("expr", node.right, _P_UNARY))
+            else:
+                self._push(("expr", node.left, prec), f" {node.op} ", ("expr", node.right, prec + 1))
+        elif isinstance(node, Assign):
+            self._push(("expr", node.target, _P_POSTFIX), " = ", ("expr", node.value, _P_ASSIGN))
+        elif isinstance(node, Call):
+            items: List[Any] = [("expr", node.callee, _P_POSTFIX), "("]
+            for i, arg in enumerate(node.args):
+                if i:
+                    items.append(", ")
+                items.append(("expr", arg, _P_ASSIGN))
+            items.append(")")
+            self._push(*items)
+        elif isinstance(node, Index):
+            self._push(("expr", node.target, _P_POSTFIX), "[", ("expr", node.index, _P_ASSIGN), "]")
+        elif isinstance(node, Var):
+            self._push(node.name)
+        elif isinstance(node, (Num, Char, Str)):
+            self._push(node.value)
+        else:
+            raise ValueError(f"no sem forma de expressao: {type(node).__name__}")
+
+
+def pretty_print(node: ASTNode, out: TextIO, width: int = 80, indent: int = 4):
+    PrettyPrinter(out, width, indent).print(node)
+
+
+def to_source(node: ASTNode, width: int = 80, indent: int = 4) -> str:
+    buf = io.StringIO()
+    pretty_print(node, buf, width, indent)
+    return buf.getvalue()
+
+
+def main():
+    import argparse
+    from lexer import lex
+    from parser import Parser
+
+    ap = argparse.ArgumentParser(description="Reescreve um programa C a partir da sua AST")
+    ap.add_argument("file")
+    ap.add_argument("-w", "--width", type=int, default=80)
+    ap.add_argument("--indent", type=int, default=4)
+    ap.add_argument("-o", "--output", help="arquivo de saida (padrao: stdout)")
+    ap.add_argument("--check", action="store_true",
+                    help="confere que imprimir e analisar de novo reproduz a mesma AST")
+    args = ap.parse_args()
+
+    with open(args.file, "r", encoding="utf-8") as f:
+        code = f.read()
+    tokens, lex_errors = lex(code)
+    if lex_errors:
+        print("Erro lexico:", lex_errors[0], file=sys.stderr)
+        sys.exit(1)
+    program, errors = Parser(tokens).parse_program()
+    if program is None:
+        print("Erro sintatico:", errors[0], file=sys.stderr)
+        sys.exit(1)
+
+    if args.check:
+        again, errors = Parser(lex(to_source(program, args.width, args.indent))[0]).parse_program()
+        if again != program:
+            print("A AST reimpressa difere da original", *errors, file=sys.stderr)
+            sys.exit(1)
+        print("ok", file=sys.stderr)
+        return
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as out:
+            pretty_print(program, out, args.width, args.indent)
+    else:
+        pretty_print(program, sys.stdout, args.width, args.indent)
+
+
+if __name__ == "__main__":
+    main()
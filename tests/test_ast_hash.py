@@ -0,0 +1,53 @@
+from ast_hash import HashConsTable, diff_trees, structural_hash
+from lexer import lex
+from parser import Parser
+
+
+def _parse(code):
+    program, errors = Parser(lex(code)[0]).parse_program()
+    assert not errors
+    return program
+
+
+def test_intern_shares_identical_subtrees():
+    program = _parse("int f() { return a * b + a * b; }\n")
+    table = HashConsTable()
+    program = table.intern(program)
+    expr = program.body[0].body.body[0].value
+    assert expr.left is expr.right
+    assert table.hits == 1
+
+
+def test_intern_keeps_first_occurrence_across_trees():
+    table = HashConsTable()
+    first = table.intern(_parse("int f() { return x + 1; }\n"))
+    second = table.intern(_parse("int g() { return x + 1; }\n"))
+    assert second.body[0].body.body[0].value is first.body[0].body.body[0].value
+
+
+def test_deep_chain_does_not_recurse():
+    chain = " + ".join(["1"] * 3000)
+    new = _parse(f"int f() {{ return {chain} + 2; }}\n")
+    old = _parse(f"int f() {{ return {chain} + 1; }}\n")
+    table = HashConsTable()
+    interned = table.intern(old)
+    assert table.misses == 3000 + 5 and table.hits == 3000  # um Num canonico
+    assert structural_hash(interned) == structural_hash(_parse(f"int f() {{ return {chain} + 1; }}\n"))
+    changes = diff_trees(old, new)
+    assert [c.path for c in changes] == ["body[0].body.body[0].value.right"]
+
+
+def test_diff_reports_changes_in_tree_order():
+    old = _parse("int f() { a = 1; b = 2; c = 3; }\n")
+    new = _parse("int f() { a = 5; b = 2; c = 6; d = 4; }\n")
+    changes = [str(c) for c in diff_trees(old, new)]
+    assert changes == ["body[0].body.body[0].value: alterado", "body[0].body.body[2].value: alterado",
+                       "body[0].body.body[3]: adicionado"]
+
+
+def test_diff_pairs_overlap_of_unequal_replacements():
+    old = _parse("int f() { a = 1; b = 2; c = 3; }\n")
+    new = _parse("int f() { a = 7; }\n")
+    changes = [str(c) for c in diff_trees(old, new)]
+    assert changes == ["body[0].body.body[0].value: alterado", "body[0].body.body[1]: removido",
+                       "body[0].body.body[2]: removido"]
@@ -0,0 +1,81 @@
+import os
+
+import pytest
+
+import ast_index
+from ast_index import ASTIndex, PatternError, parse_pattern
+
+
+def _write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def index(tmp_path):
+    with ASTIndex(str(tmp_path / "index.sqlite")) as idx:
+        yield idx
+
+
+@pytest.mark.parametrize("op", ["<=", ">=", "==", "!=", "&&", "||", "<", "-"])
+def test_unquoted_operators(op):
+    assert parse_pattern(f"BinOp(op={op})").attrs == [("op", op)]
+    assert parse_pattern(f"BinOp(op='{op}')").attrs == [("op", op)]
+
+
+def test_key_separator_before_double_equal():
+    assert parse_pattern("BinOp(op===)").attrs == [("op", "==")]
+    with pytest.raises(PatternError):
+        parse_pattern("BinOp(op=<=")
+
+
+def test_query_with_unquoted_le(tmp_path, index):
+    src = _write(tmp_path, "a.c", "int f(int n) {\n    while (n <= 3) {\n        n = n + 1;\n    }\n    return n;\n}\n")
+    index.update([src])
+    matches = index.query("While(test=BinOp(op=<=))")
+    assert [(m.kind, m.line) for m in matches] == [("While", 2)]
+
+
+def test_mtime_only_change_is_not_reparsed(tmp_path, index, monkeypatch):
+    src = _write(tmp_path, "a.c", "int f() { return 1; }\n")
+    assert index.update([src]).indexed == 1
+    st = os.stat(src)
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("arquivo reanalisado")
+
+    monkeypatch.setattr(ast_index.Preprocessor, "preprocess", fail)
+    stats = index.update([src])
+    assert (stats.indexed, stats.unchanged) == (0, 1)
+
+
+def test_deleted_file_is_removed(tmp_path, index):
+    src = _write(tmp_path, "a.c", "int f() { return 1; }\n")
+    index.update([src])
+    os.remove(src)
+    stats = index.update([src])
+    assert stats.removed == 1 and stats.missing == [os.path.abspath(src)]
+    assert index.query("FunctionDecl") == []
+
+
+def test_includes_and_macros_are_preprocessed(tmp_path, index):
+    header = _write(tmp_path, "h.h", "int helper(int a) { return a; }\n")
+    src = _write(tmp_path, "a.c", '#include "h.h"\n#define N 3\nint f() { return helper(N); }\n')
+    stats = index.update([src])
+    assert (stats.indexed, stats.failed) == (1, 0)
+    assert [(m.path, m.name, m.line) for m in index.query("FunctionDecl")] == [
+        (src, "f", 3), (header, "helper", 1)]
+    assert [m.line for m in index.query("Call(name=helper, args=Num(value=3))")] == [3]
+
+
+def test_header_change_reindexes_includers(tmp_path, index):
+    _write(tmp_path, "h.h", "#define N 3\n")
+    src = _write(tmp_path, "a.c", '#include "h.h"\nint f() { return N; }\n')
+    index.update([src])
+    assert index.update([src]).unchanged == 1
+    _write(tmp_path, "h.h", "#define N 4\n")
+    stats = index.update([src])
+    assert stats.indexed == 1
+    assert [m.line for m in index.query("Return(value=Num(value=4))")] == [2]
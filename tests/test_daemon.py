@@ -0,0 +1,117 @@
+import json
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("matplotlib")  # daemon.py carrega o visualizador
+
+from client import Client
+from lexer import lex
+from parser import Parser
+import daemon
+from ast_nodes import node_to_dict
+from daemon import Service, _is_shutdown, _serve_stream, serve_unix
+
+
+def test_stdio_shutdown_stops_before_next_line():
+    def reader():
+        yield json.dumps({"jsonrpc": "2.0", "id": 1, "method": "stats"}) + "\n"
+        yield json.dumps({"jsonrpc": "2.0", "id": 2, "method": "shutdown"}) + "\n"
+        raise AssertionError("leu alem do shutdown")
+
+    out = []
+    service = Service()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        _serve_stream(service, pool, reader(), out.append)
+    ids = sorted(json.loads(line)["id"] for line in out)
+    assert ids == [1, 2]
+
+
+def test_refuses_live_socket(tmp_path):
+    path = str(tmp_path / "d.sock")
+    live = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    live.bind(path)
+    live.listen()
+    try:
+        with pytest.raises(OSError):
+            serve_unix(Service(), path, 1)
+        assert os.path.exists(path)
+    finally:
+        live.close()
+
+
+def test_replaces_stale_socket(tmp_path):
+    path = str(tmp_path / "d.sock")
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()  # o arquivo fica, ninguem ouve
+    service = Service()
+    thread = threading.Thread(target=serve_unix, args=(service, path, 1), daemon=True)
+    thread.start()
+    for _ in range(100):
+        try:
+            client = Client(path)
+            break
+        except OSError:
+            threading.Event().wait(0.05)
+    assert client.call("stats")["entries"] == 0
+    client.call("shutdown")
+    client.close()
+    thread.join(5)
+    assert not thread.is_alive()
+
+
+def test_check_preprocesses_includes_and_macros(tmp_path):
+    (tmp_path / "h.h").write_text("#define N 3\nint helper(int a) { return a; }\n", encoding="utf-8")
+    path = str(tmp_path / "a.c")
+    code = '#include "h.h"\nint f() { return helper(N); }\n'
+    service = Service()
+    result = json.loads(service.rpc_check({"code": code, "path": path}))
+    assert result["ok"] and not result["lex_errors"]
+    ast = json.loads(service.rpc_parse({"code": code, "path": path}))["ast"]
+    assert [d["name"] for d in ast["body"]] == ["helper", "f"]
+
+
+def test_header_change_invalidates_cache(tmp_path):
+    header = tmp_path / "h.h"
+    header.write_text("int h;\n", encoding="utf-8")
+    path = str(tmp_path / "a.c")
+    code = '#include "h.h"\nint f() { return h; }\n'
+    service = Service()
+    assert json.loads(service.rpc_check({"code": code, "path": path}))["ok"]
+    assert json.loads(service.rpc_check({"code": code, "path": path}))["ok"]
+    assert service.hits == 1
+    header.write_text("int h(\n", encoding="utf-8")
+    result = json.loads(service.rpc_check({"code": code, "path": path}))
+    assert not result["ok"]
+    assert result["syntax_errors"][0]["file"] == str(header)
+
+
+def test_shutdown_is_decided_by_method():
+    assert _is_shutdown('{"jsonrpc":"2.0","id":1,"method":"shutdown"}\n')
+    assert not _is_shutdown(json.dumps({"id": 1, "method": "parse", "params": {"path": "shutdown"}}))
+    assert not _is_shutdown('{"method": "shutdown"')
+
+
+def test_parse_serializes_deep_trees():
+    code = "int main() { return 1" + " + 1" * 3000 + "; }\n"
+    encoded = Service().rpc_parse({"code": code})
+    assert node_to_dict(Parser(lex(code)[0]).parse_program()[0])["kind"] == "Program"
+    small = "int f(int a) { return a * 2; }\n"
+    assert json.loads(Service().rpc_parse({"code": small}))["ast"] == node_to_dict(Parser(lex(small)[0]).parse_program()[0])
+    assert encoded.startswith('{"ok": true') and encoded.count('"BinOp"') == 3000
+
+
+def test_render_hit_refreshes_lru(tmp_path, monkeypatch):
+    monkeypatch.setattr(daemon, "draw_tree", lambda program, out: open(out, "wb").close())
+    service = Service(cache_size=2)
+    a = {"code": "int a() { return 1; }\n", "output": str(tmp_path / "a.png")}
+    b = {"code": "int b() { return 2; }\n", "output": str(tmp_path / "b.png")}
+    service.rpc_render(a)
+    service.rpc_render(b)
+    service.rpc_render(a)  # acerto: a vira o mais recente
+    service.rpc_lex({"code": "int c;\n"})  # expulsa b
+    assert [key[0] for key in service.cache] == ["render:" + a["output"], "lex"]
@@ -0,0 +1,51 @@
+import pytest
+
+from cfg import build_cfgs
+from dataflow import analyze_program
+from lexer import lex
+from parser import Parser
+
+
+def _messages(code):
+    program, errors = Parser(lex(code)[0]).parse_program()
+    assert not errors, errors
+    return [(w.message, w.line) for w in analyze_program(program)]
+
+
+def test_clean_function_has_no_warnings():
+    assert _messages("int f(int n) {\n    int s = 0;\n    while (n > 0) {\n        s = s + n;\n"
+                     "        n = n - 1;\n    }\n    return s;\n}\n") == []
+
+
+@pytest.mark.parametrize("code,expected", [
+    ("int f() {\n    int x;\n    return x;\n}\n", ("variavel 'x' usada sem inicializacao", 3)),
+    ("int f(int c) {\n    int x;\n    if (c) {\n        x = 1;\n    }\n    return x;\n}\n",
+     ("variavel 'x' pode ser usada sem inicializacao", 6)),
+    ("int f() {\n    int y;\n    return 0;\n}\n", ("variavel 'y' declarada e nunca usada", 2)),
+    ("int f() {\n    int x = 1;\n    x = 2;\n    return x;\n}\n", ("valor atribuido a 'x' nunca e usado", 2)),
+    ("int f() {\n    return 1;\n    return 2;\n}\n", ("codigo inalcancavel", 3)),
+    ("int f() {\n    return z;\n}\n", ("variavel 'z' nao declarada", 2)),
+])
+def test_warnings(code, expected):
+    assert expected in _messages(code)
+
+
+def test_globals_are_not_undeclared():
+    assert _messages("int g;\nint f() {\n    return g;\n}\n") == []
+
+
+def test_loop_back_edge_keeps_value_live():
+    code = "int f() {\n    int i = 0;\n    while (i < 3) {\n        i = i + 1;\n    }\n    return 0;\n}\n"
+    assert [m for m in _messages(code) if "nunca e usado" in m[0]] == []
+
+
+def test_one_cfg_per_function():
+    program, _ = Parser(lex("int f() { return 0; }\nint g() { return 1; }\n")[0]).parse_program()
+    assert len(build_cfgs(program)) == 2
+
+
+def test_long_expression_chain():
+    chain = " + ".join(["x"] * 3000)
+    messages = _messages("int f() {\n    int x;\n    int y = " + chain + ";\n    return y;\n}\n")
+    # um aviso por uso, como em cadeias curtas
+    assert messages == [("variavel 'x' usada sem inicializacao", 3)] * 3000
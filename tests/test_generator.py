@@ -0,0 +1,25 @@
+import pytest
+
+from generator import GenConfig, generate_program
+from lexer import lex
+from parser import Parser
+
+
+def test_same_seed_same_program():
+    assert generate_program(GenConfig(seed=3)) == generate_program(GenConfig(seed=3))
+    assert generate_program(GenConfig(seed=3)) != generate_program(GenConfig(seed=4))
+
+
+@pytest.mark.parametrize("cfg", [
+    GenConfig(functions=1, depth=0, stmts=1),
+    GenConfig(functions=20, depth=3, expr_len=8),
+    GenConfig(functions=5, calls=False, indexing=False),
+])
+def test_generated_programs_parse(cfg):
+    for seed in range(10):
+        cfg.seed = seed
+        tokens, lex_errors = lex(generate_program(cfg))
+        assert not lex_errors
+        program, errors = Parser(tokens).parse_program()
+        assert not errors
+        assert sum(type(d).__name__ == "FunctionDecl" for d in program.body) >= cfg.functions
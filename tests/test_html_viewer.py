@@ -0,0 +1,58 @@
+import json
+import os
+
+import pytest
+
+pytest.importorskip("matplotlib")  # html_viewer usa os rotulos do visualizador
+
+from html_viewer import export_html
+from lexer import lex
+from parser import Parser
+from visualizer import subtree_size
+
+
+def _chunks(out_dir):
+    records = []
+    names = sorted(os.listdir(os.path.join(out_dir, "chunks")), key=lambda n: int(n[1:-3]))
+    for name in names:
+        with open(os.path.join(out_dir, "chunks", name), encoding="utf-8") as f:
+            text = f.read()
+        records.extend(json.loads(text[text.index(",") + 1:text.rindex(")")]))
+    return records
+
+
+def test_export_writes_every_node_once(tmp_path):
+    code = "int f(int a) {\n    while (a < 10) {\n        a = a + 1;\n    }\n    return a;\n}\n"
+    program, _ = Parser(lex(code)[0]).parse_program()
+    out = str(tmp_path / "viewer")
+    index = export_html(program, out, title="<f>", chunk_size=3)
+    page = open(index, encoding="utf-8").read()
+    assert "&lt;f&gt;" in page
+    records = _chunks(out)
+    ids = sorted(r[0] for group in records for r in group)
+    assert ids == list(range(1, subtree_size(program)))
+    assert len(os.listdir(os.path.join(out, "chunks"))) > 1
+
+
+def test_sources_are_embedded(tmp_path):
+    from preprocessor import Preprocessor
+
+    (tmp_path / "h.h").write_text("int h() { return 2; }\n", encoding="utf-8")
+    src = tmp_path / "a.c"
+    src.write_text('#include "h.h"\nint f() { return 1; }\n', encoding="utf-8")
+    program, _ = Parser(Preprocessor().preprocess_file(str(src))[0]).parse_program()
+    out = str(tmp_path / "viewer")
+    export_html(program, out)
+    sources = open(os.path.join(out, "sources.js"), encoding="utf-8").read()
+    assert "return 1;" in sources and "return 2;" in sources
+
+
+def test_root_file_is_embedded(tmp_path):
+    src = tmp_path / "a.c"
+    src.write_text("int f() { return 1; }\n", encoding="utf-8")
+    program, _ = Parser(lex(src.read_text())[0]).parse_program()
+    program.file = str(src)
+    out = str(tmp_path / "viewer")
+    export_html(program, out)
+    sources = open(os.path.join(out, "sources.js"), encoding="utf-8").read()
+    assert "return 1;" in sources
@@ -0,0 +1,83 @@
+import hashlib
+import os
+import random
+
+import pytest
+
+import ll1_tables
+from ast_nodes import Token
+from generator import GenConfig, generate_program
+from lexer import lex
+from ll1_gen import build_table, generate, parse_grammar
+from ll1_parser import LL1Parser, compare_with_parser
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_tables_match_grammar():
+    with open(os.path.join(ROOT, "c_grammar.ll1"), "rb") as f:
+        assert hashlib.sha256(f.read()).hexdigest() == ll1_tables.GRAMMAR_SHA256
+
+
+@pytest.mark.parametrize("params", ["", "int", "a", "int a", "x y", "int a, b", "float, char c",
+                                    "int a,", ",", "int a, float b, c"])
+def test_param_forms_match_parser(params):
+    tokens = lex(f"int f({params}) {{ return 0; }}\n")[0]
+    program, errors = LL1Parser(tokens).parse_program()
+    assert not errors
+    assert compare_with_parser(tokens) is None
+
+
+@pytest.mark.parametrize("code", [
+    "int f() { x = 1 2; }\n",
+    "int f() { return 1 +; }\n",
+    "int (x);\n",
+    "int f(int a b) {}\n",
+    "int f() { a[0] = 1; }\n",
+    "int f() { for (i < 3;;) x; }\n",
+    "int f() {\n    if (x)\n    {\n    }\n}\n",
+    "int f() { g(1,); }\n",
+])
+def test_first_error_matches_parser(code):
+    tokens = lex(code)[0]
+    program, errors = LL1Parser(tokens).parse_program()
+    assert program is None
+    assert "_" not in errors[0].message.split("encontrado")[0]  # sem nomes de nao terminais
+    assert compare_with_parser(tokens) is None
+
+
+@pytest.mark.parametrize("name", sorted(f for f in os.listdir(os.path.join(ROOT, "examples")) if f.endswith(".c")))
+def test_examples_match_parser(name):
+    with open(os.path.join(ROOT, "examples", name), encoding="utf-8") as f:
+        tokens, lex_errors = lex(f.read())
+    if lex_errors:
+        pytest.skip("erro lexico")
+    assert compare_with_parser(tokens) is None
+
+
+def test_generated_programs_and_mutants_match_parser():
+    rnd = random.Random(0)
+    kinds = ["ID", "NUM", "SEMI", "LPAREN", "RPAREN", "LBRACE", "RBRACE", "COMMA", "EQUAL",
+             "PLUS", "INT", "FLOAT", "IF", "ELSE", "EOL", "LBRACK"]
+    for seed in range(60):
+        tokens = lex(generate_program(GenConfig(functions=3, seed=seed)))[0]
+        assert compare_with_parser(tokens) is None
+        for _ in range(10):
+            mutant = list(tokens)
+            k = rnd.randrange(len(mutant) - 1)
+            kind = rnd.choice(kinds)
+            mutant[k:k + rnd.randint(0, 1)] = [Token(kind, kind.lower(), mutant[k].line, mutant[k].col)]
+            assert compare_with_parser(mutant) is None
+
+
+def test_unresolved_conflict_is_reported():
+    g = parse_grammar("s : a EOF ;\na : ID | ID NUM ;\n")
+    _, conflicts, _, _ = build_table(g)
+    assert [(c.rule, c.token, c.resolved) for c in conflicts] == [("a", "ID", False)]
+
+
+def test_prefer_resolves_conflict():
+    g = parse_grammar("%prefer e\ns : IF ID e EOF ;\ne : ELSE ID | ;\nt : IF ID e ELSE ;\n")
+    source, conflicts = generate(g)
+    assert [(c.rule, c.token, c.resolved) for c in conflicts] == [("e", "ELSE", True)]
+    assert "TABLE" in source
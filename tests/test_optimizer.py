@@ -0,0 +1,76 @@
+import pytest
+
+from ast_hash import invalidate, structural_hash
+
+from interpreter import run_program
+from lexer import lex
+from optimizer import optimize_loops, verify
+from parser import Parser
+from pretty_printer import to_source
+
+
+def _parse(code):
+    program, errors = Parser(lex(code)[0]).parse_program()
+    assert not errors, errors
+    return program
+
+
+LOOPS = """int main() {
+    int i;
+    int s = 0;
+    int k = 7;
+    for (i = 0; i < 20; i = i + 1) {
+        s = s + i * 4 + k * k;
+    }
+    return s;
+}
+"""
+
+
+def test_licm_and_strength_reduction_keep_result():
+    program = _parse(LOOPS)
+    optimized, stats = optimize_loops(program)
+    assert stats.loops == 1
+    assert stats.hoisted_exprs >= 1 and stats.reduced_multiplies >= 1
+    assert run_program(optimized) == run_program(program)
+
+
+def test_unrolling_small_constant_loop():
+    program = _parse("int main() {\n    int i;\n    int s = 0;\n    for (i = 0; i < 4; i = i + 1) {\n"
+                     "        s = s + i;\n    }\n    return s;\n}\n")
+    optimized, stats = optimize_loops(program, unroll=True)
+    assert stats.unrolled == 1 and stats.unrolled_iterations == 4
+    assert run_program(optimized) == 6
+
+
+def test_input_program_is_not_modified():
+    program = _parse(LOOPS)
+    before = to_source(program)
+    optimize_loops(program, unroll=True)
+    assert to_source(program) == before
+
+
+def test_optimized_output_reparses():
+    optimized, _ = optimize_loops(_parse(LOOPS), unroll=True)
+    again = _parse(to_source(optimized))
+    assert run_program(again) == run_program(_parse(LOOPS))
+
+
+@pytest.mark.parametrize("unroll", [False, True])
+def test_differential_verification(unroll):
+    stats, failures = verify(programs=8, seed=0, unroll=unroll, functions=3)
+    assert failures == []
+    assert stats.loops > 0
+
+
+def test_deep_expression_does_not_hit_recursion_limit():
+    chain = " + ".join(["x"] * 3000)
+    program = _parse("int main() {\n    int i;\n    int x = 1;\n    int s = 0;\n"
+                     "    for (i = 0; i < 4; i = i + 1) {\n        s = s + " + chain + ";\n    }\n"
+                     "    return s;\n}\n")
+    before = structural_hash(program)
+    optimized, stats = optimize_loops(program, unroll=True)
+    assert stats.loops == 1
+    assert optimized is not program
+    invalidate(program)
+    assert structural_hash(program) == before
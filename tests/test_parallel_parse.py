@@ -0,0 +1,72 @@
+import pytest
+
+import parser as parser_module
+from generator import GenConfig, generate_program
+from lexer import lex
+from ll1_parser import same_positions
+from parser import Parser, split_top_level
+
+
+@pytest.fixture
+def cpus(monkeypatch):
+    # o modo paralelo se limita as CPUs da maquina; os testes forcam o pool
+    monkeypatch.setattr(parser_module, "usable_cpus", lambda: 4)
+
+
+def test_split_keeps_else_with_its_if():
+    tokens = lex("int x;\nif (x) y = 1; else y = 2;\nint f() { return 0; }\n")[0]
+    spans = split_top_level(tokens)
+    assert len(spans) == 3
+    a, b = spans[1]
+    assert [t.type for t in tokens[a:b]].count("ELSE") == 1
+
+
+def test_unbalanced_delimiters_fall_back_to_serial():
+    assert split_top_level(lex("int f() { return 0;\n")[0]) is None
+
+
+def test_parallel_matches_serial(cpus):
+    tokens = lex(generate_program(GenConfig(functions=40, seed=1)))[0]
+    serial, _ = Parser(tokens).parse_program()
+    parallel, errors = Parser(tokens).parse_program_parallel(workers=2, min_tokens=0)
+    assert not errors
+    assert parallel == serial
+    assert same_positions(parallel, serial)
+
+
+def test_parallel_reports_first_error_like_serial(cpus):
+    code = generate_program(GenConfig(functions=20, seed=2))
+    lines = code.splitlines()
+    lines[len(lines) // 2] += " )"
+    tokens = lex("\n".join(lines) + "\n")[0]
+    serial, serial_errors = Parser(tokens).parse_program()
+    parallel, errors = Parser(tokens).parse_program_parallel(workers=2, min_tokens=0)
+    assert serial is None and parallel is None
+    assert errors == serial_errors
+
+
+def test_parallel_handles_long_expression(cpus):
+    chain = " + ".join(["x"] * 1500)
+    code = "int x;\nint f() { return " + chain + "; }\nint g() { return x; }\n"
+    tokens = lex(code)[0]
+    serial, _ = Parser(tokens).parse_program()
+    parallel, errors = Parser(tokens).parse_program_parallel(workers=2, min_tokens=0)
+    assert not errors
+    assert len(parallel.body) == 3 and parallel.body[1].name == "f"
+    assert same_positions(parallel, serial)
+
+
+def test_pack_round_trip_keeps_positions():
+    tokens = lex("int f(int a) {\n    if (a) a = 1; else a = 2;\n    return g(a, \"s\")[0];\n}\n")[0]
+    program, _ = Parser(tokens).parse_program()
+    body = parser_module._unpack_nodes(parser_module._pack_nodes(program.body))
+    assert body == program.body
+    assert same_positions(parser_module.Program(body), parser_module.Program(program.body))
+
+
+def test_single_cpu_parses_serially(monkeypatch):
+    monkeypatch.setattr(parser_module, "usable_cpus", lambda: 1)
+    monkeypatch.setattr(parser_module, "ProcessPoolExecutor", None)
+    tokens = lex(generate_program(GenConfig(functions=10, seed=3)))[0]
+    program, errors = Parser(tokens).parse_program_parallel(workers=4, min_tokens=0)
+    assert not errors and program == Parser(tokens).parse_program()[0]
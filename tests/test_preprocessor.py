@@ -0,0 +1,69 @@
+from preprocessor import Preprocessor
+
+
+def _write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_include_guard_is_detected(tmp_path):
+    header = _write(tmp_path, "h.h", "#ifndef H_H\n#define H_H\nint h;\n#endif\n")
+    assert Preprocessor().load(header).guard == "H_H"
+
+
+def test_guard_requires_endif_at_end(tmp_path):
+    header = _write(tmp_path, "h.h", "#ifndef H_H\n#define H_H\n#endif\nint h;\n")
+    assert Preprocessor().load(header).guard is None
+
+
+def test_guarded_header_included_twice_is_processed_once(tmp_path):
+    _write(tmp_path, "h.h", "#ifndef H_H\n#define H_H\nint h;\n#endif\n")
+    main = _write(tmp_path, "main.c", '#include "h.h"\n#include "h.h"\nint main() { return h; }\n')
+    pp = Preprocessor()
+    processed = []
+    original = pp._process
+
+    def spy(src, unit):
+        processed.append(src.path)
+        return original(src, unit)
+
+    pp._process = spy
+    tokens, errors = pp.preprocess_file(main)
+    assert not errors
+    assert sum(p.endswith("h.h") for p in processed) == 1
+    assert pp.misses == 2 and pp.hits == 1
+    assert [t.lex for t in tokens if t.type == "ID"].count("h") == 2  # declaracao + uso
+
+
+def test_syntax_error_in_header_reports_header_file(tmp_path):
+    from parser import Parser
+
+    header = _write(tmp_path, "bad.h", "int broken(\n")
+    main = _write(tmp_path, "main.c", '#include "bad.h"\nint main() { return 0; }\n')
+    tokens, errors = Preprocessor().preprocess_file(main)
+    assert not errors
+    program, errors = Parser(tokens).parse_program()
+    assert program is None
+    err = errors[0]
+    assert err.file == header and err.line == 1
+    assert str(err).endswith(f"@ {header}:{err.line}:{err.col}")
+
+
+def _expanded(code):
+    tokens, errors = Preprocessor().preprocess(code)
+    assert not errors, errors
+    return " ".join(t.lex for t in tokens if t.type not in ("EOL", "EOF"))
+
+
+def test_macro_result_is_rescanned_with_following_tokens():
+    assert _expanded("#define f(x) (x+1)\n#define g f\nint y = g(1);\n") == "int y = ( 1 + 1 ) ;"
+
+
+def test_rescan_follows_c11_example():
+    # C11 6.10.3.4 EXAMPLE: f(2)(9) vira 2*9*g
+    assert _expanded("#define f(a) a*g\n#define g(a) f(a)\nint y = f(2)(9);\n") == "int y = 2 * 9 * g ;"
+
+
+def test_self_reference_is_not_expanded_again():
+    assert _expanded("#define A A B\n#define B A\nint A;\n") == "int A A ;"
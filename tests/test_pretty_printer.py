@@ -0,0 +1,36 @@
+import pytest
+
+from lexer import lex
+from parser import Parser
+from pretty_printer import to_source
+
+
+def _parse(code):
+    program, errors = Parser(lex(code)[0]).parse_program()
+    assert not errors, errors
+    return program
+
+
+@pytest.mark.parametrize("params", ["int", "float", "char", "a", "int a, b", "float x, char", "int a,"])
+def test_bare_params_round_trip(params):
+    program = _parse(f"int f({params}) {{ return 0; }}\n")
+    again = _parse(to_source(program))
+    assert again == program
+
+
+def test_round_trip_keeps_layout_stable():
+    code = ("int g(int a, float b) {\n    if (a < b) {\n        return -a;\n    } else if (a == b) {\n"
+            "        return a * (b + 1);\n    } else return 0;\n}\n")
+    program = _parse(code)
+    text = to_source(program)
+    assert to_source(_parse(text)) == text
+    assert _parse(text) == program
+
+
+@pytest.mark.parametrize("width", [20, 40, 80])
+def test_generated_programs_round_trip(width):
+    from generator import GenConfig, generate_program
+
+    for seed in range(10):
+        program = _parse(generate_program(GenConfig(functions=3, seed=seed)))
+        assert _parse(to_source(program, width)) == program
@@ -0,0 +1,94 @@
+import pytest
+
+from generator import GenConfig, generate_program
+from interpreter import ExecutionError, Interpreter, run_program
+from lexer import lex
+from parser import Parser
+from transpiler import TranspileError, compile_program, compile_source
+
+
+def _parse(code):
+    program, errors = Parser(lex(code)[0]).parse_program()
+    assert not errors, errors
+    return program
+
+
+def _both(code, *args, externs=None):
+    program = _parse(code)
+    return run_program(program, "main", *args, externs=externs), compile_program(program).run("main", *args, externs=externs)
+
+
+@pytest.mark.parametrize("code,expected", [
+    ("int main() { return -7 / 2; }\n", -3),
+    ("int main() { return 7 / -2; }\n", -3),
+    ("float main() { float x = 7; return x / 2; }\n", 3.5),
+    ("int main() { float x = 7; return x / 2; }\n", 3),
+    ("int main() { int x = 2.9; return x; }\n", 2),
+    ("int main() { int i; int s = 0; for (i = 0; i < 10; i = i + 1) { s = s + i; } return s; }\n", 45),
+    ("int sq(int a) { return a * a; }\nint main() { return sq(sq(3)); }\n", 81),
+    ("int g;\nint bump() { g = g + 1; return g; }\nint main() { bump(); bump(); return g; }\n", 2),
+    ("int main() { if (1 && 0 || 2 > 1) return 1; else return 0; }\n", 1),
+])
+def test_interpreter_and_transpiler_agree(code, expected):
+    assert _both(code) == (expected, expected)
+
+
+def test_division_by_zero_is_execution_error():
+    program = _parse("int main() { int z = 0; return 1 / z; }\n")
+    with pytest.raises(ExecutionError):
+        run_program(program)
+    with pytest.raises(ExecutionError):
+        compile_program(program).run()
+
+
+def test_externs():
+    code = "int main() { return twice(21); }\n"
+    assert _both(code, externs={"twice": lambda x: 2 * x}) == (42, 42)
+    with pytest.raises(ExecutionError):
+        compile_source(code).run()
+
+
+def test_syntax_error_is_transpile_error():
+    with pytest.raises(TranspileError):
+        compile_source("int main( { }\n")
+
+
+def test_generated_programs_agree():
+    for seed in range(15):
+        program = _parse(generate_program(GenConfig(functions=4, depth=3, indexing=False, seed=seed)))
+        try:
+            expected = run_program(program)
+        except ExecutionError as e:
+            expected = "erro: " + e.message
+        try:
+            got = compile_program(program).run()
+        except ExecutionError as e:
+            got = "erro: " + e.message
+        assert got == expected, seed
+
+
+def test_long_expression_chains():
+    terms = " + 1" * 3000 + " / 1" * 300 + " * 2" * 200
+    code = f"int main() {{ int x; x = 1{terms}; if (x > 0 && 1{' < 2' * 50}) return x - 1{' - 1' * 2000}; return 0; }}\n"
+    expected = 3000 + 2 ** 200 - 2001
+    assert _both(code) == (expected, expected)
+    assert "_chain(" in compile_source(code).source
+
+
+def test_functions_defined_before_top_level_statements():
+    code = "int x;\nx = f();\nint f() { return 42; }\nint main() { return x; }\n"
+    assert _both(code) == (42, 42)
+
+
+def test_runtime_failures_are_execution_errors():
+    deep = _parse("int r(int n) { if (n == 0) return 0; return 1 + r(n - 1); }\nint main() { return r(100000); }\n")
+    with pytest.raises(ExecutionError, match="recursao"):
+        run_program(deep)
+    with pytest.raises(ExecutionError, match="recursao"):
+        compile_program(deep).run()
+    # f roda antes de `int y;` ser executada
+    late = _parse("int x;\nx = f();\nint y;\nint f() { return y; }\n")
+    with pytest.raises(ExecutionError, match="variavel nao declarada: y"):
+        Interpreter(late)
+    with pytest.raises(ExecutionError, match="variavel nao declarada: y"):
+        compile_program(late).instantiate()
@@ -0,0 +1,85 @@
+import pytest
+
+pytest.importorskip("matplotlib")
+
+from generator import GenConfig, generate_program
+from lexer import lex
+from parser import Parser
+import visualizer
+from visualizer import collapse, draw_function_shards, draw_overview, subtree_size
+
+
+def _program(functions=30):
+    program, errors = Parser(lex(generate_program(GenConfig(functions=functions, seed=0)))[0]).parse_program()
+    assert not errors
+    return program
+
+
+def _count(view):
+    total, stack = 0, [view]
+    while stack:
+        v = stack.pop()
+        total += 1
+        stack.extend(v.kids)
+    return total
+
+
+def _depth(view):
+    depth, level = 0, [view]
+    while level:
+        depth += 1
+        level = [c for v in level for c in v.kids]
+    return depth
+
+
+@pytest.mark.parametrize("max_nodes,max_depth", [(20, 3), (150, 6), (400, 10)])
+def test_collapse_respects_budget(max_nodes, max_depth):
+    program = _program()
+    view = collapse(program, max_depth, max_nodes)
+    assert _count(view) <= max_nodes
+    assert _depth(view) <= max_depth + 1
+
+
+def test_collapsed_summaries_count_hidden_nodes():
+    program = _program(40)
+    view = collapse(program, max_depth=1, max_nodes=5, max_children=3)
+    assert view.kids[-1].label.startswith("... +")
+    assert f"({subtree_size(program.body[0])} nos)" in view.kids[0].label
+
+
+def test_small_tree_is_not_collapsed():
+    program, _ = Parser(lex("int f() { return 1; }\n")[0]).parse_program()
+    assert _count(collapse(program)) == subtree_size(program)
+
+
+def _fake_draw(calls):
+    # grava o rotulo da raiz no lugar da imagem; processos filhos herdam o
+    # patch pelo fork
+    def draw(view, filename, figsize=(10, 7), dpi=160):
+        calls.append((view, figsize))
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(view.label)
+    return draw
+
+
+def test_overview_draws_collapsed_view(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(visualizer, "draw_tree", _fake_draw(calls))
+    draw_overview(_program(), str(tmp_path / "o.png"), max_depth=3, max_nodes=40)
+    (view, (width, height)), = calls
+    assert _count(view) <= 40 and _depth(view) <= 4
+    assert 10.0 <= width <= 80.0 and 7.0 <= height <= 40.0
+    assert (tmp_path / "o.png").exists()
+
+
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_function_shards_one_file_per_function(tmp_path, monkeypatch, jobs):
+    monkeypatch.setattr(visualizer, "draw_tree", _fake_draw([]))
+    code = "int a() { return 1; }\nint g;\nint b() { return 2; }\nint a() { return 3; }\n"
+    program, errors = Parser(lex(code)[0]).parse_program()
+    assert not errors
+    out = tmp_path / "shards"
+    files = draw_function_shards(program, str(out), jobs)
+    assert files == [str(out / name) for name in ("a.png", "b.png", "a_1.png")]
+    assert [(out / name).read_text(encoding="utf-8") for name in ("a.png", "b.png", "a_1.png")] == \
+        ["Func(a)", "Func(b)", "Func(a)"]
@@ -0,0 +1,80 @@
+import os
+
+from preprocessor import Preprocessor
+from watch import Watcher
+
+
+def _write(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    st = os.stat(path)
+    # garante mtime diferente mesmo em sistemas de arquivos de baixa resolucao
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def test_callback_error_does_not_stop_polling(tmp_path, capsys):
+    seen = []
+
+    def on_change(path):
+        seen.append(os.path.basename(path))
+        if path.endswith("bad.c"):
+            raise RuntimeError("falhou")
+
+    _write(tmp_path / "bad.c", "int x;\n")
+    _write(tmp_path / "good.c", "int y;\n")
+    watcher = Watcher(str(tmp_path), on_change, lambda p: None, debounce=0)
+    changed, _ = watcher.poll()
+    assert seen == ["bad.c", "good.c"]
+    assert "falhou" in capsys.readouterr().err
+
+    _write(tmp_path / "good.c", "int z;\n")
+    watcher.poll()
+    assert seen[-1] == "good.c"
+
+
+def test_header_change_reprocesses_includers(tmp_path):
+    pp = Preprocessor()
+    seen = []
+
+    def on_change(path):
+        seen.append(os.path.basename(path))
+        pp.preprocess_file(path)
+
+    include = tmp_path / "inc"
+    include.mkdir()
+    _write(include / "h.h", "int h;\n")
+    _write(tmp_path / "a.c", '#include "inc/h.h"\nint a;\n')
+    _write(tmp_path / "b.c", "int b;\n")
+    watcher = Watcher(str(tmp_path), on_change, lambda p: None, debounce=0,
+                      dependencies=lambda p: pp.dependencies.get(os.path.abspath(p), ()))
+    watcher.poll()
+    assert sorted(seen) == ["a.c", "b.c"]
+
+    seen.clear()
+    assert watcher.poll() == ([], [])
+    _write(include / "h.h", "int h2;\n")
+    changed, _ = watcher.poll()
+    assert seen == ["a.c"]
+
+    seen.clear()
+    _write(include / "h.h", "int h2;\n")  # so o mtime mudou
+    watcher.poll()
+    assert seen == []
+
+
+def test_missing_header_created_later(tmp_path):
+    pp = Preprocessor()
+    seen = []
+
+    def on_change(path):
+        seen.append(os.path.basename(path))
+        pp.preprocess_file(path)
+
+    _write(tmp_path / "a.c", '#include "later.h"\nint a;\n')
+    watcher = Watcher(str(tmp_path), on_change, lambda p: None, debounce=0,
+                      dependencies=lambda p: pp.dependencies.get(os.path.abspath(p), ()))
+    watcher.poll()
+    _write(tmp_path / "later.h", "int h;\n")
+    seen.clear()
+    watcher.poll()
+    assert seen == ["a.c"]
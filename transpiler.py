@@ -0,0 +1,654 @@
+import hashlib
+import marshal
+import os
+import sys
+from collections import OrderedDict
+from types import CodeType
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from ast_hash import structural_hash
+from ast_nodes import (
+    ASTNode, Assign, BinOp, Block, Call, Char, For, FunctionDecl, If, Index,
+    Num, Program, Return, Str, Var, VarDecl, While,
+)
+from interpreter import ExecutionError, c_div, coerce, ctype, default_value, div, literal_value
+from lexer import lex
+from parser import Parser
+
+
+# Traduz um Program para codigo-fonte Python e compila com compile(), de
+# modo que os programas rodam no laco de bytecode do CPython em vez de
+# passar pela AST a cada passo. A semantica e a do interpretador de
+# referencia (interpreter.py); os tipos sao resolvidos estaticamente, entao
+# as conversoes int/float e a divisao truncada so aparecem onde o tipo pede.
+#
+# Nomes gerados: cada declaracao de variavel vira <nome>_<k>, com k unico no
+# programa inteiro (resolve sombreamento entre blocos sem colidir com outros
+# nomes de C), e cada funcao vira <nome>_f.
+
+
+class TranspileError(Exception):
+    def __init__(self, message: str, node: Optional[ASTNode] = None):
+        super().__init__(message)
+        self.message = message
+        self.line = getattr(node, "line", 0)
+        self.col = getattr(node, "col", 0)
+
+    def __str__(self):
+        if self.line:
+            return f"{self.message} @ {self.line}:{self.col}"
+        return self.message
+
+
+# Precedencias do Python usadas para parentizar o minimo necessario
+_P_OR, _P_AND, _P_CMP, _P_ADD, _P_MUL, _P_UNARY, _P_ATOM = 1, 2, 4, 5, 6, 7, 9
+
+_ARITH_PREC = {"+": _P_ADD, "-": _P_ADD, "*": _P_MUL}
+_ARITH_OPS = ("+", "-", "*", "/")
+_CHAIN_MAX = 100
+_COMPARISONS = ("<", "<=", ">", ">=", "==", "!=")
+
+
+class _Sym:
+    __slots__ = ("py", "ctype", "is_global")
+
+    def __init__(self, py: str, ctype: str, is_global: bool):
+        self.py = py
+        self.ctype = ctype
+        self.is_global = is_global
+
+
+class Transpiler:
+
+    def __init__(self, program: Program):
+        self.program = program
+        self.lines: List[str] = []
+        self.counter = 0
+        self.scopes: List[Dict[str, _Sym]] = []
+        self.functions: Dict[str, FunctionDecl] = {}
+        self.externs: Set[str] = set()
+        self.ret: Optional[str] = None          # tipo de retorno da funcao atual
+        self.assigned_globals: Set[str] = set()
+
+    def transpile(self) -> str:
+        for decl in self.program.body:
+            if isinstance(decl, FunctionDecl):
+                self.functions[decl.name] = decl
+        self.scopes = [{}]
+        # os escopos seguem a ordem do fonte, mas todas as funcoes sao
+        # emitidas antes das instrucoes de topo: `int x = f();` antes da
+        # definicao de f precisa encontrar f_f ja definida
+        defs: List[str] = []
+        for decl in self.program.body:
+            if isinstance(decl, FunctionDecl):
+                start = len(self.lines)
+                self.function(decl)
+                defs.extend(self.lines[start:])
+                del self.lines[start:]
+            else:
+                self.statement(decl, 0)
+        return "\n".join(defs + self.lines) + "\n"
+
+    def emit(self, indent: int, text: str):
+        self.lines.append("    " * indent + text)
+
+
+    # Escopos
+
+    def declare(self, name: str, type_name: str) -> _Sym:
+        self.counter += 1
+        sym = _Sym(f"{name}_{self.counter}", ctype(type_name), len(self.scopes) == 1)
+        self.scopes[-1][name] = sym
+        return sym
+
+    def resolve(self, node: Var) -> _Sym:
+        for scope in reversed(self.scopes):
+            sym = scope.get(node.name)
+            if sym is not None:
+                return sym
+        raise TranspileError(f"variavel nao declarada: {node.name}", node)
+
+    def store(self, node: Var) -> _Sym:
+        sym = self.resolve(node)
+        if sym.is_global and self.ret is not None:
+            self.assigned_globals.add(sym.py)
+        return sym
+
+
+    # Funcoes e instrucoes
+
+    def function(self, fn: FunctionDecl):
+        outer = self.lines
+        self.lines = []
+        self.ret = ctype(fn.ret_type)
+        self.assigned_globals = set()
+        self.scopes.append({})
+        params = [self.declare(pname, ptype).py for ptype, pname in fn.params]
+        if fn.body is not None:
+            self.block(fn.body, 1)
+        default = default_value(self.ret)
+        if not self.lines or not self.lines[-1].startswith("    return"):
+            self.emit(1, f"return {default!r}")
+        self.scopes.pop()
+        body = self.lines
+        self.lines = outer
+        self.emit(0, f"def {fn.name}_f({', '.join(params)}):")
+        if self.assigned_globals:
+            self.emit(1, "global " + ", ".join(sorted(self.assigned_globals)))
+        self.lines.extend(body)
+        self.ret = None
+
+    def block(self, node: Block, indent: int, scoped: bool = True):
+        if scoped:
+            self.scopes.append({})
+        start = len(self.lines)
+        for stmt in node.body:
+            self.statement(stmt, indent)
+        if len(self.lines) == start:
+            self.emit(indent, "pass")
+        if scoped:
+            self.scopes.pop()
+
+    def body(self, node: Optional[Block], indent: int):
+        if node is None:
+            self.emit(indent, "pass")
+        else:
+            self.block(node, indent)
+
+    def statement(self, node: ASTNode, indent: int):
+        if isinstance(node, VarDecl):
+            if node.init is None:
+                value = repr(default_value(ctype(node.var_type)))
+                sym = self.declare(node.name, node.var_type)
+            else:
+                code, t = self.expr(node.init, 0)
+                sym = self.declare(node.name, node.var_type)
+                value = self.convert(code, t, sym.ctype)
+            self.emit(indent, f"{sym.py} = {value}")
+        elif isinstance(node, Assign):
+            self.emit(indent, self.assignment(node))
+        elif isinstance(node, If):
+            self.emit(indent, f"if {self.cond(node.test, 0)}:")
+            self.body(node.then, indent + 1)
+            if node.otherwise is not None:
+                self.emit(indent, "else:")
+                self.block(node.otherwise, indent + 1)
+        elif isinstance(node, While):
+            self.emit(indent, f"while {self.cond(node.test, 0)}:")
+            self.body(node.body, indent + 1)
+        elif isinstance(node, For):
+            self.for_loop(node, indent)
+        elif isinstance(node, Return):
+            if self.ret is None:
+                raise TranspileError("return fora de funcao", node)
+            if node.value is None:
+                self.emit(indent, f"return {default_value(self.ret)!r}")
+            else:
+                code, t = self.expr(node.value, 0)
+                if self.ret != "void":
+                    code = self.convert(code, t, self.ret)
+                self.emit(indent, f"return {code}")
+        elif isinstance(node, Block):
+            self.block(node, indent)
+        elif isinstance(node, FunctionDecl):
+            raise TranspileError("funcao aninhada", node)
+        else:
+            self.emit(indent, self.expr(node, 0)[0])
+
+    def assignment(self, node: Assign) -> str:
+        code, t = self.expr(node.value, 0)
+        sym = self.store(node.target)
+        return f"{sym.py} = {self.convert(code, t, sym.ctype)}"
+
+    def for_loop(self, node: For, indent: int):
+        self.scopes.append({})
+        if node.init is not None:
+            self.statement(node.init, indent)
+        fast = self.range_loop(node)
+        if fast is not None:
+            var, bound, inclusive = fast
+            stop = f"{bound} + 1" if inclusive else bound
+            self.emit(indent, f"for {var} in range({var}, {stop}):")
+            self.body(node.body, indent + 1)
+            if not isinstance(node.init, VarDecl):
+                # valor que o contador teria ao sair do laco em C
+                self.emit(indent, f"if {var} {'<=' if inclusive else '<'} {bound}:")
+                self.emit(indent + 1, f"{var} = {stop}")
+        else:
+            cond = "True" if node.cond is None else self.cond(node.cond, 0)
+            self.emit(indent, f"while {cond}:")
+            start = len(self.lines)
+            if node.body is not None:
+                self.block(node.body, indent + 1)
+                if len(self.lines) == start + 1 and self.lines[-1].strip() == "pass" and node.step is not None:
+                    self.lines.pop()
+            if node.step is not None:
+                self.statement(node.step, indent + 1)
+            if len(self.lines) == start:
+                self.emit(indent + 1, "pass")
+        self.scopes.pop()
+
+    def range_loop(self, node: For) -> Optional[Tuple[str, str, bool]]:
+        """
+        Reconhece `for (i = a; i < n; i = i + 1)` (ou <=) e devolve
+        (contador, limite, inclusivo) quando pode virar range(): contador e
+        limite inteiros, limite literal ou variavel local, e nenhum dos dois
+        atribuido ou redeclarado no corpo.
+        """
+        init, cond, step = node.init, node.cond, node.step
+        if isinstance(init, VarDecl):
+            name = init.name
+        elif isinstance(init, Assign):
+            name = init.target.name
+        else:
+            return None
+        if not (isinstance(cond, BinOp) and cond.op in ("<", "<=")
+                and isinstance(cond.left, Var) and cond.left.name == name):
+            return None
+        if not (isinstance(step, Assign) and step.target.name == name
+                and isinstance(step.value, BinOp) and step.value.op == "+"
+                and isinstance(step.value.left, Var) and step.value.left.name == name
+                and isinstance(step.value.right, Num) and step.value.right.value == "1"):
+            return None
+        counter = self.resolve(cond.left)
+        if counter.ctype != "int" or counter.is_global:
+            return None
+        right = cond.right
+        protected = {name}
+        if isinstance(right, Num):
+            if "." in right.value:
+                return None
+            bound = str(int(right.value))
+        elif isinstance(right, Var):
+            sym = self.resolve(right)
+            if sym.ctype != "int" or sym.is_global or sym is counter:
+                return None
+            bound = sym.py
+            protected.add(right.name)
+        else:
+            return None
+        if node.body is not None and _writes_any(node.body, protected):
+            return None
+        return counter.py, bound, cond.op == "<="
+
+
+    # Expressoes: expr_prec devolve (codigo, precedencia, tipo) sem parenteses
+    # externos; expr e cond parentizam para a precedencia pedida. O percurso
+    # usa pilha explicita (cadeias longas de BinOp), e uma cadeia de + - * /
+    # com mais de _CHAIN_MAX operadores vira uma chamada a _chain: aninhada,
+    # passaria do limite de recursao do compilador do Python.
+
+    def expr(self, node: ASTNode, prec: int) -> Tuple[str, Optional[str]]:
+        code, p, t = self.expr_prec(node)
+        return _paren(code, p, prec), t
+
+    def convert(self, code: str, source: Optional[str], target: str) -> str:
+        if source == target or target == "void":
+            return code
+        if source == "float" and target == "int":
+            return f"int({code})"
+        if source == "int" and target == "float":
+            return f"float({code})"
+        return f"_coerce({code}, {target!r})"
+
+    def cond(self, node: ASTNode, prec: int) -> str:
+        # contexto de teste: basta a veracidade do Python, sem converter para 0/1
+        code, p, _ = self.walk(node, "cond")
+        return _paren(code, p, prec)
+
+    def expr_prec(self, node: ASTNode) -> Tuple[str, int, Optional[str]]:
+        return self.walk(node, "expr")
+
+    def walk(self, root: ASTNode, mode: str) -> Tuple[str, int, Optional[str]]:
+        # cada passo "expr"/"cond" empilha a juncao e depois os filhos em ordem
+        # inversa, entao os filhos sao traduzidos da esquerda para a direita
+        out: List[Tuple[str, int, Optional[str]]] = []
+        todo: List[Tuple[str, Any]] = [(mode, root)]
+        while todo:
+            step, node = todo.pop()
+            if step == "expr":
+                self.expand_expr(node, todo, out)
+            elif step == "cond":
+                if isinstance(node, BinOp) and node.op in ("&&", "||"):
+                    todo += [("logic", node), ("cond", node.right), ("cond", node.left)]
+                elif isinstance(node, BinOp) and node.op in _COMPARISONS:
+                    todo += [("compare", node), ("expr", node.right), ("expr", node.left)]
+                else:
+                    todo += [("test", node), ("expr", node)]
+            else:
+                getattr(self, "join_" + step)(node, out)
+        return out[0]
+
+    def expand_expr(self, node: ASTNode, todo: List[Tuple[str, Any]], out: List[Tuple[str, int, Optional[str]]]):
+        if isinstance(node, (Num, Char, Str)):
+            value = literal_value(node)
+            t = "int" if isinstance(value, int) else "float" if isinstance(value, float) else None
+            out.append((repr(value), _P_ATOM, t))
+        elif isinstance(node, Var):
+            sym = self.resolve(node)
+            out.append((sym.py, _P_ATOM, sym.ctype))
+        elif isinstance(node, Assign):
+            todo += [("assign", node), ("expr", node.value)]
+        elif isinstance(node, BinOp):
+            if node.op in ("&&", "||") or node.op in _COMPARISONS:
+                todo += [("truth", node), ("cond", node)]
+            elif _negative_literal(node):
+                # literal negativo (o parser representa -x como 0 - x)
+                value = literal_value(node.left) - literal_value(node.right)
+                out.append((repr(value), (_P_UNARY if value < 0 else _P_ATOM), type(value).__name__))
+            else:
+                # espinha esquerda da cadeia, da raiz para o operando mais fundo
+                spine: List[BinOp] = []
+                cur: ASTNode = node
+                while isinstance(cur, BinOp) and cur.op in _ARITH_OPS and not _negative_literal(cur):
+                    spine.append(cur)
+                    cur = cur.left
+                todo.append(("chain", spine))
+                todo.extend(("expr", s.right) for s in spine)
+                todo.append(("expr", cur))
+        elif isinstance(node, Call):
+            if not isinstance(node.callee, Var):
+                raise TranspileError("chamada de algo que nao e funcao", node)
+            fn = self.functions.get(node.callee.name)
+            if fn is not None and len(node.args) != len(fn.params):
+                raise TranspileError(f"{fn.name} espera {len(fn.params)} argumento(s), recebeu {len(node.args)}", node)
+            todo.append(("call", node))
+            todo.extend(("expr", a) for a in reversed(node.args))
+        elif isinstance(node, Index):
+            todo += [("index", node), ("expr", node.index), ("expr", node.target)]
+        else:
+            raise TranspileError(f"no nao suportado: {type(node).__name__}", node)
+
+    def join_assign(self, node: Assign, out):
+        code, _, t = out.pop()
+        sym = self.store(node.target)
+        out.append((f"({sym.py} := {self.convert(code, t, sym.ctype)})", _P_ATOM, sym.ctype))
+
+    def join_truth(self, node: BinOp, out):
+        out.append((f"(1 if {out.pop()[0]} else 0)", _P_ATOM, "int"))
+
+    def join_logic(self, node: BinOp, out):
+        (right, rp, _), (left, lp, _) = out.pop(), out.pop()
+        p = _P_AND if node.op == "&&" else _P_OR
+        word = "and" if node.op == "&&" else "or"
+        out.append((f"{_paren(left, lp, p)} {word} {_paren(right, rp, p + 1)}", p, None))
+
+    def join_compare(self, node: BinOp, out):
+        (right, rp, _), (left, lp, _) = out.pop(), out.pop()
+        out.append((f"{_paren(left, lp, _P_CMP + 1)} {node.op} {_paren(right, rp, _P_CMP + 1)}", _P_CMP, None))
+
+    def join_test(self, node: ASTNode, out):
+        code, p, t = out.pop()
+        if p < _P_CMP + 1:
+            code, p = f"({code})", _P_ATOM
+        out.append((code, p, t))
+
+    def join_chain(self, spine: List[BinOp], out):
+        start = len(out) - len(spine) - 1
+        operands = out[start:]
+        del out[start:]
+        ops = [s.op for s in reversed(spine)]
+        if len(ops) <= _CHAIN_MAX:
+            acc = operands[0]
+            for op, right in zip(ops, operands[1:]):
+                acc = self.binop(op, acc, right)
+            out.append(acc)
+            return
+        t = operands[0][2]
+        for op, right in zip(ops, operands[1:]):
+            t = _arith_type(op, t, right[2])
+        values = ", ".join(code for code, _, _ in operands)
+        out.append((f"_chain(({values}), {''.join(ops)!r})", _P_ATOM, t))
+
+    def binop(self, op: str, left: Tuple[str, int, Optional[str]],
+              right: Tuple[str, int, Optional[str]]) -> Tuple[str, int, Optional[str]]:
+        (lc, lp, lt), (rc, rp, rt) = left, right
+        if op == "/":
+            if lt == "int" and rt == "int":
+                return f"_cdiv({lc}, {rc})", _P_ATOM, "int"
+            if "float" in (lt, rt) and None not in (lt, rt):
+                return f"{_paren(lc, lp, _P_MUL)} / {_paren(rc, rp, _P_MUL + 1)}", _P_MUL, "float"
+            return f"_div({lc}, {rc})", _P_ATOM, None
+        p = _ARITH_PREC[op]
+        return f"{_paren(lc, lp, p)} {op} {_paren(rc, rp, p + 1)}", p, _arith_type(op, lt, rt)
+
+    def join_call(self, node: Call, out):
+        name = node.callee.name
+        start = len(out) - len(node.args)
+        values = out[start:]
+        del out[start:]
+        fn = self.functions.get(name)
+        if fn is None:
+            self.externs.add(name)
+            args = [code for code, _, _ in values]
+            out.append((f"{name}_f({', '.join(args)})", _P_ATOM, None))
+            return
+        args = [self.convert(code, t, ctype(ptype)) for (code, _, t), (ptype, _) in zip(values, fn.params)]
+        ret = ctype(fn.ret_type)
+        out.append((f"{name}_f({', '.join(args)})", _P_ATOM, (None if ret == "void" else ret)))
+
+    def join_index(self, node: Index, out):
+        (index, _, _), (target, tp, _) = out.pop(), out.pop()
+        out.append((f"{_paren(target, tp, _P_ATOM)}[{index}]", _P_ATOM, None))
+
+
+def _paren(code: str, p: int, prec: int) -> str:
+    return f"({code})" if p < prec else code
+
+
+def _negative_literal(node: BinOp) -> bool:
+    return node.op == "-" and isinstance(node.left, Num) and node.left.value == "0" \
+        and isinstance(node.right, Num)
+
+
+def _arith_type(op: str, lt: Optional[str], rt: Optional[str]) -> Optional[str]:
+    if lt is None or rt is None:
+        return None
+    if op == "/" and lt == "int" and rt == "int":
+        return "int"
+    return "float" if "float" in (lt, rt) else "int"
+
+
+def _walk(node: ASTNode):
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        yield n
+        for value in vars(n).values():
+            if isinstance(value, ASTNode):
+                stack.append(value)
+            elif isinstance(value, list):
+                stack.extend(v for v in value if isinstance(v, ASTNode))
+
+
+def _writes_any(node: ASTNode, names: Set[str]) -> bool:
+    for n in _walk(node):
+        if isinstance(n, Assign) and n.target.name in names:
+            return True
+        if isinstance(n, VarDecl) and n.name in names:
+            return True
+    return False
+
+
+def transpile(program: Program) -> str:
+    return Transpiler(program).transpile()
+
+
+# Compilacao e cache
+
+def _chain(values: Tuple[Any, ...], ops: str) -> Any:
+    # cadeia longa de + - * / ja avaliada da esquerda para a direita; "/"
+    # segue div(), que cobre os tres casos de binop
+    acc = values[0]
+    for op, value in zip(ops, values[1:]):
+        if op == "+":
+            acc = acc + value
+        elif op == "-":
+            acc = acc - value
+        elif op == "*":
+            acc = acc * value
+        else:
+            acc = div(acc, value)
+    return acc
+
+
+_RUNTIME: Dict[str, Any] = {
+    "_cdiv": c_div,
+    "_div": div,
+    "_coerce": coerce,
+    "_chain": _chain,
+}
+
+
+def _runtime_error(e: Exception) -> ExecutionError:
+    if isinstance(e, ZeroDivisionError):
+        return ExecutionError("divisao por zero")
+    if isinstance(e, RecursionError):
+        return ExecutionError("recursao profunda demais")
+    # global usada antes da declaracao ser executada; o nome gerado e <nome>_<k>
+    return ExecutionError(f"variavel nao declarada: {(e.name or '').rsplit('_', 1)[0]}")
+
+
+class CompiledProgram:
+    """Codigo compilado de um programa; cada instancia nova reinicia os globais."""
+
+    def __init__(self, source: str, code: CodeType, externs: List[str], key: str):
+        self.source = source
+        self.code = code
+        self.externs = externs
+        self.key = key
+
+    def instantiate(self, externs: Optional[Dict[str, Callable[..., Any]]] = None) -> Dict[str, Any]:
+        ns: Dict[str, Any] = dict(_RUNTIME)
+        externs = externs or {}
+        for name in self.externs:
+            if name not in externs:
+                raise ExecutionError(f"funcao nao declarada: {name}")
+            ns[f"{name}_f"] = externs[name]
+        try:
+            exec(self.code, ns)
+        except (ZeroDivisionError, RecursionError, NameError) as e:
+            raise _runtime_error(e) from None
+        return ns
+
+    def run(self, entry: str = "main", *args: Any,
+            externs: Optional[Dict[str, Callable[..., Any]]] = None) -> Any:
+        fn = self.instantiate(externs).get(f"{entry}_f")
+        if fn is None:
+            raise ExecutionError(f"funcao nao declarada: {entry}")
+        try:
+            return fn(*args)
+        except (ZeroDivisionError, RecursionError, NameError) as e:
+            raise _runtime_error(e) from None
+
+
+_CACHE_SIZE = 128
+_cache: "OrderedDict[str, CompiledProgram]" = OrderedDict()
+
+
+def _cached(key: str, build: Callable[[], CompiledProgram], cache_dir: Optional[str]) -> CompiledProgram:
+    hit = _cache.get(key)
+    if hit is not None:
+        _cache.move_to_end(key)
+        return hit
+    compiled = _disk_load(key, cache_dir) or build()
+    _disk_store(compiled, cache_dir)
+    _cache[key] = compiled
+    while len(_cache) > _CACHE_SIZE:
+        _cache.popitem(last=False)
+    return compiled
+
+
+def _disk_path(key: str, cache_dir: Optional[str]) -> Optional[str]:
+    if not cache_dir:
+        return None
+    # bytecode so vale para a mesma versao do interpretador
+    return os.path.join(cache_dir, f"{key}.{sys.implementation.cache_tag}.pyc")
+
+
+def _disk_load(key: str, cache_dir: Optional[str]) -> Optional[CompiledProgram]:
+    path = _disk_path(key, cache_dir)
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            source, code, externs = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    return CompiledProgram(source, code, list(externs), key)
+
+
+def _disk_store(compiled: CompiledProgram, cache_dir: Optional[str]):
+    path = _disk_path(compiled.key, cache_dir)
+    if not path or os.path.exists(path):
+        return
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = path + f".{os.getpid()}"
+    with open(tmp, "wb") as f:
+        marshal.dump((compiled.source, compiled.code, tuple(compiled.externs)), f)
+    os.replace(tmp, path)
+
+
+def _build(program: Program, key: str, filename: str) -> CompiledProgram:
+    t = Transpiler(program)
+    try:
+        source = t.transpile()
+        code = compile(source, filename, "exec")
+    except RecursionError:
+        raise TranspileError("aninhamento profundo demais") from None
+    except SyntaxError as e:
+        # limite do compilador do Python (ex.: mais de 200 parenteses aninhados)
+        raise TranspileError(f"codigo gerado rejeitado pelo Python: {e.msg}") from None
+    return CompiledProgram(source, code, sorted(t.externs), key)
+
+
+def compile_program(program: Program, filename: str = "<c>",
+                    cache_dir: Optional[str] = None) -> CompiledProgram:
+    """Compila uma AST; o cache e indexado pelo hash estrutural da arvore."""
+    key = "ast-" + structural_hash(program).hex()
+    return _cached(key, lambda: _build(program, key, filename), cache_dir)
+
+
+def compile_source(code: str, filename: str = "<c>",
+                   cache_dir: Optional[str] = None) -> CompiledProgram:
+    """
+    Compila codigo C; o cache e indexado pelo sha256 do texto, entao um
+    acerto nao passa nem pelo lexer. Erros lexicos ou sintaticos viram
+    TranspileError com a primeira mensagem.
+    """
+    key = "src-" + hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+    def build() -> CompiledProgram:
+        tokens, lex_errors = lex(code)
+        if lex_errors:
+            raise TranspileError(f"erro lexico: {lex_errors[0]}")
+        program, errors = Parser(tokens).parse_program()
+        if program is None:
+            raise TranspileError(f"erro sintatico: {errors[0]}")
+        return _build(program, key, filename)
+    return _cached(key, build, cache_dir)
+
+
+def main():
+    import argparse
+    ap = argparse.ArgumentParser(description="Transpila um programa C para Python e executa")
+    ap.add_argument("file")
+    ap.add_argument("--entry", default="main")
+    ap.add_argument("--emit", action="store_true", help="mostra o codigo Python gerado em vez de executar")
+    ap.add_argument("--cache-dir", help="diretorio para guardar o bytecode compilado")
+    args = ap.parse_args()
+    with open(args.file, "r", encoding="utf-8") as f:
+        code = f.read()
+    try:
+        compiled = compile_source(code, args.file, args.cache_dir)
+        if args.emit:
+            sys.stdout.write(compiled.source)
+            return
+        print(compiled.run(args.entry))
+    except (TranspileError, ExecutionError) as e:
+        print("Erro:", e, file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,14 @@
-from typing import Any, Dict, Tuple, List
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Tuple, List, Optional
 import matplotlib.pyplot as plt
 
 
 def node_label(n: Any) -> str:
     t = type(n).__name__
+    if t == "View":
+        return n.label
     if t == "Program":
         return "Program"
     if t == "FunctionDecl":
@@ -40,6 +45,8 @@ def node_label(n: Any) -> str:
 
 def children(n: Any) -> List[Any]:
     t = type(n).__name__
+    if t == "View":
+        return n.kids
     if t == "Program":
         return list(n.body)
     if t == "FunctionDecl":
@@ -138,3 +145,100 @@ def draw_tree(root: Any, filename: str, figsize=(10, 7), dpi: int = 160):
     plt.tight_layout()
     plt.savefig(filename, dpi=dpi, bbox_inches="tight")
     plt.close(fig)
+
+
+
+# Nivel de detalhe: arvores grandes sao desenhadas a partir de uma "vista"
+# com no maximo max_nodes nos e max_depth niveis. Subarvores cortadas viram
+# um no de resumo, p.ex. "Block (412 nos)", entao o custo do desenho depende
+# do orcamento e nao do tamanho do programa.
+
+class View:
+    def __init__(self, label: str, kids: Optional[List["View"]] = None):
+        self.label = label
+        self.kids = kids or []
+
+
+def subtree_size(root: Any) -> int:
+    total = 0
+    stack = [root]
+    while stack:
+        n = stack.pop()
+        total += 1
+        stack.extend(c for c in children(n) if c is not None)
+    return total
+
+
+def _summary(node: Any) -> str:
+    return f"{node_label(node)} ({subtree_size(node)} nos)"
+
+
+def collapse(root: Any, max_depth: int = 6, max_nodes: int = 150, max_children: int = 12) -> View:
+    view = View(node_label(root))
+    used = 1
+    queue = deque([(root, view, 0)])
+    while queue:
+        node, v, depth = queue.popleft()
+        kids = [c for c in children(node) if c is not None]
+        if not kids:
+            continue
+        room = min(max_nodes - used, max_children + 1)
+        if depth >= max_depth or room < 2:
+            v.label = _summary(node)
+            continue
+        shown = kids if len(kids) <= room else kids[:room - 1]
+        for c in shown:
+            cv = View(node_label(c))
+            v.kids.append(cv)
+            queue.append((c, cv, depth + 1))
+        used += len(shown)
+        rest = kids[len(shown):]
+        if rest:
+            size = sum(subtree_size(c) for c in rest)
+            v.kids.append(View(f"... +{len(rest)} ({size} nos)"))
+            used += 1
+    return view
+
+
+def view_figsize(view: View) -> Tuple[float, float]:
+    _, width = _compute_layout(view, 0.0, 0.0)
+    depth = 0
+    level = [view]
+    while level:
+        depth += 1
+        level = [c for v in level for c in v.kids]
+    return (min(max(10.0, width * 0.9), 80.0), min(max(7.0, depth * 1.1), 40.0))
+
+
+def draw_overview(root: Any, filename: str, max_depth: int = 6, max_nodes: int = 150, dpi: int = 160):
+    view = collapse(root, max_depth, max_nodes)
+    draw_tree(view, filename, figsize=view_figsize(view), dpi=dpi)
+
+
+def _render_view(job: Tuple[View, str, int]) -> str:
+    view, filename, dpi = job
+    draw_tree(view, filename, figsize=view_figsize(view), dpi=dpi)
+    return filename
+
+
+def draw_function_shards(program: Any, out_dir: str, jobs: Optional[int] = None,
+                         max_depth: int = 6, max_nodes: int = 150, dpi: int = 160) -> List[str]:
+    """
+    Uma imagem por FunctionDecl de topo em out_dir, desenhadas em paralelo.
+    As vistas sao montadas aqui e so elas (limitadas pelo orcamento) vao
+    para os processos de desenho.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    work: List[Tuple[View, str, int]] = []
+    seen: Dict[str, int] = {}
+    for decl in program.body:
+        if type(decl).__name__ != "FunctionDecl":
+            continue
+        n = seen.get(decl.name, 0)
+        seen[decl.name] = n + 1
+        name = decl.name if n == 0 else f"{decl.name}_{n}"
+        work.append((collapse(decl, max_depth, max_nodes), os.path.join(out_dir, f"{name}.png"), dpi))
+    if jobs == 1 or len(work) < 2:
+        return [_render_view(job) for job in work]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(_render_view, work, chunksize=max(1, len(work) // 64)))
@@ -0,0 +1,146 @@
+import hashlib
+import os
+import sys
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+# Observa um diretorio por varredura periodica (sem dependencias externas).
+# A varredura so compara (mtime, tamanho); o hash do conteudo e calculado
+# apenas para arquivos cujo stat mudou, e o callback so roda quando o hash
+# difere do ultimo processado. Rajadas de gravacoes sao agrupadas: o lote so
+# e processado depois de `debounce` segundos sem novas mudancas.
+#
+# Com `dependencies`, cada arquivo processado informa de quais outros
+# (cabecalhos de #include) dependeu; esses tambem sao observados, mesmo fora
+# do diretorio, e uma mudanca neles reprocessa os arquivos que os incluem.
+
+
+def file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class Watcher:
+
+    def __init__(self, directory: str,
+                 on_change: Callable[[str], None],
+                 on_delete: Callable[[str], None],
+                 interval: float = 0.5,
+                 debounce: float = 0.3,
+                 extension: str = ".c",
+                 dependencies: Optional[Callable[[str], Iterable[str]]] = None):
+        self.directory = directory
+        self.on_change = on_change
+        self.on_delete = on_delete
+        self.interval = interval
+        self.debounce = debounce
+        self.extension = extension
+        self.dependencies = dependencies
+        self.stats: Dict[str, Tuple[int, int]] = {}
+        self.dep_stats: Dict[str, Tuple[int, int]] = {}
+        self.digests: Dict[str, str] = {}
+        self.deps: Dict[str, Set[str]] = {}
+
+    def scan(self) -> Dict[str, Tuple[int, int]]:
+        found: Dict[str, Tuple[int, int]] = {}
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(self.extension):
+                st = entry.stat()
+                found[entry.path] = (st.st_mtime_ns, st.st_size)
+        return found
+
+    def scan_deps(self) -> Dict[str, Tuple[int, int]]:
+        # dependencias que existem; uma que sumiu (ou ainda nao existe) fica de fora
+        found: Dict[str, Tuple[int, int]] = {}
+        for path in set().union(*self.deps.values()) if self.deps else ():
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            found[path] = (st.st_mtime_ns, st.st_size)
+        return found
+
+    def _settle(self, snapshot: Tuple[Dict, Dict]) -> Tuple[Dict, Dict]:
+        # espera a rajada de gravacoes terminar
+        deadline = time.monotonic() + self.debounce
+        while time.monotonic() < deadline:
+            time.sleep(min(self.debounce, 0.05))
+            current = (self.scan(), self.scan_deps())
+            if current != snapshot:
+                snapshot = current
+                deadline = time.monotonic() + self.debounce
+        return snapshot
+
+    def _changed(self, old: Dict[str, Tuple[int, int]], new: Dict[str, Tuple[int, int]]) -> List[str]:
+        # caminhos cujo conteudo mudou; os que sumiram contam como mudanca
+        changed: List[str] = []
+        for path in sorted(new):
+            if old.get(path) == new[path]:
+                continue
+            try:
+                digest = file_digest(path)
+            except OSError:
+                continue  # removido durante a varredura; aparece na proxima
+            if self.digests.get(path) != digest:
+                self.digests[path] = digest
+                changed.append(path)
+        for path in sorted(p for p in old if p not in new):
+            self.digests.pop(path, None)
+            changed.append(path)
+        return changed
+
+    def poll(self) -> Tuple[List[str], List[str]]:
+        """Uma rodada: retorna (alterados, removidos) e ja executa os callbacks."""
+        snapshot = (self.scan(), self.scan_deps())
+        if snapshot == (self.stats, self.dep_stats):
+            return [], []
+        sources, deps = self._settle(snapshot)
+
+        deleted = sorted(p for p in self.stats if p not in sources)
+        changed = [p for p in self._changed(self.stats, sources) if p in sources]
+        touched = set(changed) | set(deleted) | set(self._changed(self.dep_stats, deps))
+        changed += sorted(p for p, d in self.deps.items()
+                          if p in sources and p not in changed and d & touched)
+        self.stats = sources
+        self.dep_stats = deps
+
+        for path in deleted:
+            self.deps.pop(path, None)
+            self._call(self.on_delete, path)
+        for path in changed:
+            self._call(self.on_change, path)
+            if self.dependencies is not None:
+                self._track(path)
+        return changed, deleted
+
+    def _call(self, callback: Callable[[str], None], path: str):
+        # um erro num arquivo nao pode derrubar o laco de observacao
+        try:
+            callback(path)
+        except Exception as e:
+            print(f"Erro ao processar {path}: {type(e).__name__}: {e}", file=sys.stderr)
+
+    def _track(self, path: str):
+        deps = set(self.dependencies(path)) - {path}
+        self.deps[path] = deps
+        for dep in deps:
+            if dep in self.dep_stats or dep in self.stats:
+                continue
+            # registra o estado atual para nao contar como mudanca na proxima rodada
+            try:
+                st = os.stat(dep)
+                self.digests[dep] = file_digest(dep)
+            except OSError:
+                continue
+            self.dep_stats[dep] = (st.st_mtime_ns, st.st_size)
+
+    def run(self, rounds: Optional[int] = None):
+        n = 0
+        while rounds is None or n < rounds:
+            self.poll()
+            n += 1
+            time.sleep(self.interval)